@@ -0,0 +1,29 @@
+"""Agent-layer benchmarks: BaseAgent.execute called directly, no HTTP."""
+
+from typing import Any, Dict, Sequence
+
+from src.agents import registry
+
+from .harness import measure
+from .scenarios import scenarios
+
+
+async def run(
+    requests: int, concurrency: Sequence[int], quick: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Single-request latency and a concurrency scaling curve per scenario.
+
+    Returns:
+        Benchmark name -> summary
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, scenario in scenarios(quick).items():
+        agent = registry.agent_class(scenario.task_type)()
+        if scenario.setup is not None:
+            await agent.execute(scenario.setup)
+        for level in concurrency:
+            results[f"agents.{name}.c{level}"] = await measure(
+                lambda: agent.execute(scenario.task), requests, level
+            )
+    return results
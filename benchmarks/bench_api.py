@@ -0,0 +1,66 @@
+"""API-layer benchmarks: the FastAPI app driven in-process over ASGI."""
+
+import tempfile
+from typing import Any, Dict, Sequence
+
+import httpx
+
+from src.api.admission import admission
+from src.api.main import app
+from src.billing import ledger
+
+from .harness import measure
+from .scenarios import scenarios
+
+
+async def run(
+    requests: int,
+    concurrency: Sequence[int],
+    batch_sizes: Sequence[int] = (100, 1000),
+    quick: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Request latency per task type, batch throughput and concurrency scaling
+    through the full middleware and serialization stack.
+
+    Returns:
+        Benchmark name -> summary; batch results add tasks_per_second
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        # Keep benchmark transactions out of the real billing database
+        ledger.database_url = f"sqlite:///{scratch}/billing.db"
+        # Measure the agents, not the rate limits
+        admission.enabled = False
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                async def execute(task_type: str, parameters: Dict[str, Any]) -> None:
+                    body = {"task_type": task_type, "parameters": parameters}
+                    response = await client.post("/api/v1/tasks/execute", json=body)
+                    response.raise_for_status()
+
+                for name, scenario in scenarios(quick).items():
+                    if scenario.setup is not None:
+                        await execute(scenario.task_type, scenario.setup)
+                    for level in concurrency:
+                        results[f"api.execute.{name}.c{level}"] = await measure(
+                            lambda: execute(scenario.task_type, scenario.task), requests, level
+                        )
+
+                task = scenarios(quick)["benefits.enroll"]
+                for size in batch_sizes:
+                    item = {"task_type": task.task_type, "parameters": task.task}
+                    body = {"tasks": [item] * size}
+
+                    async def batch() -> None:
+                        response = await client.post("/api/v1/tasks/batch", json=body)
+                        response.raise_for_status()
+
+                    result = await measure(batch, max(requests // 10, 5), 1, warmup=1)
+                    result["tasks_per_second"] = round(result["throughput_rps"] * size, 1)
+                    results[f"api.batch.{size}"] = result
+        finally:
+            await app.router.shutdown()
+    return results
@@ -0,0 +1,59 @@
+"""Payroll engine throughput benchmark.
+
+Usage:
+    python -m benchmarks.bench_payroll [--sizes 10000,100000,1000000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.payroll import PayrollEngine, PayrollInputs
+from src.payroll.tax import DEFAULT_LOCAL_BRACKETS, DEFAULT_STATE_BRACKETS
+
+
+def make_inputs(size: int, seed: int = 0) -> PayrollInputs:
+    """Synthetic workforce: 70% salaried, 30% hourly, spread over every tax jurisdiction."""
+    rng = np.random.default_rng(seed)
+    salaried = rng.random(size) < 0.7
+    jurisdictions = [(state, "") for state in DEFAULT_STATE_BRACKETS]
+    jurisdictions += [tuple(key.split("/")) for key in DEFAULT_LOCAL_BRACKETS]
+    return PayrollInputs(
+        employee_ids=np.char.add("emp-", np.arange(size).astype(str)),
+        annual_salary=np.where(salaried, rng.normal(95000, 30000, size).clip(30000), 0.0),
+        hourly_rate=np.where(salaried, 0.0, rng.uniform(15, 60, size)),
+        hours=np.where(salaried, 0.0, rng.uniform(80, 180, size)),
+        pretax_deductions=rng.uniform(0, 800, size),
+        posttax_deductions=rng.uniform(0, 200, size),
+        jurisdiction_ids=rng.integers(len(jurisdictions), size=size).astype(np.int32),
+        jurisdictions=jurisdictions,
+    )
+
+
+def bench(engine: PayrollEngine, inputs: PayrollInputs, repeat: int) -> float:
+    """Best-of-N wall time for one payroll run, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.run(inputs, "biweekly")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = PayrollEngine()
+    print(f"{'employees':>10} {'best (ms)':>10} {'employees/s':>14}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        inputs = make_inputs(size)
+        elapsed = bench(engine, inputs, args.repeat)
+        print(f"{size:>10,} {elapsed * 1000:>10.2f} {size / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Response serialization benchmark: encode time and payload size per format.
+
+Usage:
+    python -m benchmarks.bench_serialization [--sizes 1000,10000,100000] [--repeat 5]
+
+Compares the previous response path (pydantic validation, then the standard
+library encoder) with the direct JSON encoder and MessagePack (when msgpack
+is installed), for a batch response and for a payroll pay stub stream.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from src import serialization
+from src.agents import PayrollAgent
+from src.api.main import BatchTaskResponse
+from src.payroll import PayrollEngine
+
+from .bench_payroll import make_inputs
+
+
+def _stdlib_json(value: Any) -> bytes:
+    # What Starlette's JSONResponse does after FastAPI has validated the body
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+def batch_body(size: int) -> Dict[str, Any]:
+    """A batch response of size successful payroll items."""
+    result = asyncio.run(PayrollAgent().execute({
+        "period": "monthly",
+        "employees": {"employee_id": ["e1", "e2"], "annual_salary": [60000, 120000]},
+    }))
+    item = {
+        "task_type": "payroll",
+        "status": "success",
+        "result": result,
+        "pricing": 2.0,
+        "error": None,
+    }
+    items = [{"index": i, **item} for i in range(size)]
+    return {
+        "status": "success",
+        "succeeded": size,
+        "failed": 0,
+        "total_pricing": 2.0 * size,
+        "results": items,
+    }
+
+
+def encoders(kind: str) -> Dict[str, Callable[[Any], bytes]]:
+    """Encoders to compare for a batch body or a list of pay stubs."""
+    if kind == "batch":
+        candidates = {
+            "pydantic+json": lambda body: _stdlib_json(jsonable_encoder(BatchTaskResponse(**body))),
+            "json": serialization.dumps,
+        }
+    else:
+        candidates = {
+            "dict+json": lambda stubs: b"\n".join(_stdlib_json(stub.to_dict()) for stub in stubs),
+            "json": lambda stubs: b"\n".join(map(serialization.dumps, stubs)),
+        }
+    if serialization.msgpack is not None:
+        if kind == "batch":
+            candidates["msgpack"] = serialization.packb
+        else:
+            candidates["msgpack"] = lambda stubs: b"".join(map(serialization.packb, stubs))
+    return candidates
+
+
+def bench(encode: Callable[[Any], bytes], value: Any, repeat: int) -> Tuple[float, int]:
+    """Best-of-N encode time in seconds, and the payload size in bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = encode(value)
+        best = min(best, time.perf_counter() - start)
+    return best, len(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if serialization.msgpack is None:
+        print("msgpack is not installed; MessagePack rows are skipped\n")
+    engine = PayrollEngine()
+    print(
+        f"{'payload':>16} {'size':>8} {'encoder':>14} {'best (ms)':>10} "
+        f"{'bytes':>12} {'vs baseline':>12}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        values = {
+            "batch": batch_body(size),
+            "pay_stubs": list(engine.run(make_inputs(size), "biweekly").pay_stubs()),
+        }
+        for kind, value in values.items():
+            baseline = None
+            for name, encode in encoders(kind).items():
+                elapsed, nbytes = bench(encode, value, args.repeat)
+                baseline = baseline or elapsed
+                print(
+                    f"{kind:>16} {size:>8,} {name:>14} {elapsed * 1000:>10.2f} {nbytes:>12,} "
+                    f"{baseline / elapsed:>11.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark harness: latency percentiles, baselines and regression checks."""
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+Request = Callable[[], Awaitable[Any]]
+
+
+def summarize(latencies: List[float], elapsed: float, concurrency: int) -> Dict[str, Any]:
+    """p50/p95/p99 and throughput for a run, latencies in seconds."""
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+async def measure(
+    request: Request, requests: int, concurrency: int = 1, warmup: int = 5
+) -> Dict[str, Any]:
+    """
+    Run a request repeatedly and summarize its latency.
+
+    ``concurrency`` closed-loop clients issue requests back to back until
+    ``requests`` have completed, after ``warmup`` untimed requests.
+
+    Args:
+        request: Zero-argument coroutine function issuing one request
+        requests: Timed requests
+        concurrency: Clients running at once
+        warmup: Untimed requests run first (caches, connection pools, JIT'd paths)
+    """
+    for _ in range(warmup):
+        await request()
+
+    latencies: List[float] = []
+    remaining = requests
+
+    async def client() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, concurrency)
+
+
+def environment() -> Dict[str, Any]:
+    """Where the numbers came from, so baselines are compared like for like."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "numpy": np.__version__,
+    }
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Write results and environment metadata as a JSON baseline."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    """Results from a JSON baseline."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.2,
+    min_delta_ms: float = 0.5
+) -> List[str]:
+    """
+    Regressions of current results against a baseline.
+
+    A benchmark regresses when its p95 latency grows, or its throughput
+    shrinks, by more than ``threshold`` (a fraction). Latency changes
+    smaller than ``min_delta_ms`` are treated as noise.
+
+    Returns:
+        One message per regression; empty if none
+    """
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        result = current.get(name)
+        if result is None:
+            continue
+        if (
+            result["p95_ms"] > base["p95_ms"] * (1 + threshold)
+            and result["p95_ms"] - base["p95_ms"] > min_delta_ms
+        ):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']:.3f}ms -> {result['p95_ms']:.3f}ms"
+            )
+        if result["throughput_rps"] * (1 + threshold) < base["throughput_rps"]:
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']:.1f}/s"
+                f" -> {result['throughput_rps']:.1f}/s"
+            )
+    return regressions
+
+
+def format_table(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Optional[Dict[str, Dict[str, Any]]] = None
+) -> str:
+    """Results as a fixed-width table, with the p95 change against a baseline if given."""
+    header = (
+        f"{'benchmark':<40} {'conc':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>10}"
+    )
+    if baseline is not None:
+        header += f" {'p95 Δ':>8}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        line = (
+            f"{name:<40} {result['concurrency']:>5} {result['p50_ms']:>9.3f} "
+            f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['throughput_rps']:>10,.1f}"
+        )
+        base = (baseline or {}).get(name)
+        if base is not None and base["p95_ms"] > 0:
+            line += f" {(result['p95_ms'] / base['p95_ms'] - 1) * 100:>+7.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+"""Benchmark suite runner with baselines and regression checks.
+
+Usage:
+    python -m benchmarks.run [--layers agents,api] [--quick]
+                             [--save benchmarks/baselines/local.json]
+                             [--baseline benchmarks/baselines/local.json] [--threshold 0.2]
+
+Exits with status 1 when a benchmark regresses against the baseline by more
+than the threshold (p95 latency up, or throughput down). Baselines are only
+comparable on the same machine and settings; record one before a change and
+compare after it.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+
+import numpy as np
+
+from src.config import settings
+from src.employees import employee_repository
+from src.recruiting import candidate_repository
+
+from . import bench_agents, bench_api
+from .harness import compare, format_table, load_baseline, save_baseline
+from .scenarios import employees
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layers", default="agents,api", help="Comma-separated: agents, api")
+    parser.add_argument("--quick", action="store_true", help="Smaller data and fewer requests")
+    parser.add_argument("--requests", type=int, help="Timed requests per benchmark")
+    parser.add_argument("--concurrency", help="Comma-separated client counts (default 1,4,16,64)")
+    parser.add_argument("--save", help="Write results to this JSON baseline")
+    parser.add_argument("--baseline", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression fraction")
+    args = parser.parse_args()
+
+    random.seed(0)
+    np.random.seed(0)
+    # Benefits questions are answered by the fake provider, never a real LLM
+    settings.default_llm_provider = "fake"
+
+    requests = args.requests or (50 if args.quick else 500)
+    default_levels = "1,8" if args.quick else "1,4,16,64"
+    concurrency = [int(c) for c in (args.concurrency or default_levels).split(",")]
+    layers = [layer.strip() for layer in args.layers.split(",")]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        # Benefits eligibility reads employee records; keep them out of the real database
+        employee_repository.database_url = f"sqlite:///{scratch}/employees.db"
+        asyncio.run(employee_repository.upsert_many(settings.default_tenant, employees()))
+        # Recruiting scenarios load their candidate pool; keep it out of the real database
+        candidate_repository.database_url = f"sqlite:///{scratch}/candidates.db"
+        if "agents" in layers:
+            results.update(asyncio.run(bench_agents.run(requests, concurrency, args.quick)))
+        if "api" in layers:
+            batch_sizes = (100,) if args.quick else (100, 1000)
+            api = bench_api.run(requests, concurrency, batch_sizes, args.quick)
+            results.update(asyncio.run(api))
+        employee_repository.close()
+        candidate_repository.close()
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    print(format_table(results, baseline))
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nSaved baseline to {args.save}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Deterministic workloads shared by the agent and API benchmarks."""
+
+import random
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+SKILLS = ["python", "sql", "aws", "react", "go", "kubernetes", "java", "spark", "ml", "excel"]
+LOCATIONS = ["New York", "San Francisco", "Austin", "Remote", "Chicago"]
+
+
+class Scenario(NamedTuple):
+    """A benchmarked task, with an optional untimed task run once beforehand."""
+
+    task_type: str
+    task: Dict[str, Any]
+    setup: Optional[Dict[str, Any]] = None
+
+
+def candidates(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Synthetic candidate pool."""
+    rng = random.Random(seed)
+    return [
+        {
+            "candidate_id": f"cand-{i}",
+            "name": f"Candidate {i}",
+            "skills": rng.sample(SKILLS, rng.randint(2, 5)),
+            "location": rng.choice(LOCATIONS),
+            "salary": rng.randrange(60000, 220000, 1000),
+            "resume": " ".join(rng.sample(SKILLS, 4)) + " engineer with production experience",
+        }
+        for i in range(count)
+    ]
+
+
+def payroll_columns(count: int, seed: int = 0) -> Dict[str, List[Any]]:
+    """Column-oriented compensation data: 70% salaried, 30% hourly."""
+    rng = random.Random(seed)
+    salaried = [rng.random() < 0.7 for _ in range(count)]
+    return {
+        "employee_id": [f"emp-{i}" for i in range(count)],
+        "annual_salary": [rng.uniform(40000, 180000) if s else 0.0 for s in salaried],
+        "hourly_rate": [0.0 if s else rng.uniform(15, 60) for s in salaried],
+        "hours": [0.0 if s else rng.uniform(80, 180) for s in salaried],
+        "pretax_deductions": [rng.uniform(0, 800) for _ in range(count)],
+        "posttax_deductions": [rng.uniform(0, 200) for _ in range(count)],
+    }
+
+
+def hires(count: int) -> List[Dict[str, Any]]:
+    """A wave of new hires."""
+    return [
+        {"employee_id": f"hire-{i}", "employee_name": f"Hire {i}", "start_date": "2025-01-06",
+         "department": "Engineering", "role": "Engineer"}
+        for i in range(count)
+    ]
+
+
+def employees() -> List[Dict[str, Any]]:
+    """Employee records the benefits scenarios check eligibility against."""
+    return [{"employee_id": "emp-1", "employment_type": "full_time", "hours_per_week": 40}]
+
+
+def scenarios(quick: bool = False) -> Dict[str, Scenario]:
+    """Benchmark name -> scenario; quick shrinks the data sizes."""
+    pool = 500 if quick else 5000
+    employees = 1000 if quick else 10000
+    wave = 50 if quick else 500
+    return {
+        "recruiting.search": Scenario(
+            "recruiting",
+            {
+                "job_title": "Data Engineer",
+                "budget": 160000,
+                "requirements": ["python", "sql", "spark"],
+                "location": "Remote",
+                "top_k": 10,
+            },
+            setup={"job_title": "warmup", "budget": 0, "candidates": candidates(pool)},
+        ),
+        "onboarding.single": Scenario("onboarding", hires(1)[0]),
+        f"onboarding.bulk_{wave}": Scenario("onboarding", {"hires": hires(wave)}),
+        f"payroll.employees_{employees}": Scenario(
+            "payroll", {"period": "biweekly", "employees": payroll_columns(employees)}
+        ),
+        "benefits.enroll": Scenario(
+            "benefits", {"employee_id": "emp-1", "action": "enroll", "plan": "dental"}
+        ),
+        "benefits.query_cached": Scenario(
+            "benefits",
+            {"employee_id": "emp-1", "action": "query", "plan": "dental",
+             "question": "What's my deductible?"},
+        ),
+    }
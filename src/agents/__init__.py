@@ -1,10 +1,20 @@
-"""HR Agents module."""
+"""HR Agents module.
 
-from .base_agent import BaseAgent
-from .recruiting_agent import RecruitingAgent
-from .onboarding_agent import OnboardingAgent
-from .payroll_agent import PayrollAgent
-from .benefits_agent import BenefitsAgent
+Agent classes are imported on first access (PEP 562), so importing this
+package for the registry does not load every agent's dependencies.
+"""
+
+import importlib
+
+from .registry import AgentRegistry, UnknownTaskType, registry
+
+_LAZY = {
+    "BaseAgent": ".base_agent",
+    "RecruitingAgent": ".recruiting_agent",
+    "OnboardingAgent": ".onboarding_agent",
+    "PayrollAgent": ".payroll_agent",
+    "BenefitsAgent": ".benefits_agent",
+}
 
 __all__ = [
     "BaseAgent",
@@ -12,5 +22,20 @@ __all__ = [
     "OnboardingAgent",
     "PayrollAgent",
     "BenefitsAgent",
+    "AgentRegistry",
+    "UnknownTaskType",
+    "registry",
 ]
 
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
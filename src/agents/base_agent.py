@@ -1,14 +1,61 @@
 """Base agent class for all HR agents."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, Optional, Type
 from datetime import datetime
+import functools
 import uuid
 
+from ..metrics import instrument
+
+if TYPE_CHECKING:
+    from ..llm import LLMClient, LLMResponse
+
+
+# Agent instances inside CPU pool workers, one per class
+_worker_agents: Dict[type, "BaseAgent"] = {}
+
+
+def _execute_in_worker(agent_cls: Type["BaseAgent"], config: Dict[str, Any], task: Dict[str, Any]):
+    """Run a cpu_bound agent's task in a pool worker (returns the coroutine to run)."""
+    agent = _worker_agents.get(agent_cls)
+    if agent is None or agent.config != config:
+        agent = _worker_agents[agent_cls] = agent_cls(config)
+    return agent.execute(task)
+
+
+def _offloaded(execute: Callable) -> Callable:
+    """Wrap a cpu_bound agent's execute to run in the CPU pool once it is started."""
+    @functools.wraps(execute)
+    async def wrapper(self, task):
+        from ..utils.processes import cpu_pool
+        if not cpu_pool.started:
+            return await execute(self, task)
+        return await cpu_pool.run(_execute_in_worker, type(self), self.config, task)
+    
+    return wrapper
+
 
 class BaseAgent(ABC):
     """Base class for all HR agents."""
     
+    # Task type label used for metrics; set by each concrete agent
+    task_type: str = ""
+    
+    # Set on agents whose execute() is CPU-heavy and keeps no state between
+    # calls: calls then run in the CPU pool's worker processes instead of on
+    # the event loop (once the pool is started, e.g. by the API)
+    cpu_bound: bool = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every concrete execute() records latency, in-flight and error metrics
+        execute = cls.__dict__.get("execute")
+        if execute is not None and not getattr(execute, "__instrumented__", False):
+            if cls.cpu_bound:
+                execute = _offloaded(execute)
+            cls.execute = instrument(execute)
+    
     def __init__(self, agent_name: str, config: Optional[Dict[str, Any]] = None):
         self.agent_name = agent_name
         self.config = config or {}
@@ -28,6 +75,21 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def stream(self, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the agent's task, yielding result records as they are produced.
+        
+        Agents with large, row-oriented results override this to emit rows
+        incrementally. The default yields the full execution result once.
+        
+        Args:
+            task: Task parameters
+            
+        Yields:
+            Result records
+        """
+        yield await self.execute(task)
+    
     @abstractmethod
     def get_pricing(self) -> float:
         """
@@ -38,6 +100,48 @@ class BaseAgent(ABC):
         """
         pass
     
+    @property
+    def llm(self) -> "LLMClient":
+        """Shared LLM client (pooled connections, response cache, rate limits)."""
+        # Imported here: the HTTP stack is only needed by agents that call an LLM
+        from ..llm import get_llm_client
+        return get_llm_client()
+    
+    async def complete(self, prompt: str, **kwargs: Any) -> "LLMResponse":
+        """
+        Generate an LLM completion on behalf of this agent.
+        
+        The agent's config may set ``llm_provider`` and ``llm_model`` to
+        override the client defaults.
+        
+        Args:
+            prompt: Prompt text
+            **kwargs: Passed through to LLMClient.complete
+            
+        Returns:
+            The completion
+        """
+        kwargs.setdefault("provider", self.config.get("llm_provider"))
+        kwargs.setdefault("model", self.config.get("llm_model"))
+        return await self.llm.complete(prompt, **kwargs)
+    
+    async def run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a CPU-heavy function in the CPU pool, or inline if it is not started.
+        
+        NumPy arrays in the arguments and result (including dataclass fields)
+        are passed through shared memory rather than pickled.
+        
+        Args:
+            fn: Picklable function, e.g. a method of a module-level class
+            *args: Arguments for fn
+            
+        Returns:
+            fn's result
+        """
+        from ..utils.processes import cpu_pool
+        return await cpu_pool.run(fn, *args)
+    
     def validate_task(self, task: Dict[str, Any]) -> bool:
         """
         Validate task parameters.
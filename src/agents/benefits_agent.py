@@ -1,16 +1,61 @@
 """Benefits Agent - Automated benefits enrollment, claims processing, and queries."""
 
-from typing import Dict, Any
+import asyncio
+import os
+import time
+from datetime import date, datetime
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 from .base_agent import BaseAgent
+from ..benefits import (
+    EligibilityIndex,
+    SemanticAnswerCache,
+    adjudicate,
+    claims_paths,
+    load_plans,
+    process_claims_file,
+)
 from ..config import settings
+from ..employees import EmployeeRecord, employee_repository
+
+
+def eligibility_attributes(record: EmployeeRecord) -> Dict[str, Any]:
+    """
+    Attributes eligibility rules read for an employee: the record's
+    employment details, its free-form attributes (e.g. age), and
+    tenure_days counted from start_date unless set explicitly.
+    """
+    attributes = dict(record.attributes or {})
+    attributes["employment_type"] = record.employment_type
+    attributes["hours_per_week"] = record.hours_per_week
+    if record.start_date and "tenure_days" not in attributes:
+        try:
+            attributes["tenure_days"] = (date.today() - date.fromisoformat(record.start_date)).days
+        except ValueError:
+            pass
+    return attributes
 
 
 class BenefitsAgent(BaseAgent):
     """Autonomous agent for benefits tasks."""
     
+    task_type = "benefits"
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("benefits_agent", config)
         self.pricing = settings.pricing_benefits_enrollment
+        # Shared across requests; the registry keeps one agent per process.
+        # Plans only come from configuration; employees are keyed by
+        # (tenant_id, employee_id) and updated when their records are written
+        self.eligibility = EligibilityIndex(load_plans(settings.benefits_plans_file))
+        # Tenant -> (employee version, day, monotonic check time) the tenant's
+        # index entries were last confirmed current at
+        self._synced: Dict[str, Tuple[int, date, float]] = {}
+        employee_repository.add_listener(self._employees_changed)
+        self.answers = SemanticAnswerCache(
+            maxsize=settings.benefits_answer_cache_size,
+            threshold=settings.benefits_answer_similarity,
+            dim=settings.embedding_dim
+        )
     
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -21,6 +66,17 @@ class BenefitsAgent(BaseAgent):
                 - action: Action type (enroll, claim, query)
                 - employee_id: Employee ID
                 - plan: Benefits plan (optional)
+                - tenant_id: Tenant owning the employee (optional); eligibility
+                  is evaluated on the tenant's employee record, and enrolling
+                  an employee without one is rejected
+                - claim: For action "claim", a claim (claim_id, service_code,
+                  amount, service_date) to adjudicate for the employee
+                - claims_file: For action "claim", the name of an EDI-like
+                  batch file of CLM segments in the tenant's claims directory
+                  (``CLAIMS_DIR/<tenant_id>/``) to adjudicate in bulk; per-claim
+                  outcomes are written to a new file under its results/ and
+                  reported as results_file
+                - question: For action "query", a benefits question to answer
                 
         Returns:
             Execution results with benefits status
@@ -32,6 +88,21 @@ class BenefitsAgent(BaseAgent):
         employee_id = task.get("employee_id")
         plan = task.get("plan")
         
+        tenant_id = task.get("tenant_id") or settings.default_tenant
+        eligible_plans = await self.eligible_plans(tenant_id, employee_id)
+        if action == "enroll":
+            if eligible_plans is None:
+                raise ValueError(f"Unknown employee {employee_id}: eligibility cannot be checked")
+            if plan is not None and plan not in eligible_plans:
+                raise ValueError(f"Employee {employee_id} is not eligible for plan {plan}")
+        
+        claims = None
+        if action == "claim":
+            claims = await self._process_claims(task)
+        answer = None
+        if action == "query" and task.get("question"):
+            answer = await self.answer(task["question"], plan, tenant_id)
+        
         # Simulate AI-powered benefits process
         # In production, this would:
         # 1. Process enrollment/claims/queries
@@ -47,13 +118,140 @@ class BenefitsAgent(BaseAgent):
             "action": action,
             "employee_id": employee_id,
             "plan": plan,
+            "eligible_plans": None if eligible_plans is None else sorted(eligible_plans),
             "processed": True,
             "pricing": self.get_pricing() if action == "enroll" else 0.0,
-            "timestamp": self.created_at.isoformat()
+            "timestamp": datetime.utcnow().isoformat()
         }
+        if claims is not None:
+            result["claims"] = claims
+        if answer is not None:
+            result.update(answer)
         
         return result
     
+    async def eligible_plans(self, tenant_id: str, employee_id: Any) -> Optional[FrozenSet[str]]:
+        """
+        Plans a tenant's employee is eligible for, or None if the tenant has
+        no record for the employee.
+        
+        An indexed employee is a lookup; others are indexed from their
+        record on first use. Writes through the employee repository update
+        the index as they happen; changes made by other processes (and the
+        passing of a day, for tenure) are picked up by checking the tenant's
+        version at most every ``benefits_eligibility_recheck`` seconds.
+        """
+        await self._sync(tenant_id)
+        key = (tenant_id, str(employee_id))
+        eligible = self.eligibility.eligible_plans(key)
+        if eligible is not None:
+            return eligible
+        record = await employee_repository.get(*key)
+        if record is None:
+            return None
+        return self.eligibility.upsert_employee(key, eligibility_attributes(record), replace=True)
+    
+    async def _sync(self, tenant_id: str) -> None:
+        """Drop a tenant's index entries if its employees changed elsewhere."""
+        now, today = time.monotonic(), date.today()
+        synced = self._synced.get(tenant_id)
+        if synced is not None and synced[1] == today:
+            if now - synced[2] < settings.benefits_eligibility_recheck:
+                return
+        version = await employee_repository.version(tenant_id)
+        if synced is None or synced[:2] != (version, today):
+            for key in self.eligibility.employee_ids:
+                if key[0] == tenant_id:
+                    self.eligibility.remove_employee(key)
+        self._synced[tenant_id] = (version, today, now)
+    
+    def _employees_changed(
+        self, tenant_id: str, version: int, records: List[EmployeeRecord], removed: List[str]
+    ) -> None:
+        """Repository listener: re-evaluate eligibility for written employees."""
+        for employee_id in removed:
+            self.eligibility.remove_employee((tenant_id, employee_id))
+        for record in records:
+            key = (tenant_id, record.employee_id)
+            if key in self.eligibility:
+                attributes = eligibility_attributes(record)
+                self.eligibility.upsert_employee(key, attributes, replace=True)
+        synced = self._synced.get(tenant_id)
+        if synced is not None and synced[0] == version - 1:
+            # Nothing else was written in between: the index is still current
+            self._synced[tenant_id] = (version, synced[1], synced[2])
+    
+    async def answer(
+        self, question: str, plan: Any = None, tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Answer a benefits question, reusing the answer to any sufficiently
+        similar question the same tenant already asked about the same plan.
+        
+        Args:
+            question: Employee question
+            plan: Plan the question is about (scopes the cache)
+            tenant_id: Tenant asking (scopes the cache; default tenant if omitted)
+            
+        Returns:
+            answer, answer_cached and, for cached answers, answer_similarity
+        """
+        scope = f"{tenant_id or settings.default_tenant}/{plan or '*'}"
+        cached = self.answers.lookup(question, scope)
+        if cached is not None:
+            return {
+                "answer": cached.answer,
+                "answer_cached": True,
+                "answer_similarity": round(cached.similarity, 4)
+            }
+        
+        prompt = f"Benefits plan: {plan or 'any'}\nEmployee question: {question}"
+        response = await self.complete(
+            prompt,
+            system="You are an HR benefits assistant. Answer briefly and accurately."
+        )
+        self.answers.store(question, response.text, scope)
+        return {"answer": response.text, "answer_cached": False}
+    
+    async def _process_claims(self, task: Dict[str, Any]) -> Any:
+        """
+        Adjudicate a single claim, or a claims file across the shared CPU
+        pool (in this process when the pool is not started).
+        """
+        from ..utils.processes import cpu_pool
+
+        if "results_file" in task:
+            raise ValueError("results_file is chosen by the server and cannot be set")
+        if task.get("claims_file"):
+            path, results_path = claims_paths(
+                settings.claims_dir,
+                task.get("tenant_id") or settings.default_tenant,
+                str(task["claims_file"])
+            )
+            report = await asyncio.to_thread(
+                process_claims_file,
+                path,
+                results_path,
+                cpu_pool.workers,
+                settings.claims_chunk_size,
+                cpu_pool.executor
+            )
+            summary = report.to_dict()
+            summary["results_file"] = os.path.relpath(results_path, settings.claims_dir)
+            return summary
+        claim = task.get("claim")
+        if claim is None:
+            return None
+        return adjudicate((
+            "CLM",
+            str(claim.get("claim_id", "")),
+            str(task["employee_id"]),
+            str(claim.get("plan_id", task.get("plan") or "")),
+            str(claim.get("service_code", "")),
+            str(claim.get("amount", "")),
+            str(claim.get("service_date", "")),
+        ))
+    
     def get_pricing(self) -> float:
         """Get pricing for benefits enrollment transaction."""
         return self.pricing
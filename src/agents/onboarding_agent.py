@@ -1,13 +1,19 @@
 """Onboarding Agent - Automated new hire paperwork, provisioning, and training."""
 
-from typing import Dict, Any
+import time
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator
 from .base_agent import BaseAgent
 from ..config import settings
+from ..employees import employee_repository
+from ..onboarding import OnboardingPipeline, OnboardingRecord, default_stages
 
 
 class OnboardingAgent(BaseAgent):
     """Autonomous agent for onboarding tasks."""
     
+    task_type = "onboarding"
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("onboarding_agent", config)
         # Onboarding is typically part of hiring transaction
@@ -17,6 +23,9 @@ class OnboardingAgent(BaseAgent):
         """
         Execute onboarding task.
         
+        Each hire goes through the onboarding pipeline: paperwork,
+        provisioning, training and buddy matching.
+        
         Args:
             task: Task parameters including:
                 - employee_id: New employee ID
@@ -24,6 +33,14 @@ class OnboardingAgent(BaseAgent):
                 - start_date: Start date
                 - department: Department
                 - role: Job role
+                - create_employee: For a single hire, create the hire's
+                  employee record in the tenant's repository once
+                  onboarding succeeds (default False); employment_type,
+                  hours_per_week and annual_salary are stored with it
+                - tenant_id: Tenant the employee record belongs to (optional)
+                - hires: Optional list of hires (each with the fields above)
+                  to onboard in bulk instead of a single employee
+                - buddies: Optional buddy volunteers (employee_id, department)
                 
         Returns:
             Execution results with onboarding status
@@ -31,32 +48,90 @@ class OnboardingAgent(BaseAgent):
         if not self.validate_task(task):
             raise ValueError("Invalid task parameters")
         
-        employee_id = task.get("employee_id")
-        employee_name = task.get("employee_name")
-        start_date = task.get("start_date")
+        if "hires" not in task:
+            record = await self._onboard_one(task)
+            if not record.ok:
+                raise RuntimeError(f"Onboarding failed at {record.failed_stage}: {record.error}")
+            if task.get("create_employee"):
+                await employee_repository.upsert_many(
+                    task.get("tenant_id") or settings.default_tenant,
+                    [_employee_record(task)]
+                )
+            return {
+                "status": "success",
+                "agent": self.agent_name,
+                "task": "onboarding",
+                "employee_id": task.get("employee_id"),
+                "employee_name": task.get("employee_name"),
+                "paperwork_completed": "paperwork" in record.stages,
+                "equipment_provisioned": "provisioning" in record.stages,
+                "training_assigned": "training" in record.stages,
+                "buddy_id": record.stages["buddy_matching"]["buddy_id"],
+                "stages": record.stages,
+                "employee_created": bool(task.get("create_employee")),
+                "pricing": self.get_pricing(),
+                "timestamp": datetime.utcnow().isoformat()
+            }
         
-        # Simulate AI-powered onboarding process
-        # In production, this would:
-        # 1. Generate and send paperwork (I-9, W-4, benefits)
-        # 2. Provision equipment (laptop, access cards, software)
-        # 3. Assign training modules
-        # 4. Match with buddy/mentor
-        # 5. Schedule check-ins
+        started = time.perf_counter()
+        records = [record async for record in self._pipeline(task).run(task["hires"])]
+        records.sort(key=lambda record: record.index)
+        succeeded = sum(1 for record in records if record.ok)
+        result = self._summary(len(records), succeeded, time.perf_counter() - started)
+        result["results"] = [record.result() for record in records]
+        return result
+    
+    async def stream(self, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute onboarding task, yielding each hire as it leaves the pipeline.
+        
+        Args:
+            task: Task parameters (same as execute)
+            
+        Yields:
+            Hire records in completion order, then one summary record
+        """
+        if not self.validate_task(task) or "hires" not in task:
+            yield await self.execute(task)
+            return
         
-        result = {
-            "status": "success",
+        started = time.perf_counter()
+        processed = succeeded = 0
+        async for record in self._pipeline(task).run(task["hires"]):
+            processed += 1
+            succeeded += record.ok
+            yield record.result()
+        summary = self._summary(processed, succeeded, time.perf_counter() - started)
+        yield {"record": "summary", **summary}
+    
+    async def _onboard_one(self, hire: Dict[str, Any]) -> OnboardingRecord:
+        """Run a single hire through the pipeline."""
+        records = [record async for record in self._pipeline(hire).run([hire])]
+        return records[0]
+    
+    def _pipeline(self, task: Dict[str, Any]) -> OnboardingPipeline:
+        """Onboarding pipeline configured from settings and the task's buddy pool."""
+        stages = default_stages(
+            settings.onboarding_stage_concurrency,
+            retries=settings.onboarding_stage_retries,
+            buddies=task.get("buddies", ())
+        )
+        return OnboardingPipeline(stages, queue_size=settings.onboarding_queue_size)
+    
+    def _summary(self, processed: int, succeeded: int, elapsed: float) -> Dict[str, Any]:
+        """Bulk onboarding result counts."""
+        failed = processed - succeeded
+        return {
+            "status": "success" if not failed else "partial",
             "agent": self.agent_name,
             "task": "onboarding",
-            "employee_id": employee_id,
-            "employee_name": employee_name,
-            "paperwork_completed": True,
-            "equipment_provisioned": True,
-            "training_assigned": True,
+            "hires_processed": processed,
+            "succeeded": succeeded,
+            "failed": failed,
+            "hires_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
             "pricing": self.get_pricing(),
-            "timestamp": self.created_at.isoformat()
+            "timestamp": datetime.utcnow().isoformat()
         }
-        
-        return result
     
     def get_pricing(self) -> float:
         """Get pricing for onboarding transaction."""
@@ -65,5 +140,25 @@ class OnboardingAgent(BaseAgent):
     def validate_task(self, task: Dict[str, Any]) -> bool:
         """Validate onboarding task parameters."""
         required = ["employee_id", "employee_name", "start_date"]
+        if "hires" in task:
+            hires = task["hires"]
+            return isinstance(hires, list) and all(
+                isinstance(hire, dict) and all(key in hire for key in required)
+                for hire in hires
+            )
         return all(key in task for key in required)
 
+
+def _employee_record(hire: Dict[str, Any]) -> Dict[str, Any]:
+    """Employee record for an onboarded hire; fields not given are left unset."""
+    record = {
+        "employee_id": hire["employee_id"],
+        "name": hire.get("employee_name"),
+        "department": hire.get("department"),
+        "job_title": hire.get("role"),
+        "start_date": hire.get("start_date"),
+        "employment_type": hire.get("employment_type"),
+        "hours_per_week": hire.get("hours_per_week"),
+        "annual_salary": hire.get("annual_salary"),
+    }
+    return {key: value for key, value in record.items() if value is not None}
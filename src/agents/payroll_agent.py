@@ -1,16 +1,54 @@
 """Payroll Agent - Automated payroll processing, tax compliance, and payments."""
 
-from typing import Dict, Any
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator
 from .base_agent import BaseAgent
 from ..config import settings
+from ..employees import employee_repository
+from ..payroll import (
+    PERIODS_PER_YEAR,
+    IncrementalPayroll,
+    PayrollEngine,
+    PayrollInputs,
+    PayrollResult,
+    load_tax_tables,
+)
+
+
+# One engine per process and tax tables file, shared by the agent and the
+# stream chunks CPU pool workers run, so neither is rebuilt nor pickled
+_engines: Dict[str, PayrollEngine] = {}
+
+
+def process_engine() -> PayrollEngine:
+    """This process's payroll engine for the configured tax tables."""
+    path = settings.payroll_tax_tables_file
+    engine = _engines.get(path)
+    if engine is None:
+        engine = _engines[path] = PayrollEngine(tax_tables=load_tax_tables(path))
+    return engine
+
+
+def _run_chunk(inputs: PayrollInputs, period: str) -> PayrollResult:
+    """Run one stream chunk on the current process's engine."""
+    return process_engine().run(inputs, period)
 
 
 class PayrollAgent(BaseAgent):
     """Autonomous agent for payroll tasks."""
     
+    task_type = "payroll"
+    
+    # Engine runs are pure NumPy over the whole roster; keep them off the event loop
+    cpu_bound = True
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("payroll_agent", config)
         self.pricing = settings.pricing_payroll
+        # Tax tables are compiled once per process
+        self.engine = process_engine()
+        self.reruns = IncrementalPayroll(self.engine)
     
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -19,7 +57,21 @@ class PayrollAgent(BaseAgent):
         Args:
             task: Task parameters including:
                 - period: Payroll period (monthly, biweekly, etc.)
-                - employee_ids: List of employee IDs (optional, all if not provided)
+                - employees: Compensation records, either a list of dicts or a
+                  dict of columns (employee_id, annual_salary, hourly_rate,
+                  hours, pretax_deductions, posttax_deductions, and the
+                  state and locality codes taxes are withheld for)
+                - employee_ids: List of employee IDs (optional, all if not provided);
+                  without employees, their records (or the tenant's whole
+                  roster) are loaded from the employee repository
+                - tenant_id: Tenant owning the employees (optional)
+                - run_id: Stored run to create or rerun (optional); a rerun
+                  only recomputes employees whose inputs changed and
+                  reports the delta
+                - partial: With run_id, employees holds only corrections and
+                  everyone else keeps their stored pay (default False)
+                - full: With run_id, recompute every employee given, not
+                  only those whose inputs changed (default False)
                 
         Returns:
             Execution results with payroll status
@@ -28,36 +80,129 @@ class PayrollAgent(BaseAgent):
             raise ValueError("Invalid task parameters")
         
         period = task.get("period", "monthly")
-        employee_ids = task.get("employee_ids")
+        inputs = await self._build_inputs(task)
+        
+        # Gross-to-net for the whole run in one vectorized pass; reruns of a
+        # stored run only recompute employees whose inputs changed
+        delta = None
+        if task.get("run_id"):
+            payroll, delta = await asyncio.to_thread(
+                self.reruns.run,
+                inputs,
+                period,
+                task["run_id"],
+                task.get("tenant_id"),
+                bool(task.get("partial", False)),
+                bool(task.get("full", False))
+            )
+        else:
+            payroll = self.engine.run(inputs, period)
+        totals = payroll.totals()
         
-        # Simulate AI-powered payroll process
-        # In production, this would:
-        # 1. Calculate payroll (wages, deductions, taxes)
-        # 2. Ensure tax compliance (federal, state, local)
-        # 3. Process direct deposits
-        # 4. Generate pay stubs
-        # 5. Reconcile payroll
+        # In production, this would also:
+        # 1. Process direct deposits
+        # 2. Generate pay stubs
+        # 3. Reconcile payroll
         
         result = {
             "status": "success",
             "agent": self.agent_name,
             "task": "payroll",
             "period": period,
-            "employees_processed": 100 if not employee_ids else len(employee_ids),
-            "total_amount": 500000.0,  # Simulated
+            "employees_processed": len(payroll),
+            "total_amount": totals["gross"],
+            "totals": totals,
             "tax_compliance": True,
             "payments_processed": True,
             "pricing": self.get_pricing(),
-            "timestamp": self.created_at.isoformat()
+            "timestamp": datetime.utcnow().isoformat()
         }
+        if delta is not None:
+            result["run_id"] = task["run_id"]
+            result["delta"] = delta.to_dict()
         
         return result
     
+    async def stream(self, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute payroll task, yielding one pay stub per employee.
+        
+        The run is computed in chunks of ``payroll_stream_chunk_size`` rows,
+        so only one chunk of results is held in memory at a time. A final
+        summary record carries the run totals.
+        
+        Args:
+            task: Task parameters (same as execute)
+            
+        Yields:
+            PayStub records, then one summary record
+        """
+        if not self.validate_task(task):
+            raise ValueError("Invalid task parameters")
+        
+        period = task.get("period", "monthly")
+        inputs = await self._build_inputs(task)
+        chunk_size = settings.payroll_stream_chunk_size
+        totals = {"gross": 0.0, "deductions": 0.0, "taxes": 0.0, "net": 0.0}
+        
+        for start in range(0, len(inputs), chunk_size):
+            # Only the slice crosses to the worker, which uses its own engine
+            chunk = inputs.slice(start, start + chunk_size)
+            payroll = await self.run_cpu(_run_chunk, chunk, period)
+            for key, value in payroll.totals().items():
+                totals[key] += value
+            for stub in payroll.pay_stubs():
+                yield stub
+            # Let other requests run between chunks
+            await asyncio.sleep(0)
+        
+        yield {
+            "record": "summary",
+            "status": "success",
+            "agent": self.agent_name,
+            "task": "payroll",
+            "period": period,
+            "employees_processed": len(inputs),
+            "total_amount": round(totals["gross"], 2),
+            "totals": {key: round(value, 2) for key, value in totals.items()},
+            "pricing": self.get_pricing(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    async def _build_inputs(self, task: Dict[str, Any]) -> PayrollInputs:
+        """Columnar payroll inputs for the employees selected by a task."""
+        employees = task.get("employees")
+        employee_ids = task.get("employee_ids")
+        
+        if employees is None:
+            tenant_id = task.get("tenant_id") or settings.default_tenant
+            if not employee_ids:
+                roster = await employee_repository.get_all(tenant_id)
+                if not roster:
+                    raise ValueError(f"Tenant {tenant_id} has no employees to pay")
+                return PayrollInputs.from_records([roster[e].to_dict() for e in sorted(roster)])
+            # One bulk lookup for the whole run rather than one per employee
+            records = await employee_repository.get_many(tenant_id, employee_ids)
+            ids = list(dict.fromkeys(str(e) for e in employee_ids))
+            unknown = [e for e in ids if e not in records]
+            if unknown:
+                raise ValueError(f"Unknown employees: {', '.join(unknown[:10])}")
+            return PayrollInputs.from_records([records[e].to_dict() for e in ids])
+        
+        inputs = PayrollInputs.from_task(employees)
+        if employee_ids:
+            inputs = inputs.select(employee_ids)
+        return inputs
+    
     def get_pricing(self) -> float:
         """Get pricing for payroll transaction."""
         return self.pricing
     
     def validate_task(self, task: Dict[str, Any]) -> bool:
         """Validate payroll task parameters."""
-        return True  # Period is optional, defaults to monthly
+        # Period is optional, defaults to monthly
+        if task.get("period", "monthly") not in PERIODS_PER_YEAR:
+            return False
+        employees = task.get("employees")
+        return employees is None or isinstance(employees, (list, dict))
 
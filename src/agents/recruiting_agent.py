@@ -1,16 +1,27 @@
 """Recruiting Agent - Automated candidate sourcing, screening, and scheduling."""
 
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
 from ..config import settings
+from ..recruiting import (
+    Candidate,
+    CandidateMatch,
+    ResumeScreener,
+    candidate_repository,
+    schedule_interviews
+)
 
 
 class RecruitingAgent(BaseAgent):
     """Autonomous agent for recruiting tasks."""
     
+    task_type = "recruiting"
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("recruiting_agent", config)
         self.pricing = settings.pricing_hiring
+        self._screener: Optional[ResumeScreener] = None
     
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -22,6 +33,14 @@ class RecruitingAgent(BaseAgent):
                 - budget: Salary budget
                 - requirements: Job requirements
                 - location: Job location
+                - top_k: Number of ranked candidates to return (default 10)
+                - tenant_id: Tenant whose candidate pool is searched (optional)
+                - candidates: Candidate records to add or update in the
+                  tenant's pool
+                - remove_candidates: Candidate IDs to drop from the tenant's pool
+                - interviewers: Interviewer ID -> free [start, end] intervals
+                - candidate_availability: Candidate ID -> [start, end] windows
+                - interview_duration: Interview length in minutes (default 60)
                 
         Returns:
             Execution results with candidate matches
@@ -33,29 +52,94 @@ class RecruitingAgent(BaseAgent):
         budget = task.get("budget")
         requirements = task.get("requirements", [])
         location = task.get("location")
+        top_k = task.get("top_k", 10)
+        
+        # Keep the tenant's candidate pool current before ranking
+        pool = await candidate_repository.update(
+            task.get("tenant_id") or settings.default_tenant,
+            candidates=(Candidate.from_dict(c) for c in task.get("candidates", [])),
+            remove=task.get("remove_candidates", [])
+        )
+        
+        # Shortlist from the index, then screen resumes and re-rank
+        shortlist, candidates_found = pool.search(
+            requirements=requirements,
+            location=location,
+            budget=budget,
+            k=max(top_k, settings.screening_pool_size)
+        )
+        screened = self.screen(job_title, requirements, shortlist)
+        matches = sorted(shortlist, key=lambda m: m.score, reverse=True)[:top_k]
+        
+        # Book interviews for the ranked candidates, best first
+        availability = task.get("candidate_availability", {})
+        schedule = schedule_interviews(
+            interviewers=task.get("interviewers", {}),
+            candidates={
+                m.candidate.candidate_id: availability[m.candidate.candidate_id]
+                for m in matches if m.candidate.candidate_id in availability
+            },
+            duration=task.get("interview_duration", 60) * 60
+        )
+        iso_times = _uses_iso_times(task.get("interviewers", {}))
         
-        # Simulate AI-powered recruiting process
-        # In production, this would:
+        # In production, this would also:
         # 1. Source candidates from LinkedIn, job boards, referrals
-        # 2. Screen resumes using AI
-        # 3. Rank candidates
-        # 4. Schedule interviews
-        # 5. Send communications
+        # 2. Send communications
         
         result = {
             "status": "success",
             "agent": self.agent_name,
             "task": "recruiting",
             "job_title": job_title,
-            "candidates_found": 10,  # Simulated
-            "candidates_screened": 5,  # Simulated
-            "interviews_scheduled": 3,  # Simulated
+            "candidates_found": candidates_found,
+            "candidates_screened": screened,
+            "interviews_scheduled": len(schedule.interviews),
+            "interviews": [i.to_dict(iso=iso_times) for i in schedule.interviews],
+            "scheduling_ms": round(schedule.solve_time_ms, 3),
+            "candidates": [match.summary() for match in matches],
             "pricing": self.get_pricing(),
-            "timestamp": self.created_at.isoformat()
+            "timestamp": datetime.utcnow().isoformat()
         }
         
         return result
     
+    @property
+    def screener(self) -> ResumeScreener:
+        """Resume screener, created (and its disk cache opened) on first use."""
+        if self._screener is None:
+            self._screener = ResumeScreener(
+                cache_dir=settings.embedding_cache_dir,
+                dim=settings.embedding_dim
+            )
+        return self._screener
+    
+    def screen(self, job_title: str, requirements: List[str], matches: List[CandidateMatch]) -> int:
+        """
+        Score shortlisted resumes against the job and blend the resume
+        similarity into each match's score.
+        
+        Args:
+            job_title: Job title
+            requirements: Job requirements
+            matches: Shortlisted matches, updated in place
+            
+        Returns:
+            Number of resumes screened
+        """
+        with_resume = [m for m in matches if m.candidate.resume]
+        if not with_resume:
+            return 0
+        
+        query = " ".join([job_title, *requirements])
+        similarities = self.screener.score(query, [m.candidate.resume for m in with_resume])
+        for match, similarity in zip(with_resume, similarities.tolist()):
+            match.similarity = similarity
+        # Candidates without a resume are ranked as if it did not match
+        for match in matches:
+            match.score = 0.5 * match.score + 0.5 * max(match.similarity or 0.0, 0.0)
+        return len(with_resume)
+    
     def get_pricing(self) -> float:
         """Get pricing for recruiting transaction."""
         return self.pricing
@@ -65,3 +149,10 @@ class RecruitingAgent(BaseAgent):
         required = ["job_title", "budget"]
         return all(key in task for key in required)
 
+
+def _uses_iso_times(intervals: Dict[str, List[Any]]) -> bool:
+    """Whether availability was given as ISO 8601 strings rather than epoch seconds."""
+    for slots in intervals.values():
+        for start, _ in slots:
+            return isinstance(start, str)
+    return True
@@ -0,0 +1,264 @@
+"""Agent registry - reusable agent instances keyed by task type."""
+
+import asyncio
+import importlib
+from typing import Dict, Any, AsyncIterator, Optional, Type, List, Sequence, Tuple, Union
+
+from .base_agent import BaseAgent
+from ..config import settings
+
+
+# Agent classes as "module:Class" paths, imported when first used so that
+# loading the registry does not pull in every agent's dependencies
+AGENT_TYPES: Dict[str, str] = {
+    "recruiting": "src.agents.recruiting_agent:RecruitingAgent",
+    "onboarding": "src.agents.onboarding_agent:OnboardingAgent",
+    "payroll": "src.agents.payroll_agent:PayrollAgent",
+    "benefits": "src.agents.benefits_agent:BenefitsAgent",
+}
+
+AgentType = Union[Type[BaseAgent], str]
+
+
+def load_agent_class(agent_type: AgentType) -> Type[BaseAgent]:
+    """Resolve a "module:Class" path to the class; classes pass through."""
+    if not isinstance(agent_type, str):
+        return agent_type
+    module, _, name = agent_type.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+class UnknownTaskType(KeyError):
+    """Raised when no agent is registered for a task type."""
+
+    def __init__(self, task_type: str):
+        super().__init__(task_type)
+        self.task_type = task_type
+
+    def __str__(self) -> str:
+        return f"Unknown task type: {self.task_type}"
+
+
+class AgentRegistry:
+    """
+    Holds one long-lived agent per task type.
+
+    Agents are stateless between calls, so a single instance per task type
+    can serve any number of concurrent requests. Each agent is guarded by its
+    own semaphore so a flood of one task type cannot monopolize the process.
+    """
+
+    def __init__(
+        self,
+        agent_types: Optional[Dict[str, AgentType]] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        self.agent_types = dict(agent_types or AGENT_TYPES)
+        self.max_concurrency = max_concurrency or settings.agent_max_concurrency
+        self._agents: Dict[str, BaseAgent] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    @property
+    def task_types(self) -> List[str]:
+        """Registered task types."""
+        return list(self.agent_types)
+
+    def register(self, task_type: str, agent_cls: AgentType) -> None:
+        """Register (or replace) the agent class, or its "module:Class" path, for a task type."""
+        task_type = task_type.lower()
+        self.agent_types[task_type] = agent_cls
+        self._agents.pop(task_type, None)
+        self._semaphores.pop(task_type, None)
+
+    def get(self, task_type: str) -> BaseAgent:
+        """
+        Get the shared agent for a task type, creating it on first use.
+
+        Args:
+            task_type: Task type (recruiting, onboarding, payroll, benefits)
+
+        Returns:
+            Agent instance
+
+        Raises:
+            UnknownTaskType: If no agent is registered for the task type
+        """
+        agent = self._agents.get(task_type)
+        if agent is not None:
+            return agent
+
+        agent = self._agents[task_type] = self.agent_class(task_type)()
+        self._semaphores[task_type] = asyncio.Semaphore(self.max_concurrency)
+        return agent
+
+    def agent_class(self, task_type: str) -> Type[BaseAgent]:
+        """
+        The agent class for a task type, importing it if needed.
+
+        Raises:
+            UnknownTaskType: If no agent is registered for the task type
+        """
+        agent_type = self.agent_types.get(task_type)
+        if agent_type is None:
+            raise UnknownTaskType(task_type)
+        agent_cls = load_agent_class(agent_type)
+        self.agent_types[task_type] = agent_cls
+        return agent_cls
+
+    def warm_up(self) -> None:
+        """Instantiate every registered agent ahead of the first request."""
+        for task_type in self.agent_types:
+            self.get(task_type)
+
+    def in_flight(self, task_type: str) -> int:
+        """Number of tasks currently executing on a task type's agent."""
+        return self._in_flight.get(task_type, 0)
+
+    async def execute(self, task_type: str, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a task on the shared agent, respecting its concurrency cap.
+
+        Args:
+            task_type: Task type
+            task: Task parameters
+
+        Returns:
+            Execution results
+        """
+        agent = self.get(task_type)
+        async with self._semaphores[task_type]:
+            self._in_flight[task_type] = self._in_flight.get(task_type, 0) + 1
+            try:
+                return await agent.execute(task)
+            finally:
+                self._in_flight[task_type] -= 1
+
+    async def stream(self, task_type: str, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a task's result records, holding the agent's concurrency slot
+        until the stream is exhausted or closed.
+
+        Args:
+            task_type: Task type
+            task: Task parameters
+
+        Yields:
+            Result records
+        """
+        agent = self.get(task_type)
+        async with self._semaphores[task_type]:
+            self._in_flight[task_type] = self._in_flight.get(task_type, 0) + 1
+            try:
+                async for record in agent.stream(task):
+                    yield record
+            finally:
+                self._in_flight[task_type] -= 1
+
+    async def stream_many(
+        self,
+        tasks: Sequence[Tuple[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a batch of tasks with bounded concurrency, yielding each
+        item as soon as it finishes.
+
+        Agents are resolved and tasks validated for the whole batch before
+        anything runs, so unknown task types and invalid parameters are
+        reported without occupying a worker. The remaining tasks are drained
+        by a fixed number of workers, which keeps the number of live
+        coroutines constant regardless of batch size.
+
+        Args:
+            tasks: Sequence of (task_type, parameters) pairs
+            max_concurrency: Maximum number of tasks executing at once
+
+        Yields:
+            One item per task, in completion order, with either a result or
+            an error
+        """
+        max_concurrency = max_concurrency or settings.batch_max_concurrency
+        runnable: List[Dict[str, Any]] = []
+        prices: Dict[str, float] = {}
+
+        for index, (task_type, parameters) in enumerate(tasks):
+            task_type = task_type.lower()
+            item = {
+                "index": index,
+                "task_type": task_type,
+                "status": "error",
+                "result": None,
+                "pricing": 0.0,
+                "error": None
+            }
+            try:
+                agent = self.get(task_type)
+            except UnknownTaskType as e:
+                item["error"] = str(e)
+                yield item
+                continue
+            if not agent.validate_task(parameters):
+                item["error"] = "Invalid task parameters"
+                yield item
+                continue
+            if task_type not in prices:
+                prices[task_type] = agent.get_pricing()
+            runnable.append(item)
+
+        pending = iter(runnable)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            for item in pending:
+                task_type = item["task_type"]
+                try:
+                    item["result"] = await self.execute(task_type, tasks[item["index"]][1])
+                except Exception as e:
+                    item["error"] = str(e)
+                else:
+                    item["status"] = "success"
+                    item["pricing"] = prices[task_type]
+                done.put_nowait(item)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrency, len(runnable)))
+        ]
+        try:
+            for _ in range(len(runnable)):
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def execute_many(
+        self,
+        tasks: Sequence[Tuple[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a batch of tasks with bounded concurrency.
+
+        See stream_many for how the batch is scheduled.
+
+        Args:
+            tasks: Sequence of (task_type, parameters) pairs
+            max_concurrency: Maximum number of tasks executing at once
+
+        Returns:
+            One item per task, in input order, with either a result or an error
+        """
+        items: List[Dict[str, Any]] = [{} for _ in tasks]
+        async for item in self.stream_many(tasks, max_concurrency):
+            items[item["index"]] = item
+        return items
+
+    def clear(self) -> None:
+        """Drop all agent instances; they are recreated on next use."""
+        self._agents.clear()
+        self._semaphores.clear()
+        self._in_flight.clear()
+
+
+registry = AgentRegistry()
@@ -0,0 +1,207 @@
+"""Admission control: reject task requests early instead of queueing without bound."""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..config import settings
+from ..metrics import Histogram, MetricsRegistry, metrics
+from ..utils.cache import TTLCache
+from ..utils.ratelimit import TokenBucket
+
+
+# Adaptation steps: cut a task type's rate by this factor while its p95 is
+# over target, otherwise grow it back by this fraction of its base rate
+DECREASE_FACTOR = 0.7
+INCREASE_FRACTION = 0.1
+
+# Lowest adapted rate, as a fraction of the base rate
+MIN_RATE_FRACTION = 0.1
+
+# Completed tasks needed in a window before its p95 is trusted
+MIN_SAMPLES = 20
+
+
+class AdmissionRejected(Exception):
+    """A request was refused; the client should retry after retry_after seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Too many requests ({reason}); retry after {retry_after:g}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value: whole seconds, at least 1."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    """
+    Per-tenant and per-task-type token buckets plus a global in-flight cap.
+
+    A request is admitted only if its tenant's bucket and its task type's
+    bucket both hold a token and fewer than max_in_flight admitted tasks
+    are running; otherwise it is rejected at once with a retry delay, so
+    one tenant's burst cannot queue work ahead of everyone else's. A
+    request carrying several tasks (a batch, a workflow) takes one token
+    per bucket but counts every task it runs at once against the in-flight
+    cap; no request may hold more than max_in_flight slots.
+
+    Task-type rates adapt to the agents' measured latency: every
+    adapt_interval seconds, the p95 of the tasks completed in that window
+    is compared with the task type's target. Over target, the rate is cut
+    multiplicatively; at or under, it grows back additively towards its
+    configured rate. Task types without a configured rate are only subject
+    to the tenant buckets and the in-flight cap.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 256,
+        tenant_rate: float = 50.0,
+        tenant_burst: float = 100.0,
+        task_rates: Optional[Dict[str, float]] = None,
+        burst_seconds: float = 2.0,
+        target_p95: Optional[Dict[str, float]] = None,
+        adapt_interval: float = 5.0,
+        max_tenants: int = 10000,
+        enabled: bool = True,
+        stats: MetricsRegistry = metrics,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.tenant_rate = tenant_rate
+        self.tenant_burst = tenant_burst
+        self.base_rates = dict(task_rates or {})
+        self.target_p95 = dict(target_p95 or {})
+        self.adapt_interval = adapt_interval
+        self.in_flight = 0
+        self.rejected: Dict[str, int] = {}
+        self._stats = stats
+        self._clock = clock
+        # Idle tenants are evicted; a returning tenant starts with a full bucket
+        self._tenants = TTLCache(maxsize=max_tenants, clock=clock)
+        self._tasks = {
+            task_type: TokenBucket(rate, rate * burst_seconds, clock=clock)
+            for task_type, rate in self.base_rates.items()
+        }
+        self._window: Dict[str, List[int]] = {}
+        self._adapted_at = clock()
+
+    def _tenant_bucket(self, tenant_id: str) -> TokenBucket:
+        bucket = self._tenants.get(tenant_id)
+        if bucket is None:
+            bucket = TokenBucket(self.tenant_rate, self.tenant_burst, clock=self._clock)
+            self._tenants.set(tenant_id, bucket)
+        return bucket
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionRejected:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return AdmissionRejected(reason, retry_after)
+
+    def _latency(self, task_type: str) -> Histogram:
+        """Latency of task_type's tasks since startup, across agents."""
+        latency = Histogram()
+        for (_, labelled), stats in self._stats.items():
+            if labelled == task_type:
+                latency.counts = [a + b for a, b in zip(latency.counts, stats.latency.counts)]
+        latency.count = sum(latency.counts)
+        return latency
+
+    def _p95(self, task_type: str) -> float:
+        """p95 latency of task_type's tasks in the current window, or 0.0 if too few."""
+        window = self._latency(task_type)
+        previous = self._window.get(task_type)
+        self._window[task_type] = list(window.counts)
+        # A metrics reset restarts the window
+        if previous is not None and all(a >= b for a, b in zip(window.counts, previous)):
+            window.counts = [a - b for a, b in zip(window.counts, previous)]
+            window.count = sum(window.counts)
+        return window.quantile(0.95) if window.count >= MIN_SAMPLES else 0.0
+
+    def adapt(self) -> None:
+        """Move each task type's rate towards its latency target."""
+        self._adapted_at = self._clock()
+        for task_type, bucket in self._tasks.items():
+            p95 = self._p95(task_type)
+            target = self.target_p95.get(task_type)
+            if not p95 or target is None:
+                continue
+            base = self.base_rates[task_type]
+            if p95 > target:
+                rate = max(base * MIN_RATE_FRACTION, bucket.rate * DECREASE_FACTOR)
+            else:
+                rate = min(base, bucket.rate + base * INCREASE_FRACTION)
+            bucket.set_rate(rate)
+
+    def admit(self, tenant_id: str, *task_types: str, tasks: int = 1) -> None:
+        """
+        Take admission slots; every admitted request must call release(tasks).
+
+        Args:
+            tenant_id: Tenant making the request
+            task_types: Task types the request runs; one token is taken from
+                each one's bucket
+            tasks: Tasks the request runs at once, counted against the
+                in-flight cap
+
+        Raises:
+            ValueError: If tasks exceeds max_in_flight, so the request could
+                never be admitted; callers run large batches in fewer slots
+            AdmissionRejected: If a rate limit or the in-flight cap is reached;
+                no tokens are consumed in that case
+        """
+        if tasks > self.max_in_flight:
+            raise ValueError(
+                f"A request may run at most {self.max_in_flight} tasks at once, not {tasks}"
+            )
+        if not self.enabled:
+            self.in_flight += tasks
+            return
+        if self._clock() - self._adapted_at >= self.adapt_interval:
+            self.adapt()
+
+        if self.in_flight + tasks > self.max_in_flight:
+            # A slot frees up roughly when a typical task finishes
+            typical = self._latency(task_types[0]).quantile(0.5) if task_types else 0.0
+            raise self._reject("in_flight", typical or 1.0)
+        buckets = [("tenant", self._tenant_bucket(tenant_id))]
+        for task_type in dict.fromkeys(task_types):
+            task_bucket = self._tasks.get(task_type)
+            if task_bucket is not None:
+                buckets.append(("task_type", task_bucket))
+        for reason, bucket in buckets:
+            wait = bucket.time_until_available()
+            if wait > 0:
+                raise self._reject(reason, wait)
+        for _, bucket in buckets:
+            bucket.try_acquire()
+        self.in_flight += tasks
+
+    def release(self, tasks: int = 1) -> None:
+        """Give back the slots taken by admit()."""
+        self.in_flight -= tasks
+
+    def stats(self) -> Dict[str, object]:
+        """In-flight count, rejections by reason and current task-type rates."""
+        return {
+            "in_flight": self.in_flight,
+            "rejected": dict(self.rejected),
+            "task_rates": {task_type: bucket.rate for task_type, bucket in self._tasks.items()},
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=settings.admission_max_in_flight,
+    tenant_rate=settings.admission_tenant_rate,
+    tenant_burst=settings.admission_tenant_burst,
+    task_rates=settings.admission_task_rates,
+    burst_seconds=settings.admission_burst_seconds,
+    target_p95=settings.admission_target_p95,
+    adapt_interval=settings.admission_adapt_interval,
+    enabled=settings.admission_enabled,
+)
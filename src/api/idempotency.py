@@ -0,0 +1,232 @@
+"""Idempotency keys: replay finished responses instead of re-running tasks."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..config import settings
+from ..serialization import to_builtins
+from ..utils.cache import TTLCache
+from ..utils.concurrency import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused with a different request body."""
+
+
+class IdempotencyStore(ABC):
+    """Durable backing store for finished responses, shared across restarts."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored entry for key, or None if absent or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        """Store an entry for ttl seconds."""
+
+    async def aclose(self) -> None:
+        """Release connections."""
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """Single-file local store; queries run on a worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency "
+                "(key TEXT PRIMARY KEY, entry TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM idempotency WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT entry FROM idempotency WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, entry, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(entry, default=to_builtins), time.time() + ttl)
+            )
+            conn.commit()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, entry, ttl)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Store in Redis (or anything speaking its protocol), expiring via EX."""
+
+    def __init__(self, url: str, prefix: str = "agenthr:idempotency:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        encoded = json.dumps(entry, default=to_builtins)
+        await self._redis.set(self.prefix + key, encoded, ex=max(1, int(ttl)))
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+def build_store(kind: str) -> Optional[IdempotencyStore]:
+    """
+    Backing store for a settings value.
+
+    Args:
+        kind: "memory" (no durable store), "sqlite" or "redis"
+
+    Returns:
+        The store, or None for memory only
+    """
+    if kind == "memory":
+        return None
+    if kind == "sqlite":
+        return SQLiteIdempotencyStore(settings.idempotency_sqlite_path)
+    if kind == "redis":
+        return RedisIdempotencyStore(settings.redis_url)
+    raise ValueError(f"Unknown idempotency store: {kind}")
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-compatible request body."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class IdempotencyCache:
+    """
+    Runs a request at most once per idempotency key.
+
+    Lookups go through an in-process LRU+TTL cache, then the optional
+    durable store. On a miss the request runs under single-flight, so
+    concurrent retries with the same key wait for the first attempt rather
+    than executing again. Only successful responses are kept; a failed
+    attempt can be retried with the same key.
+    """
+
+    def __init__(
+        self,
+        store: Optional[IdempotencyStore] = None,
+        cache_size: int = 10000,
+        ttl: float = 86400
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self._single_flight = SingleFlight()
+
+    async def run(
+        self,
+        key: str,
+        request_hash: str,
+        fn: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return the response for key, running fn only if none is recorded.
+
+        Args:
+            key: Idempotency key, scoped by the caller (e.g. per tenant)
+            request_hash: Fingerprint of the request body
+            fn: Zero-argument coroutine function producing the response
+
+        Returns:
+            (response, replayed); replayed is True when fn did not run
+
+        Raises:
+            IdempotencyConflict: The key was used for a different request
+        """
+        entry = self.cache.get(key)
+        if entry is None and self.store is not None:
+            try:
+                entry = await self.store.get(key)
+            except Exception:
+                logger.warning("Idempotency store lookup failed for %s", key, exc_info=True)
+            if entry is not None:
+                self.cache.set(key, entry)
+            else:
+                # Another request may have finished while we awaited the store
+                entry = self.cache.get(key)
+        if entry is not None:
+            return self._replay(entry, request_hash), True
+
+        ran = False
+
+        async def call() -> Dict[str, Any]:
+            nonlocal ran
+            ran = True
+            result = {"request_hash": request_hash, "response": await fn()}
+            self.cache.set(key, result)
+            if self.store is not None:
+                try:
+                    await self.store.set(key, result, self.ttl)
+                except Exception:
+                    logger.warning("Idempotency store write failed for %s", key, exc_info=True)
+            return result
+
+        entry = await self._single_flight.do(key, call)
+        if ran:
+            return entry["response"], False
+        return self._replay(entry, request_hash), True
+
+    @staticmethod
+    def _replay(entry: Dict[str, Any], request_hash: str) -> Dict[str, Any]:
+        if entry["request_hash"] != request_hash:
+            raise IdempotencyConflict("Idempotency key was already used for a different request")
+        return entry["response"]
+
+    async def aclose(self) -> None:
+        """Close the durable store."""
+        if self.store is not None:
+            await self.store.aclose()
+
+
+idempotency = IdempotencyCache(
+    store=build_store(settings.idempotency_store),
+    cache_size=settings.idempotency_cache_size,
+    ttl=settings.idempotency_ttl,
+)
@@ -1,18 +1,33 @@
 """FastAPI application for AgentHR."""
 
-from fastapi import FastAPI, HTTPException
+from datetime import date
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Iterable, Optional, List
+import asyncio
 import uvicorn
 
-from ..agents import (
-    RecruitingAgent,
-    OnboardingAgent,
-    PayrollAgent,
-    BenefitsAgent
-)
+from ..agents import registry, UnknownTaskType
+from ..billing import ledger
 from ..config import settings
+from ..employees import employee_repository
+from ..jobs import job_queue
+from ..llm import close_llm_client
+from ..metrics import metrics
+from ..serialization import MSGPACK_MEDIA_TYPE, dumps, encode, negotiate, packb
+from ..utils.processes import cpu_pool
+from ..workflows import (
+    WORKFLOW_TEMPLATES,
+    RunInProgressError,
+    Workflow,
+    WorkflowRun,
+    workflow_engine,
+)
+from .admission import AdmissionRejected, admission
+from .idempotency import IdempotencyConflict, fingerprint, idempotency
+from .profiling import profile_middleware, render_profile
 
 app = FastAPI(
     title="AgentHR API",
@@ -29,6 +44,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in cProfile sampling via the X-Profile request header
+app.middleware("http")(profile_middleware)
+
 
 class TaskRequest(BaseModel):
     """Task request model."""
@@ -43,6 +61,225 @@ class TaskResponse(BaseModel):
     pricing: float
 
 
+class BatchTaskRequest(BaseModel):
+    """Batch task request model."""
+    tasks: List[TaskRequest]
+    max_concurrency: Optional[int] = None
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single task within a batch."""
+    index: int
+    task_type: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    pricing: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchTaskResponse(BaseModel):
+    """Batch task response model."""
+    status: str
+    succeeded: int
+    failed: int
+    total_pricing: float
+    results: List[BatchItemResult]
+
+
+class EmployeesRequest(BaseModel):
+    """Bulk employee upsert model."""
+    employees: List[Dict[str, Any]]
+
+
+class JobRequest(BaseModel):
+    """Background job submission model."""
+    task_type: str
+    parameters: Dict[str, Any]
+    priority: Optional[int] = None
+
+
+class JobResponse(BaseModel):
+    """Background job status model."""
+    job_id: str
+    task_type: str
+    priority: int
+    tenant_id: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    pricing: float = 0.0
+    error: Optional[str] = None
+    submitted_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class WorkflowRequest(BaseModel):
+    """Workflow run request: a template name or explicit steps."""
+    template: Optional[str] = None
+    parameters: Dict[str, Any] = {}
+    steps: Optional[List[Dict[str, Any]]] = None
+    run_id: Optional[str] = None
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Records per streamed chunk; larger chunks mean fewer writes to the socket
+NDJSON_FLUSH_ROWS = 500
+
+
+async def _encoded_stream(
+    records: AsyncIterator[Dict[str, Any]],
+    media_type: str = NDJSON_MEDIA_TYPE,
+    flush_rows: int = 1
+) -> AsyncIterator[bytes]:
+    """
+    Encode records as NDJSON lines, or as back-to-back MessagePack objects,
+    flushing every flush_rows records.
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        encoder, separator = packb, b""
+    else:
+        encoder, separator = dumps, b"\n"
+    buffer = []
+    try:
+        async for record in records:
+            buffer.append(encoder(record))
+            if len(buffer) >= flush_rows:
+                yield separator.join(buffer) + separator
+                buffer.clear()
+    except Exception as e:
+        # The status line is already sent; report the failure in-band
+        buffer.append(encoder({"record": "error", "error": str(e)}))
+    if buffer:
+        yield separator.join(buffer) + separator
+
+
+def _stream_media_type(accept: Optional[str]) -> str:
+    """MessagePack if negotiated, NDJSON otherwise."""
+    media_type = negotiate(accept)
+    return media_type if media_type == MSGPACK_MEDIA_TYPE else NDJSON_MEDIA_TYPE
+
+
+def _encoded(
+    body: Any,
+    accept: Optional[str],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    A response body encoded in the negotiated format.
+
+    Agent results are encoded as produced; the route's response_model only
+    documents the shape and is not re-validated value by value.
+    """
+    media_type = negotiate(accept)
+    return Response(content=encode(body, media_type), media_type=media_type, headers=headers)
+
+
+def _scoped(parameters: Dict[str, Any], tenant_id: str) -> Dict[str, Any]:
+    """Task parameters bound to the caller's tenant, so agents only read its data."""
+    return {**parameters, "tenant_id": tenant_id}
+
+
+async def _billed(
+    records: AsyncIterator[Dict[str, Any]],
+    tenant_id: str,
+    task_type: str,
+    parameters: Dict[str, Any]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Pass records through, billing the task once the stream completes."""
+    priced = None
+    async for record in records:
+        if "pricing" in record:
+            priced = record
+        yield record
+    if priced is not None:
+        ledger.record_task(tenant_id, task_type, parameters, priced)
+
+
+async def _billed_items(
+    items: AsyncIterator[Dict[str, Any]],
+    tenant_id: str,
+    tasks: List[TaskRequest]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Pass batch items through, billing each successful one."""
+    async for item in items:
+        if item["status"] == "success":
+            parameters = tasks[item["index"]].parameters
+            ledger.record_task(tenant_id, item["task_type"], parameters, item["result"])
+        yield item
+
+
+def _admit(tenant_id: str, *task_types: str, tasks: int = 1) -> None:
+    """
+    Take admission slots for a request's tasks, or answer 429 with
+    Retry-After (413 if the request needs more slots than exist).
+    """
+    try:
+        admission.admit(tenant_id, *task_types, tasks=tasks)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header}
+        )
+
+
+async def _admitted(records: AsyncIterator[str], tasks: int = 1) -> AsyncIterator[str]:
+    """Pass a response stream through, releasing its admission slots when it ends."""
+    try:
+        async for record in records:
+            yield record
+    finally:
+        admission.release(tasks)
+
+
+def _batch_slots(request: BatchTaskRequest) -> int:
+    """
+    Admission slots for a batch: the tasks it runs at once, at most the
+    in-flight limit. A larger batch is drained through that many workers.
+    """
+    concurrency = request.max_concurrency or settings.batch_max_concurrency
+    return max(1, min(len(request.tasks), concurrency, admission.max_in_flight))
+
+
+def _task_types(tasks: Iterable[Any]) -> List[str]:
+    """Distinct task types of batch tasks or workflow steps, for admission."""
+    return list(dict.fromkeys(task.task_type.lower() for task in tasks))
+
+
+def _check_batch(request: BatchTaskRequest) -> None:
+    """Reject batches that exceed the configured limits."""
+    if len(request.tasks) > settings.batch_max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.tasks)} tasks (max {settings.batch_max_size})"
+        )
+    if request.max_concurrency is not None and request.max_concurrency < 1:
+        raise HTTPException(status_code=400, detail="max_concurrency must be at least 1")
+
+
+@app.on_event("startup")
+async def warm_up_agents():
+    """Create the shared agent instances before serving traffic."""
+    registry.warm_up()
+    cpu_pool.start(settings.cpu_pool_workers, settings.cpu_pool_shared_min_bytes)
+    await job_queue.start()
+    await ledger.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    """Stop background job workers, flush billing and release pooled connections."""
+    await job_queue.stop()
+    cpu_pool.stop()
+    await ledger.stop()
+    await idempotency.aclose()
+    employee_repository.close()
+    await close_llm_client()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -61,7 +298,12 @@ async def health():
 
 
 @app.post("/api/v1/tasks/execute", response_model=TaskResponse)
-async def execute_task(request: TaskRequest):
+async def execute_task(
+    request: TaskRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    accept: Optional[str] = Header(None)
+):
     """
     Execute an HR task using the appropriate agent.
     
@@ -70,40 +312,373 @@ async def execute_task(request: TaskRequest):
     - onboarding: Onboarding agent
     - payroll: Payroll agent
     - benefits: Benefits agent
+    
+    With an Idempotency-Key header, retries of the same request are served
+    the original response (marked Idempotent-Replayed) without re-running
+    or re-billing the task.
+    
+    Requests over the tenant's or task type's rate, or over the global
+    in-flight limit, are refused with 429 and a Retry-After header.
+    
+    Responses are JSON, or MessagePack with ``Accept: application/msgpack``.
     """
     task_type = request.task_type.lower()
-    parameters = request.parameters
-    
-    # Select and initialize agent
-    agent = None
-    if task_type == "recruiting":
-        agent = RecruitingAgent()
-    elif task_type == "onboarding":
-        agent = OnboardingAgent()
-    elif task_type == "payroll":
-        agent = PayrollAgent()
-    elif task_type == "benefits":
-        agent = BenefitsAgent()
+    parameters = _scoped(request.parameters, tenant_id)
+    
+    # Look up the shared agent for this task type
+    try:
+        agent = registry.get(task_type)
+    except UnknownTaskType as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def run() -> Dict[str, Any]:
+        try:
+            # Execute task
+            result = await registry.execute(task_type, parameters)
+            pricing = agent.get_pricing()
+            ledger.record_task(tenant_id, task_type, parameters, result)
+            
+            # Same shape as TaskResponse, without re-validating the result
+            return {"status": "success", "result": result, "pricing": pricing}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    _admit(tenant_id, task_type)
+    try:
+        if idempotency_key is None:
+            return _encoded(await run(), accept)
+        body, replayed = await idempotency.run(
+            f"{tenant_id}:{idempotency_key}",
+            fingerprint([task_type, parameters]),
+            run
+        )
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        admission.release()
+    return _encoded(body, accept, {"Idempotent-Replayed": "true"} if replayed else None)
+
+
+@app.post("/api/v1/tasks/stream")
+async def stream_task(
+    request: TaskRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Execute an HR task and stream its result records as NDJSON (or
+    MessagePack objects with ``Accept: application/msgpack``).
+    
+    Payroll emits one pay stub per line followed by a summary line; other
+    agents emit their single result. Admission is as for execute, with the
+    slot held until the stream ends.
+    """
+    task_type = request.task_type.lower()
+    parameters = _scoped(request.parameters, tenant_id)
+    
+    try:
+        agent = registry.get(task_type)
+    except UnknownTaskType as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not agent.validate_task(parameters):
+        raise HTTPException(status_code=400, detail="Invalid task parameters")
+    
+    media_type = _stream_media_type(accept)
+    _admit(tenant_id, task_type)
+    return StreamingResponse(
+        _admitted(_encoded_stream(
+            _billed(registry.stream(task_type, parameters), tenant_id, task_type, parameters),
+            media_type,
+            NDJSON_FLUSH_ROWS
+        )),
+        media_type=media_type
+    )
+
+
+@app.post("/api/v1/tasks/batch", response_model=BatchTaskResponse)
+async def execute_batch(
+    request: BatchTaskRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Execute many HR tasks in one call.
+    
+    Tasks run concurrently (bounded by max_concurrency) and each item
+    reports its own result or error; a failing task does not fail the batch.
+    Responses are JSON, or MessagePack with ``Accept: application/msgpack``.
+    
+    A batch takes one admission token for its tenant and each of its task
+    types, and each task it runs at once counts against the in-flight
+    limit; a batch never runs more tasks at once than that limit.
+    """
+    _check_batch(request)
+    
+    slots = _batch_slots(request)
+    _admit(tenant_id, *_task_types(request.tasks), tasks=slots)
+    try:
+        items = await registry.execute_many(
+            [(task.task_type, _scoped(task.parameters, tenant_id)) for task in request.tasks],
+            max_concurrency=slots
+        )
+    finally:
+        admission.release(slots)
+    succeeded = 0
+    for item, task in zip(items, request.tasks):
+        if item["status"] == "success":
+            succeeded += 1
+            ledger.record_task(tenant_id, item["task_type"], task.parameters, item["result"])
+    failed = len(items) - succeeded
+    
+    if not failed:
+        status = "success"
+    elif succeeded:
+        status = "partial"
     else:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unknown task type: {task_type}"
+        status = "failed"
+    
+    # Same shape as BatchTaskResponse; items are built by the registry, so
+    # they are encoded as is rather than validated one by one
+    return _encoded({
+        "status": status,
+        "succeeded": succeeded,
+        "failed": failed,
+        "total_pricing": sum(item["pricing"] for item in items),
+        "results": items
+    }, accept)
+
+
+@app.post("/api/v1/tasks/batch/stream")
+async def stream_batch(
+    request: BatchTaskRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Execute many HR tasks, streaming each item as NDJSON (or MessagePack)
+    as soon as it finishes (completion order, not input order).
+    Admission is as for batch, with the slots held until the stream ends.
+    """
+    _check_batch(request)
+    
+    slots = _batch_slots(request)
+    items = registry.stream_many(
+        [(task.task_type, _scoped(task.parameters, tenant_id)) for task in request.tasks],
+        max_concurrency=slots
+    )
+    media_type = _stream_media_type(accept)
+    _admit(tenant_id, *_task_types(request.tasks), tasks=slots)
+    return StreamingResponse(
+        _admitted(
+            _encoded_stream(_billed_items(items, tenant_id, request.tasks), media_type),
+            slots
+        ),
+        media_type=media_type
+    )
+
+
+@app.post("/api/v1/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: JobRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """
+    Queue an HR task for background execution on the job workers.
+    
+    Jobs run in priority order (lower first); the default priority comes
+    from the task type, e.g. payroll ahead of benefits queries.
+    
+    Admission is as for execute; a job holds its in-flight slot until it
+    finishes, so the queue cannot grow without bound.
+    """
+    task_type = request.task_type.lower()
+    _admit(tenant_id, task_type)
+    try:
+        job = await job_queue.submit(
+            task_type,
+            _scoped(request.parameters, tenant_id),
+            request.priority,
+            tenant_id=tenant_id,
+            on_done=admission.release
         )
+    except (UnknownTaskType, ValueError) as e:
+        admission.release()
+        raise HTTPException(status_code=400, detail=str(e))
+    return JobResponse(**job.to_dict())
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """Get the status, and once finished the result, of one of the tenant's background jobs."""
+    job = job_queue.get(job_id)
+    if job is None or job.tenant_id != tenant_id:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return JobResponse(**job.to_dict())
+
+
+def _bill_step(tenant_id: str):
+    """Workflow step callback that bills each completed step to a tenant."""
+    def bill(step, parameters: Dict[str, Any], result: Dict[str, Any]) -> None:
+        ledger.record_task(tenant_id, step.task_type, parameters, result)
+    return bill
+
+
+@app.post("/api/v1/workflows")
+async def run_workflow(
+    request: WorkflowRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """
+    Run a workflow of agent tasks and return the finished run.
     
+    Steps start as soon as their dependencies succeed, so independent
+    branches run concurrently. Progress is checkpointed after every step.
+    
+    A run takes one admission token for its tenant and each of its task
+    types, and every step counts against the in-flight limit; a run with
+    more steps than the limit is refused with 413.
+    """
     try:
-        # Execute task
-        result = await agent.execute(parameters)
-        pricing = agent.get_pricing()
-        
-        return TaskResponse(
-            status="success",
-            result=result,
-            pricing=pricing
+        if request.template is not None:
+            template = WORKFLOW_TEMPLATES.get(request.template)
+            if template is None:
+                raise ValueError(f"Unknown workflow template: {request.template}")
+            workflow = template(request.parameters)
+        else:
+            workflow = Workflow.from_dict({"steps": request.steps or []})
+        for step in workflow.steps.values():
+            registry.get(step.task_type)
+            step.parameters = _scoped(step.parameters, tenant_id)
+    except (ValueError, UnknownTaskType) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    steps = list(workflow.steps.values())
+    _admit(tenant_id, *_task_types(steps), tasks=len(steps))
+    try:
+        run = await workflow_engine.start(
+            workflow, request.run_id, _bill_step(tenant_id), tenant_id
         )
+    except RunInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        admission.release(len(steps))
+    return run.to_dict()
+
+
+@app.get("/api/v1/workflows/{run_id}")
+async def get_workflow(
+    run_id: str,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """Latest checkpoint of one of the tenant's workflow runs."""
+    try:
+        snapshot = await workflow_engine.get(run_id, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Unknown workflow run: {run_id}")
+    return snapshot
+
+
+@app.post("/api/v1/workflows/{run_id}/resume")
+async def resume_workflow(
+    run_id: str,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """
+    Resume a workflow run, re-running only the steps that did not succeed.
+    
+    Admission is as for starting the run, counting the steps still to run.
+    A run that is still executing (e.g. another resume of it) is refused
+    with 409.
+    """
+    try:
+        snapshot = await workflow_engine.get(run_id, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Unknown workflow run: {run_id}")
+    
+    remaining = WorkflowRun.from_dict(snapshot).unfinished_steps()
+    tasks = max(1, len(remaining))
+    _admit(tenant_id, *_task_types(remaining), tasks=tasks)
+    try:
+        run = await workflow_engine.resume(run_id, _bill_step(tenant_id), tenant_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown workflow run: {run_id}")
+    except RunInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        admission.release(tasks)
+    return run.to_dict()
+
+
+@app.put("/api/v1/employees")
+async def upsert_employees(
+    request: EmployeesRequest,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """Create or replace the tenant's employee records."""
+    try:
+        records = await employee_repository.upsert_many(tenant_id, request.employees)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"upserted": len(records)}
+
+
+@app.get("/api/v1/employees/{employee_id}")
+async def get_employee(
+    employee_id: str,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """Get one of the tenant's employee records."""
+    record = await employee_repository.get(tenant_id, employee_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown employee: {employee_id}")
+    return record.to_dict()
+
+
+@app.get("/api/v1/billing/invoice")
+async def get_invoice(
+    start: date,
+    end: date,
+    tenant_id: str = Header(settings.default_tenant, alias="X-Tenant-ID")
+):
+    """
+    Billed transactions and totals for the tenant between start and end
+    (inclusive, YYYY-MM-DD), per agent and task type.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return await asyncio.to_thread(ledger.invoice, tenant_id, start, end)
+
+
+@app.get("/api/v1/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Agent latency, throughput, in-flight and error metrics in Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/api/v1/metrics/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """Cumulative-time summary of a profiled request (see the X-Profile header)."""
+    report = render_profile(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return PlainTextResponse(report)
 
 
 @app.get("/api/v1/pricing")
@@ -0,0 +1,69 @@
+"""Per-request cProfile sampling for the API."""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import uuid
+from typing import Optional
+
+from fastapi import Request
+
+from ..config import settings
+
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# cProfile hooks the whole thread, so only one request is profiled at a time
+_active = False
+
+
+def _wants_profile(request: Request) -> bool:
+    value = request.headers.get(PROFILE_HEADER, "").lower()
+    return value in ("1", "true", "yes") and random.random() < settings.profile_sample_rate
+
+
+async def profile_middleware(request: Request, call_next):
+    """
+    Profile requests that opt in with an ``X-Profile: 1`` header.
+
+    A sampled request runs under cProfile; the stats are written to
+    ``profile_dir`` and the response carries an ``X-Profile-Id`` header for
+    fetching them. Because the event loop is shared, the profile also
+    contains whatever other requests ran concurrently.
+    """
+    global _active
+    if _active or not _wants_profile(request):
+        return await call_next(request)
+
+    _active = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.disable()
+        _active = False
+
+    profile_id = uuid.uuid4().hex
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    profiler.dump_stats(os.path.join(settings.profile_dir, f"{profile_id}.prof"))
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
+
+
+def render_profile(profile_id: str, limit: int = 40) -> Optional[str]:
+    """Top functions by cumulative time for a saved profile, or None if unknown."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(settings.profile_dir, f"{profile_id}.prof")
+    if not os.path.exists(path):
+        return None
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
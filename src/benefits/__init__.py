@@ -0,0 +1,31 @@
+"""Benefits components: plan eligibility, claims processing and Q&A caching."""
+
+from .answer_cache import CachedAnswer, SemanticAnswerCache, normalize_question
+from .claims import (
+    ClaimsReport,
+    OversizedSegment,
+    adjudicate,
+    claims_paths,
+    iter_segments,
+    process_claims,
+    process_claims_file,
+)
+from .eligibility import DEFAULT_PLANS, CompiledPlan, EligibilityIndex, compile_rule, load_plans
+
+__all__ = [
+    "CachedAnswer",
+    "SemanticAnswerCache",
+    "normalize_question",
+    "ClaimsReport",
+    "OversizedSegment",
+    "adjudicate",
+    "claims_paths",
+    "iter_segments",
+    "process_claims",
+    "process_claims_file",
+    "DEFAULT_PLANS",
+    "CompiledPlan",
+    "EligibilityIndex",
+    "compile_rule",
+    "load_plans",
+]
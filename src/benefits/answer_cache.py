@@ -0,0 +1,210 @@
+"""Semantic answer cache for benefits questions."""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.embeddings import EmbeddingFunction, hashing_embedding, tokenize
+
+
+_CONTRACTIONS = {
+    "what's": "what is",
+    "whats": "what is",
+    "how's": "how is",
+    "where's": "where is",
+    "who's": "who is",
+    "when's": "when is",
+    "i'm": "i am",
+    "can't": "can not",
+    "cannot": "can not",
+    "don't": "do not",
+    "doesn't": "does not",
+    "isn't": "is not",
+}
+
+# Words that change the wording of a question but not what it asks
+_STOP_WORDS = frozenset(
+    "a an the my our your is are am do does did be been can could would should "
+    "please tell me i we you it of for to in on at this that there about".split()
+)
+
+_CONTRACTION = re.compile(r"\b(?:" + "|".join(re.escape(c) for c in _CONTRACTIONS) + r")\b")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, expand contractions and drop filler words."""
+    text = _CONTRACTION.sub(lambda m: _CONTRACTIONS[m.group(0)], question.lower().replace("’", "'"))
+    return " ".join(token for token in tokenize(text) if token not in _STOP_WORDS)
+
+
+@dataclass(slots=True)
+class CachedAnswer:
+    """A cache hit."""
+
+    answer: Any
+    question: str
+    similarity: float
+    exact: bool
+
+
+@dataclass(slots=True)
+class _Entry:
+    scope: str
+    normalized: str
+    question: str
+    answer: Any
+
+
+class _ScopeVectors:
+    """Embeddings of one scope's cached questions, as rows of a growable matrix."""
+
+    __slots__ = ("matrix", "entry_ids", "rows")
+
+    def __init__(self, dim: int):
+        self.matrix = np.zeros((16, dim), dtype=np.float32)
+        self.entry_ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+
+    def add(self, entry_id: int, vector: np.ndarray) -> None:
+        row = len(self.entry_ids)
+        if row == len(self.matrix):
+            grown = np.zeros((row * 2, self.matrix.shape[1]), dtype=np.float32)
+            grown[:row] = self.matrix
+            self.matrix = grown
+        self.matrix[row] = vector
+        self.entry_ids.append(entry_id)
+        self.rows[entry_id] = row
+
+    def remove(self, entry_id: int) -> None:
+        # Move the last row into the hole so live rows stay contiguous
+        row = self.rows.pop(entry_id)
+        last = len(self.entry_ids) - 1
+        if row != last:
+            moved = self.entry_ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.entry_ids[row] = moved
+            self.rows[moved] = row
+        self.entry_ids.pop()
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self.entry_ids:
+            return None, 0.0
+        similarities = self.matrix[:len(self.entry_ids)] @ vector
+        best = int(np.argmax(similarities))
+        return self.entry_ids[best], float(similarities[best])
+
+
+class SemanticAnswerCache:
+    """
+    Answers keyed by question meaning rather than exact wording.
+
+    Questions are normalized and embedded; a lookup returns the cached
+    answer of the most similar question in the same scope (e.g. plan) if
+    its cosine similarity reaches ``threshold``. Identical normalized
+    questions are served from a dict without embedding. The cache holds
+    at most ``maxsize`` answers, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        threshold: float = 0.7,
+        dim: int = 256,
+        embed: EmbeddingFunction = hashing_embedding
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.dim = dim
+        self._embed = embed
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._scopes: Dict[str, _ScopeVectors] = {}
+        self._next_id = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, question: str, scope: str = "*") -> Optional[CachedAnswer]:
+        """
+        Cached answer for a question within a scope, or None.
+
+        Args:
+            question: Question as asked
+            scope: Cache partition, e.g. the benefits plan
+        """
+        normalized = normalize_question(question)
+        entry_id = self._exact.get((scope, normalized))
+        if entry_id is not None:
+            self.exact_hits += 1
+            return self._hit(entry_id, 1.0, exact=True)
+
+        vectors = self._scopes.get(scope)
+        if vectors is not None and normalized:
+            entry_id, similarity = vectors.nearest(self._embed([normalized], self.dim)[0])
+            if entry_id is not None and similarity >= self.threshold:
+                self.semantic_hits += 1
+                return self._hit(entry_id, similarity, exact=False)
+        self.misses += 1
+        return None
+
+    def store(self, question: str, answer: Any, scope: str = "*") -> None:
+        """Cache an answer, evicting the least recently used one when full."""
+        normalized = normalize_question(question)
+        existing = self._exact.get((scope, normalized))
+        if existing is not None:
+            self._entries[existing].answer = answer
+            self._entries.move_to_end(existing)
+            return
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(scope, normalized, question, answer)
+        self._exact[(scope, normalized)] = entry_id
+        vectors = self._scopes.get(scope)
+        if vectors is None:
+            vectors = self._scopes[scope] = _ScopeVectors(self.dim)
+        vectors.add(entry_id, self._embed([normalized], self.dim)[0])
+
+        while len(self._entries) > self.maxsize:
+            self._evict(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Remove every answer."""
+        self._entries.clear()
+        self._exact.clear()
+        self._scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": hits,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _hit(self, entry_id: int, similarity: float, exact: bool) -> CachedAnswer:
+        self._entries.move_to_end(entry_id)
+        entry = self._entries[entry_id]
+        return CachedAnswer(entry.answer, entry.question, similarity, exact)
+
+    def _evict(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        del self._exact[(entry.scope, entry.normalized)]
+        vectors = self._scopes[entry.scope]
+        vectors.remove(entry_id)
+        if not vectors.entry_ids:
+            del self._scopes[entry.scope]
@@ -0,0 +1,341 @@
+"""Benefits claims ingestion: streaming parser and parallel adjudication."""
+
+import json
+import math
+import os
+import re
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+
+SEGMENT_TERMINATOR = "~"
+ELEMENT_SEPARATOR = "*"
+
+# CLM*claim_id*employee_id*plan_id*service_code*amount*service_date~
+CLAIM_ELEMENTS = 7
+
+# Longest segment kept; longer ones (e.g. a file with no terminators) are
+# reported as invalid instead of being buffered whole
+MAX_SEGMENT_LENGTH = 4096
+
+# Service code -> (category, copay, coinsurance paid by the plan, per-claim limit)
+COVERAGE: Dict[str, Tuple[str, float, float, float]] = {
+    "99213": ("office_visit", 25.0, 1.0, 500.0),
+    "99214": ("office_visit", 25.0, 1.0, 750.0),
+    "99283": ("emergency", 150.0, 0.8, 10000.0),
+    "80053": ("lab", 0.0, 0.9, 1000.0),
+    "71046": ("imaging", 50.0, 0.8, 2500.0),
+    "D0120": ("dental_exam", 0.0, 1.0, 300.0),
+    "D1110": ("dental_cleaning", 0.0, 1.0, 300.0),
+    "92004": ("vision_exam", 10.0, 1.0, 400.0),
+}
+
+Segment = Tuple[str, ...]
+
+
+class OversizedSegment(tuple):
+    """
+    A segment longer than the limit: only its tag and claim ID (taken from
+    the start of the segment) are kept, and it is adjudicated as invalid.
+    """
+
+# Claims files named in task parameters: a bare file name, never a path
+_CLAIMS_FILE_NAME = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}$")
+_TENANT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _segment(text: str, max_length: int) -> Optional[Segment]:
+    text = text.strip()
+    if not text:
+        return None
+    if len(text) > max_length:
+        return OversizedSegment(text[:max_length].split(ELEMENT_SEPARATOR)[:2])
+    return tuple(text.split(ELEMENT_SEPARATOR))
+
+
+def iter_segments(
+    stream: TextIO,
+    read_size: int = 1 << 20,
+    max_segment_length: int = MAX_SEGMENT_LENGTH
+) -> Iterator[Segment]:
+    """
+    Split an EDI-like stream into segments without reading it all.
+
+    Memory use is bounded by ``read_size`` plus ``max_segment_length``,
+    whatever the file size. A segment longer than that is yielded once, as
+    an OversizedSegment, as soon as the limit is passed; the rest of it is
+    skipped. Line breaks between segments are ignored.
+
+    Yields:
+        Tuples of segment elements, the first being the segment tag
+    """
+    remainder = ""
+    # Inside an oversized segment that has already been yielded
+    skipping = False
+    while True:
+        block = stream.read(read_size)
+        if not block:
+            break
+        parts = (remainder + block).split(SEGMENT_TERMINATOR)
+        remainder = parts.pop()
+        for part in parts:
+            if skipping:
+                skipping = False
+                continue
+            segment = _segment(part, max_segment_length)
+            if segment:
+                yield segment
+        if skipping:
+            remainder = ""
+        elif len(remainder.lstrip()) > max_segment_length:
+            yield _segment(remainder, max_segment_length)
+            remainder = ""
+            skipping = True
+    segment = None if skipping else _segment(remainder, max_segment_length)
+    if segment:
+        yield segment
+
+
+def iter_claim_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[Segment]]:
+    """Claim (CLM) segments in lists of up to chunk_size; envelope segments are skipped."""
+    chunk: List[Segment] = []
+    for segment in iter_segments(stream):
+        if segment[0] != "CLM":
+            continue
+        chunk.append(segment)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_date(value: str) -> date:
+    if len(value) == 8 and value.isdigit():
+        return datetime.strptime(value, "%Y%m%d").date()
+    return date.fromisoformat(value)
+
+
+def adjudicate(segment: Segment) -> Dict[str, Any]:
+    """
+    Validate and adjudicate one claim segment.
+
+    Returns:
+        Claim outcome: status approved, denied or invalid, with the plan
+        and patient shares for approved claims
+    """
+    claim_id = segment[1] if len(segment) > 1 else None
+    if isinstance(segment, OversizedSegment):
+        return {
+            "claim_id": claim_id,
+            "status": "invalid",
+            "reason": "segment too long",
+        }
+    if len(segment) != CLAIM_ELEMENTS:
+        return {
+            "claim_id": claim_id,
+            "status": "invalid",
+            "reason": f"expected {CLAIM_ELEMENTS} elements",
+        }
+
+    _, claim_id, employee_id, plan_id, service_code, raw_amount, raw_date = segment
+    outcome: Dict[str, Any] = {
+        "claim_id": claim_id,
+        "employee_id": employee_id,
+        "plan_id": plan_id,
+        "service_code": service_code,
+    }
+    try:
+        amount = float(raw_amount)
+        service_date = _parse_date(raw_date)
+    except ValueError:
+        return {**outcome, "status": "invalid", "reason": "malformed amount or service date"}
+    if not claim_id or not employee_id or not math.isfinite(amount) or amount <= 0:
+        return {**outcome, "status": "invalid", "reason": "missing claim id, employee id or amount"}
+
+    outcome["amount"] = amount
+    outcome["service_date"] = service_date.isoformat()
+    coverage = COVERAGE.get(service_code)
+    if coverage is None:
+        return {**outcome, "status": "denied", "reason": "service not covered"}
+
+    category, copay, coinsurance, limit = coverage
+    allowed = min(amount, limit)
+    plan_pays = round(max(allowed - copay, 0.0) * coinsurance, 2)
+    return {
+        **outcome,
+        "status": "approved",
+        "category": category,
+        "plan_pays": plan_pays,
+        "patient_pays": round(amount - plan_pays, 2),
+    }
+
+
+def adjudicate_chunk(chunk: Sequence[Segment]) -> List[Dict[str, Any]]:
+    """Adjudicate a chunk of claims (runs in a worker process)."""
+    return [adjudicate(segment) for segment in chunk]
+
+
+@dataclass
+class ClaimsReport:
+    """Totals for a claims file run."""
+
+    claims: int = 0
+    approved: int = 0
+    denied: int = 0
+    invalid: int = 0
+    plan_paid: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def claims_per_second(self) -> float:
+        return self.claims / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def add(self, outcomes: List[Dict[str, Any]]) -> None:
+        for outcome in outcomes:
+            status = outcome["status"]
+            if status == "approved":
+                self.approved += 1
+                self.plan_paid += outcome["plan_pays"]
+            elif status == "denied":
+                self.denied += 1
+            else:
+                self.invalid += 1
+        self.claims += len(outcomes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claims": self.claims,
+            "approved": self.approved,
+            "denied": self.denied,
+            "invalid": self.invalid,
+            "plan_paid": round(self.plan_paid, 2),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "claims_per_second": round(self.claims_per_second, 1),
+        }
+
+
+def _adjudicate_on(
+    executor: Executor,
+    chunks: Iterable[List[Segment]],
+    max_pending: int,
+    emit: Callable[[List[Dict[str, Any]]], None]
+) -> None:
+    pending: Deque[Future] = deque()
+    for chunk in chunks:
+        if len(pending) >= max_pending:
+            emit(pending.popleft().result())
+        pending.append(executor.submit(adjudicate_chunk, chunk))
+    while pending:
+        emit(pending.popleft().result())
+
+
+def process_claims(
+    stream: TextIO,
+    output: Optional[TextIO] = None,
+    workers: int = 1,
+    chunk_size: int = 5000,
+    executor: Optional[Executor] = None
+) -> ClaimsReport:
+    """
+    Adjudicate every claim in a stream, writing outcomes as NDJSON.
+
+    Chunks are adjudicated across a process pool with at most two chunks per
+    worker in flight, and outcomes are written in input order as soon as
+    their chunk is done. Memory therefore stays bounded by the number of
+    in-flight chunks, not the file size.
+
+    Args:
+        stream: Claims file opened in text mode
+        output: Where to write one JSON outcome per line (optional)
+        workers: Worker processes; 1 adjudicates in this process
+        chunk_size: Claims per chunk
+        executor: Existing pool of ``workers`` processes to use instead of
+            starting one for this call
+
+    Returns:
+        Run totals and throughput
+    """
+    report = ClaimsReport()
+    started = time.perf_counter()
+
+    def emit(outcomes: List[Dict[str, Any]]) -> None:
+        report.add(outcomes)
+        if output is not None:
+            output.write("".join(json.dumps(o, separators=(",", ":")) + "\n" for o in outcomes))
+
+    chunks = iter_claim_chunks(stream, chunk_size)
+    if executor is not None:
+        _adjudicate_on(executor, chunks, max(workers, 1) * 2, emit)
+    elif workers <= 1:
+        for chunk in chunks:
+            emit(adjudicate_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _adjudicate_on(pool, chunks, workers * 2, emit)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def claims_paths(directory: str, tenant_id: str, name: str) -> Tuple[str, str]:
+    """
+    Resolve a claims file named by a task inside the tenant's claims directory.
+
+    The results path is chosen here, under the tenant's ``results``
+    directory, so callers never pick where the server writes.
+
+    Args:
+        directory: Claims directory holding one subdirectory per tenant
+        tenant_id: Tenant submitting the claims
+        name: Bare file name of the claims file
+
+    Returns:
+        Claims file path and a new results file path
+
+    Raises:
+        ValueError: If name is not a bare file name or the tenant ID is invalid
+    """
+    if not _TENANT_ID.match(tenant_id):
+        raise ValueError(f"Invalid tenant: {tenant_id}")
+    if not _CLAIMS_FILE_NAME.match(name):
+        raise ValueError(f"Invalid claims file name: {name}")
+    tenant_dir = os.path.join(directory, tenant_id)
+    stem = os.path.splitext(name)[0]
+    results = os.path.join(tenant_dir, "results", f"{stem}-{uuid.uuid4().hex}.ndjson")
+    return os.path.join(tenant_dir, name), results
+
+
+def process_claims_file(
+    path: str,
+    output_path: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = 5000,
+    executor: Optional[Executor] = None
+) -> ClaimsReport:
+    """process_claims over a file path, optionally writing outcomes to output_path."""
+    with open(path, newline="") as stream:
+        if output_path is None:
+            return process_claims(stream, None, workers, chunk_size, executor)
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, "w") as output:
+            return process_claims(stream, output, workers, chunk_size, executor)
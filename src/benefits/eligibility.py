@@ -0,0 +1,244 @@
+"""Benefits eligibility: compiled plan rules and an incremental eligibility index."""
+
+import json
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+
+Attributes = Dict[str, Any]
+
+# An employee ID, or a tuple such as (tenant_id, employee_id)
+EmployeeKey = Hashable
+Predicate = Callable[[Attributes], bool]
+
+_MISSING = object()
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Plans offered when no plan file is configured
+DEFAULT_PLANS: List[Dict[str, Any]] = [
+    {
+        "plan_id": "medical_ppo",
+        "rules": [
+            {"field": "employment_type", "op": "==", "value": "full_time"},
+            {"field": "hours_per_week", "op": ">=", "value": 30},
+        ],
+    },
+    {
+        "plan_id": "medical_hmo",
+        "rules": [{"field": "hours_per_week", "op": ">=", "value": 20}],
+    },
+    {
+        "plan_id": "dental",
+        "rules": [{"field": "employment_type", "op": "in", "value": ["full_time", "part_time"]}],
+    },
+    {
+        "plan_id": "401k",
+        "rules": [
+            {"field": "age", "op": ">=", "value": 21},
+            {"field": "tenure_days", "op": ">=", "value": 90},
+        ],
+    },
+]
+
+
+def compile_rule(rule: Dict[str, Any]) -> Predicate:
+    """
+    Compile one rule into a predicate over employee attributes.
+
+    Rules are ``{"field": ..., "op": ..., "value": ...}`` with op one of
+    ==, !=, <, <=, >, >=, in, not_in, exists. A missing attribute fails
+    every op except ``not_in``.
+
+    Raises:
+        ValueError: If the rule is malformed
+    """
+    try:
+        name, op = rule["field"], rule["op"]
+    except KeyError as e:
+        raise ValueError(f"Eligibility rule missing {e.args[0]!r}: {rule}") from None
+    value = rule.get("value")
+
+    if op == "exists":
+        return lambda attrs: attrs.get(name, _MISSING) is not _MISSING
+    if op in ("in", "not_in"):
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            raise ValueError(f"Eligibility rule {op!r} needs a list value: {rule}")
+        members = frozenset(value)
+        if op == "in":
+            return lambda attrs: attrs.get(name, _MISSING) in members
+        return lambda attrs: attrs.get(name, _MISSING) not in members
+    compare = _COMPARISONS.get(op)
+    if compare is None:
+        raise ValueError(f"Unknown eligibility operator: {op}")
+
+    def predicate(attrs: Attributes) -> bool:
+        actual = attrs.get(name, _MISSING)
+        if actual is _MISSING:
+            return False
+        try:
+            return compare(actual, value)
+        except TypeError:
+            # e.g. comparing a string attribute to a number
+            return False
+
+    return predicate
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """A plan's rules compiled into one predicate, plus the fields they read."""
+
+    plan_id: str
+    predicate: Predicate
+    fields: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, plan: Dict[str, Any]) -> "CompiledPlan":
+        """Compile ``{"plan_id": ..., "rules": [...]}``; all rules must hold."""
+        if "plan_id" not in plan:
+            raise ValueError(f"Benefits plan missing 'plan_id': {plan}")
+        rules = plan.get("rules", [])
+        predicates = tuple(compile_rule(rule) for rule in rules)
+        if not predicates:
+            predicate: Predicate = lambda attrs: True
+        elif len(predicates) == 1:
+            predicate = predicates[0]
+        else:
+            predicate = lambda attrs: all(p(attrs) for p in predicates)
+        return cls(plan["plan_id"], predicate, frozenset(rule["field"] for rule in rules))
+
+
+class EligibilityIndex:
+    """
+    Employee -> eligible plans, kept current as plans and employees change.
+
+    Rules are evaluated when data changes, never on lookup. Updating an
+    employee re-evaluates only the plans whose rules read one of the
+    changed attributes; adding a plan evaluates that plan alone.
+    """
+
+    def __init__(self, plans: Iterable[Dict[str, Any]] = ()):
+        self._plans: Dict[str, CompiledPlan] = {}
+        self._plans_by_field: Dict[str, Set[str]] = {}
+        self._employees: Dict[EmployeeKey, Attributes] = {}
+        self._eligible: Dict[EmployeeKey, FrozenSet[str]] = {}
+        for plan in plans:
+            self.add_plan(plan)
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __contains__(self, employee_id: EmployeeKey) -> bool:
+        return employee_id in self._employees
+
+    @property
+    def plan_ids(self) -> List[str]:
+        """Configured plans."""
+        return list(self._plans)
+
+    @property
+    def employee_ids(self) -> List[EmployeeKey]:
+        """IDs of the indexed employees."""
+        return list(self._employees)
+
+    def add_plan(self, plan: Dict[str, Any]) -> None:
+        """Add or replace a plan and evaluate it for every known employee."""
+        compiled = CompiledPlan.compile(plan)
+        if compiled.plan_id in self._plans:
+            self.remove_plan(compiled.plan_id)
+        self._plans[compiled.plan_id] = compiled
+        for name in compiled.fields:
+            self._plans_by_field.setdefault(name, set()).add(compiled.plan_id)
+        plan_id = compiled.plan_id
+        for employee_id, attrs in self._employees.items():
+            if compiled.predicate(attrs):
+                self._eligible[employee_id] = self._eligible[employee_id] | {plan_id}
+
+    def remove_plan(self, plan_id: str) -> None:
+        """Drop a plan from the index."""
+        compiled = self._plans.pop(plan_id, None)
+        if compiled is None:
+            return
+        for name in compiled.fields:
+            self._plans_by_field[name].discard(plan_id)
+        for employee_id, plans in self._eligible.items():
+            if plan_id in plans:
+                self._eligible[employee_id] = plans - {plan_id}
+
+    def upsert_employee(
+        self,
+        employee_id: EmployeeKey,
+        attributes: Attributes,
+        replace: bool = False
+    ) -> FrozenSet[str]:
+        """
+        Add an employee or merge changed attributes into an existing one.
+
+        Args:
+            employee_id: Employee ID
+            attributes: New or changed attributes (a None value removes one)
+            replace: Treat attributes as complete, removing any not given
+
+        Returns:
+            The employee's eligible plans
+        """
+        current = self._employees.get(employee_id)
+        if replace and current is not None:
+            attributes = {**dict.fromkeys(current), **attributes}
+        if current is None:
+            attrs = {k: v for k, v in attributes.items() if v is not None}
+            self._employees[employee_id] = attrs
+            eligible = frozenset(p.plan_id for p in self._plans.values() if p.predicate(attrs))
+            self._eligible[employee_id] = eligible
+            return eligible
+
+        changed = []
+        for name, value in attributes.items():
+            if value is None:
+                if name in current:
+                    del current[name]
+                    changed.append(name)
+            elif current.get(name, _MISSING) != value:
+                current[name] = value
+                changed.append(name)
+
+        affected: Set[str] = set()
+        for name in changed:
+            affected |= self._plans_by_field.get(name, set())
+        if not affected:
+            return self._eligible[employee_id]
+        still_eligible = {p for p in affected if self._plans[p].predicate(current)}
+        eligible = (self._eligible[employee_id] - affected) | still_eligible
+        self._eligible[employee_id] = eligible
+        return eligible
+
+    def remove_employee(self, employee_id: EmployeeKey) -> None:
+        """Drop an employee from the index."""
+        self._employees.pop(employee_id, None)
+        self._eligible.pop(employee_id, None)
+
+    def eligible_plans(self, employee_id: EmployeeKey) -> Optional[FrozenSet[str]]:
+        """Plans an employee is eligible for, or None if the employee is unknown."""
+        return self._eligible.get(employee_id)
+
+    def is_eligible(self, employee_id: EmployeeKey, plan_id: str) -> Optional[bool]:
+        """Whether an employee may enroll in a plan; None if the employee is unknown."""
+        eligible = self._eligible.get(employee_id)
+        return None if eligible is None else plan_id in eligible
+
+
+def load_plans(path: Optional[str]) -> List[Dict[str, Any]]:
+    """Plan definitions from a JSON file, or the defaults when no path is set."""
+    if not path:
+        return DEFAULT_PLANS
+    with open(path) as f:
+        return json.load(f)
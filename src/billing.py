@@ -0,0 +1,311 @@
+"""Billing ledger - append-only record of priced agent transactions."""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    create_engine,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+transactions_table = Table(
+    "billing_transactions",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("transaction_id", String(36), nullable=False, unique=True),
+    Column("tenant_id", String(64), nullable=False, index=True),
+    Column("agent", String(64), nullable=False),
+    Column("task_type", String(64), nullable=False),
+    Column("employee_id", String(64)),
+    Column("amount", Float, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+# One row per tenant, day, agent and task type, kept current at flush time
+rollups_table = Table(
+    "billing_daily_rollups",
+    metadata,
+    Column("tenant_id", String(64), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("agent", String(64), primary_key=True),
+    Column("task_type", String(64), primary_key=True),
+    Column("transactions", Integer, nullable=False),
+    Column("amount", Float, nullable=False),
+)
+
+
+@dataclass(slots=True)
+class BillingTransaction:
+    """A single billed agent transaction."""
+
+    tenant_id: str
+    agent: str
+    task_type: str
+    amount: float
+    employee_id: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    transaction_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+class BillingLedger:
+    """
+    Buffers transactions in memory and writes them to the database in batches.
+
+    record() only appends to a list, so the request path never waits on I/O.
+    A background task flushes the buffer every ``flush_interval`` seconds, or
+    as soon as it holds ``batch_size`` transactions, on a worker thread. Each
+    flush inserts the raw transactions and folds them into per-day rollups in
+    the same database transaction, so invoice queries read a handful of
+    pre-aggregated rows instead of scanning the ledger.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.database_url = database_url or settings.billing_database_url
+        self.flush_interval = flush_interval or settings.billing_flush_interval
+        self.batch_size = batch_size or settings.billing_batch_size
+        self._buffer: List[BillingTransaction] = []
+        self._engine: Optional[Engine] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def engine(self) -> Engine:
+        """Database engine, created (with tables) on first use."""
+        if self._engine is None:
+            if self.database_url.startswith("sqlite:///"):
+                directory = os.path.dirname(self.database_url[len("sqlite:///"):])
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            self._engine = create_engine(self.database_url)
+            metadata.create_all(self._engine)
+        return self._engine
+
+    @property
+    def pending(self) -> int:
+        """Transactions recorded but not yet written."""
+        return len(self._buffer)
+
+    def record(
+        self,
+        tenant_id: str,
+        agent: str,
+        task_type: str,
+        amount: float,
+        employee_id: Optional[str] = None
+    ) -> None:
+        """
+        Record a priced transaction. Never blocks on I/O.
+
+        Args:
+            tenant_id: Billed tenant
+            agent: Agent name
+            task_type: Task type
+            amount: Price in USD
+            employee_id: Employee the transaction concerns, if any
+        """
+        self._buffer.append(BillingTransaction(
+            tenant_id=tenant_id,
+            agent=agent,
+            task_type=task_type,
+            amount=amount,
+            employee_id=None if employee_id is None else str(employee_id),
+        ))
+        if len(self._buffer) >= self.batch_size and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    def record_task(
+        self,
+        tenant_id: str,
+        task_type: str,
+        parameters: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> None:
+        """Record the transaction for a successfully executed agent task."""
+        self.record(
+            tenant_id=tenant_id,
+            agent=result.get("agent", task_type),
+            task_type=task_type,
+            amount=result.get("pricing", 0.0),
+            employee_id=parameters.get("employee_id"),
+        )
+
+    async def start(self) -> None:
+        """Open the database and start the background flusher."""
+        if self._flusher is not None:
+            return
+        await asyncio.to_thread(lambda: self.engine)
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    async def flush(self) -> int:
+        """
+        Write buffered transactions now.
+
+        Returns:
+            Number of transactions written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception:
+                # Keep the batch for the next attempt rather than lose billing data
+                self._buffer[:0] = batch
+                raise
+            return len(batch)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Billing flush failed; %d transactions retained", self.pending)
+
+    def _write(self, batch: List[BillingTransaction]) -> None:
+        """Insert a batch and fold it into the daily rollups, atomically."""
+        rows = [
+            {
+                "transaction_id": t.transaction_id,
+                "tenant_id": t.tenant_id,
+                "agent": t.agent,
+                "task_type": t.task_type,
+                "employee_id": t.employee_id,
+                "amount": t.amount,
+                "created_at": t.created_at,
+            }
+            for t in batch
+        ]
+        deltas: Dict[Tuple[str, date, str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+        for t in batch:
+            delta = deltas[(t.tenant_id, t.created_at.date(), t.agent, t.task_type)]
+            delta[0] += 1
+            delta[1] += t.amount
+
+        with self.engine.begin() as conn:
+            conn.execute(insert(transactions_table), rows)
+            for (tenant_id, day, agent, task_type), (count, amount) in deltas.items():
+                key = and_(
+                    rollups_table.c.tenant_id == tenant_id,
+                    rollups_table.c.day == day,
+                    rollups_table.c.agent == agent,
+                    rollups_table.c.task_type == task_type,
+                )
+                increment = update(rollups_table).where(key).values(
+                    transactions=rollups_table.c.transactions + count,
+                    amount=rollups_table.c.amount + amount,
+                )
+                if conn.execute(increment).rowcount:
+                    continue
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(rollups_table).values(
+                            tenant_id=tenant_id,
+                            day=day,
+                            agent=agent,
+                            task_type=task_type,
+                            transactions=count,
+                            amount=amount,
+                        ))
+                except IntegrityError:
+                    # Another writer created the row first
+                    conn.execute(increment)
+
+    def invoice(self, tenant_id: str, start: date, end: date) -> Dict[str, Any]:
+        """
+        Billed totals for a tenant over an inclusive date range, from rollups.
+
+        Only transactions already flushed are included.
+
+        Returns:
+            Per agent/task type line items and the overall total
+        """
+        query = (
+            select(
+                rollups_table.c.agent,
+                rollups_table.c.task_type,
+                func.sum(rollups_table.c.transactions),
+                func.sum(rollups_table.c.amount),
+            )
+            .where(
+                rollups_table.c.tenant_id == tenant_id,
+                rollups_table.c.day >= start,
+                rollups_table.c.day <= end,
+            )
+            .group_by(rollups_table.c.agent, rollups_table.c.task_type)
+            .order_by(rollups_table.c.agent, rollups_table.c.task_type)
+        )
+        with self.engine.connect() as conn:
+            lines = [
+                {
+                    "agent": agent,
+                    "task_type": task_type,
+                    "transactions": int(count),
+                    "amount": round(float(amount), 2),
+                }
+                for agent, task_type, count, amount in conn.execute(query)
+            ]
+        return {
+            "tenant_id": tenant_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "lines": lines,
+            "total": round(sum(line["amount"] for line in lines), 2),
+            "currency": "USD",
+        }
+
+
+ledger = BillingLedger()
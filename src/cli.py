@@ -1,17 +1,19 @@
-"""CLI interface for AgentHR."""
+"""CLI interface for AgentHR.
+
+Agents, settings and their dependencies are imported inside each command,
+so ``agent-hr --help`` and light commands start without loading them.
+"""
 
 import click
 import asyncio
 import json
 from typing import Dict, Any
 
-from .agents import (
-    RecruitingAgent,
-    OnboardingAgent,
-    PayrollAgent,
-    BenefitsAgent
-)
-from .config import settings
+
+def _echo_json(value: Any) -> None:
+    """Print a result as indented JSON."""
+    from .serialization import dumps_pretty
+    click.echo(dumps_pretty(value))
 
 
 @click.group()
@@ -40,11 +42,13 @@ def recruiting(job_title: str, budget: float, requirements: str, location: str,
     if requirements:
         task["requirements"] = [r.strip() for r in requirements.split(",")]
     
+    from .agents import RecruitingAgent
+    
     agent = RecruitingAgent()
     result = asyncio.run(agent.execute(task))
     
     if output == "json":
-        click.echo(json.dumps(result, indent=2))
+        _echo_json(result)
     else:
         click.echo(f"\n✅ Status: {result['status']}")
         click.echo(f"📊 Candidates Found: {result.get('candidates_found', 0)}")
@@ -74,11 +78,13 @@ def onboarding(employee_id: str, employee_name: str, start_date: str,
     if role:
         task["role"] = role
     
+    from .agents import OnboardingAgent
+    
     agent = OnboardingAgent()
     result = asyncio.run(agent.execute(task))
     
     if output == "json":
-        click.echo(json.dumps(result, indent=2))
+        _echo_json(result)
     else:
         click.echo(f"\n✅ Status: {result['status']}")
         click.echo(f"📄 Paperwork: {'Completed' if result.get('paperwork_completed') else 'Pending'}")
@@ -88,21 +94,40 @@ def onboarding(employee_id: str, employee_name: str, start_date: str,
 @cli.command()
 @click.option("--period", default="monthly", help="Payroll period (monthly, biweekly, etc.)")
 @click.option("--employee-ids", help="Employee IDs (comma-separated, optional)")
-@click.option("--output", default="json", type=click.Choice(["json", "table"]))
-def payroll(period: str, employee_ids: str, output: str):
+@click.option("--employees-file", type=click.File("r"),
+              help="Compensation records as JSON (list of records or dict of columns)")
+@click.option("--output", default="json", type=click.Choice(["json", "table", "ndjson"]))
+def payroll(period: str, employee_ids: str, employees_file, output: str):
     """Execute payroll agent."""
-    click.echo(f"💰 Processing payroll for period: {period}")
+    # Keep stdout clean for machine-readable NDJSON
+    click.echo(f"💰 Processing payroll for period: {period}", err=output == "ndjson")
     
     task = {"period": period}
     
+    if employees_file:
+        task["employees"] = json.load(employees_file)
     if employee_ids:
         task["employee_ids"] = [eid.strip() for eid in employee_ids.split(",")]
     
+    from .agents import PayrollAgent
+    
     agent = PayrollAgent()
+    
+    if output == "ndjson":
+        # One pay stub per line, written as each chunk is computed
+        from .serialization import dumps
+        
+        async def emit():
+            async for record in agent.stream(task):
+                click.echo(dumps(record))
+        
+        asyncio.run(emit())
+        return
+    
     result = asyncio.run(agent.execute(task))
     
     if output == "json":
-        click.echo(json.dumps(result, indent=2))
+        _echo_json(result)
     else:
         click.echo(f"\n✅ Status: {result['status']}")
         click.echo(f"👥 Employees Processed: {result.get('employees_processed', 0)}")
@@ -112,11 +137,41 @@ def payroll(period: str, employee_ids: str, output: str):
 
 @cli.command()
 @click.option("--action", default="enroll", type=click.Choice(["enroll", "claim", "query"]))
-@click.option("--employee-id", required=True, help="Employee ID")
+@click.option("--employee-id", help="Employee ID")
 @click.option("--plan", help="Benefits plan")
+@click.option("--claims-file", type=click.Path(exists=True, dir_okay=False),
+              help="EDI-like claims batch file (CLM segments) to adjudicate")
+@click.option("--results-file", type=click.Path(dir_okay=False),
+              help="Write per-claim outcomes to this file as JSON lines")
+@click.option("--workers", type=click.IntRange(min=1), help="Claims worker processes")
 @click.option("--output", default="json", type=click.Choice(["json", "table"]))
-def benefits(action: str, employee_id: str, plan: str, output: str):
+def benefits(action: str, employee_id: str, plan: str, claims_file: str,
+             results_file: str, workers: int, output: str):
     """Execute benefits agent."""
+    if claims_file:
+        from .benefits.claims import process_claims_file
+        from .config import settings
+        
+        click.echo(f"🏥 Adjudicating claims from: {claims_file}", err=True)
+        report = process_claims_file(
+            claims_file,
+            results_file,
+            workers=workers or settings.claims_workers,
+            chunk_size=settings.claims_chunk_size
+        ).to_dict()
+        if output == "json":
+            _echo_json(report)
+        else:
+            click.echo(f"\n✅ Claims: {report['claims']:,} "
+                       f"(approved {report['approved']:,}, denied {report['denied']:,}, "
+                       f"invalid {report['invalid']:,})")
+            click.echo(f"💵 Plan Paid: ${report['plan_paid']:,.2f}")
+            click.echo(f"⚡ Throughput: {report['claims_per_second']:,.0f} claims/sec")
+        return
+    
+    if not employee_id:
+        raise click.UsageError("--employee-id is required unless --claims-file is given")
+    
     click.echo(f"🏥 Processing benefits {action} for employee: {employee_id}")
     
     task = {
@@ -127,20 +182,64 @@ def benefits(action: str, employee_id: str, plan: str, output: str):
     if plan:
         task["plan"] = plan
     
+    from .agents import BenefitsAgent
+    
     agent = BenefitsAgent()
     result = asyncio.run(agent.execute(task))
     
     if output == "json":
-        click.echo(json.dumps(result, indent=2))
+        _echo_json(result)
     else:
         click.echo(f"\n✅ Status: {result['status']}")
         click.echo(f"📋 Action: {result.get('action', 'unknown')}")
         click.echo(f"💰 Pricing: ${result.get('pricing', 0):.2f}")
 
 
+@cli.command()
+@click.option("--file", "tasks_file", required=True, type=click.File("r"),
+              help="Tasks as a JSON list or JSON lines of {task_type, parameters}")
+@click.option("--concurrency", type=click.IntRange(min=1), help="Maximum tasks executing at once")
+@click.option("--output", default="json", type=click.Choice(["json", "table"]))
+def batch(tasks_file, concurrency: int, output: str):
+    """Execute a batch of tasks across all agents."""
+    content = tasks_file.read().strip()
+    if content.startswith("["):
+        tasks = json.loads(content)
+    else:
+        tasks = [json.loads(line) for line in content.splitlines() if line.strip()]
+    
+    click.echo(f"📦 Executing batch of {len(tasks)} tasks")
+    
+    from .agents import registry
+    
+    items = asyncio.run(registry.execute_many(
+        [(task["task_type"], task.get("parameters", {})) for task in tasks],
+        max_concurrency=concurrency
+    ))
+    succeeded = sum(1 for item in items if item["status"] == "success")
+    total_pricing = sum(item["pricing"] for item in items)
+    
+    if output == "json":
+        _echo_json({
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "total_pricing": total_pricing,
+            "results": items
+        })
+    else:
+        click.echo(f"\n✅ Succeeded: {succeeded}")
+        click.echo(f"❌ Failed: {len(items) - succeeded}")
+        for item in items:
+            if item["status"] != "success":
+                click.echo(f"   #{item['index']} {item['task_type']}: {item['error']}")
+        click.echo(f"💰 Total Pricing: ${total_pricing:.2f}")
+
+
 @cli.command()
 def pricing():
     """Show pricing information."""
+    from .config import settings
+    
     click.echo("💰 AgentHR Pricing (Transaction-Based)\n")
     click.echo(f"Hiring: ${settings.pricing_hiring:.2f} per hire")
     click.echo(f"Payroll Run: ${settings.pricing_payroll:.2f} per run")
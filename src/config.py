@@ -1,13 +1,35 @@
 """Configuration management for AgentHR."""
 
+import json
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
+# Settings left empty default to these files (or SQLite databases) in DATA_DIR
+_DATA_PATHS = {
+    "idempotency_sqlite_path": "idempotency.db",
+    "payroll_snapshot_dir": "payroll",
+    "claims_dir": "claims",
+    "workflow_checkpoint_dir": "workflows",
+    "profile_dir": "profiles",
+    "embedding_cache_dir": "embeddings",
+}
+_DATA_DATABASES = {
+    "employee_database_url": "employees.db",
+    "candidate_database_url": "candidates.db",
+    "billing_database_url": "billing.db",
+}
+
+
 class Settings(BaseSettings):
     """Application settings."""
     
+    # Local files and SQLite databases not configured explicitly are kept
+    # here; resolved to an absolute path when settings are loaded
+    data_dir: str = os.getenv("DATA_DIR", ".agenthr")
+    
     # API Keys
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
     anthropic_api_key: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
@@ -15,18 +37,67 @@ class Settings(BaseSettings):
     # Database
     database_url: str = os.getenv("DATABASE_URL", "postgresql://localhost/agenthr")
     
+    # Employee repository (any SQLAlchemy URL; records cached in memory, LRU)
+    employee_database_url: str = os.getenv(
+        "EMPLOYEE_DATABASE_URL", ""
+    )
+    employee_cache_size: int = int(os.getenv("EMPLOYEE_CACHE_SIZE", "100000"))
+    
+    # Recruiting candidate pools (any SQLAlchemy URL; indexed in memory per tenant)
+    candidate_database_url: str = os.getenv(
+        "CANDIDATE_DATABASE_URL", ""
+    )
+    
+    # Billing ledger (any SQLAlchemy URL; SQLite by default for local runs)
+    billing_database_url: str = os.getenv("BILLING_DATABASE_URL", "")
+    billing_flush_interval: float = float(os.getenv("BILLING_FLUSH_INTERVAL", "1.0"))
+    billing_batch_size: int = int(os.getenv("BILLING_BATCH_SIZE", "1000"))
+    default_tenant: str = os.getenv("DEFAULT_TENANT", "default")
+    
     # Redis
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     
+    # Idempotency keys (store: memory, sqlite or redis)
+    idempotency_store: str = os.getenv("IDEMPOTENCY_STORE", "memory")
+    idempotency_ttl: float = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    idempotency_cache_size: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    idempotency_sqlite_path: str = os.getenv("IDEMPOTENCY_SQLITE_PATH", "")
+    
     # Message Queue
     celery_broker_url: str = os.getenv("CELERY_BROKER_URL", "amqp://localhost:5672//")
     celery_result_backend: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
     
+    # Job Queue (process or thread workers; lower priority values run first)
+    job_backend: str = os.getenv("JOB_BACKEND", "process")
+    job_workers: int = int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 2)))
+    job_max_retained: int = int(os.getenv("JOB_MAX_RETAINED", "10000"))
+    job_priorities: Dict[str, int] = json.loads(os.getenv(
+        "JOB_PRIORITIES", '{"payroll": 0, "onboarding": 1, "recruiting": 2, "benefits": 3}'
+    ))
+    
     # API Settings
     api_host: str = os.getenv("API_HOST", "0.0.0.0")
     api_port: int = int(os.getenv("API_PORT", "8000"))
     api_debug: bool = os.getenv("API_DEBUG", "false").lower() == "true"
     
+    # Admission control on task routes: token buckets per tenant and per task
+    # type (burst = rate * burst seconds) and a global in-flight cap; task-type
+    # rates back off while that agent's p95 latency exceeds its target (seconds)
+    admission_enabled: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    admission_max_in_flight: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "256"))
+    admission_tenant_rate: float = float(os.getenv("ADMISSION_TENANT_RATE", "50"))
+    admission_tenant_burst: float = float(os.getenv("ADMISSION_TENANT_BURST", "100"))
+    admission_task_rates: Dict[str, float] = json.loads(os.getenv(
+        "ADMISSION_TASK_RATES",
+        '{"recruiting": 100, "onboarding": 100, "payroll": 20, "benefits": 200}'
+    ))
+    admission_burst_seconds: float = float(os.getenv("ADMISSION_BURST_SECONDS", "2"))
+    admission_target_p95: Dict[str, float] = json.loads(os.getenv(
+        "ADMISSION_TARGET_P95",
+        '{"recruiting": 2.0, "onboarding": 2.0, "payroll": 5.0, "benefits": 0.5}'
+    ))
+    admission_adapt_interval: float = float(os.getenv("ADMISSION_ADAPT_INTERVAL", "5"))
+    
     # Transaction Pricing
     pricing_hiring: float = float(os.getenv("PRICING_HIRING", "50.0"))
     pricing_payroll: float = float(os.getenv("PRICING_PAYROLL", "2.0"))
@@ -34,14 +105,102 @@ class Settings(BaseSettings):
     pricing_performance_review: float = float(os.getenv("PRICING_PERFORMANCE_REVIEW", "10.0"))
     pricing_offboarding: float = float(os.getenv("PRICING_OFFBOARDING", "25.0"))
     
+    # Agent Runtime
+    agent_max_concurrency: int = int(os.getenv("AGENT_MAX_CONCURRENCY", "64"))
+    batch_max_concurrency: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+    batch_max_size: int = int(os.getenv("BATCH_MAX_SIZE", "50000"))
+    payroll_stream_chunk_size: int = int(os.getenv("PAYROLL_STREAM_CHUNK_SIZE", "5000"))
+    # Worker processes for cpu_bound agents, started with the API (0 runs them
+    # inline); arrays of at least the given size are passed via shared memory
+    cpu_pool_workers: int = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 2)))
+    cpu_pool_shared_min_bytes: int = int(os.getenv("CPU_POOL_SHARED_MIN_BYTES", "65536"))
+    
+    # Payroll taxes (JSON file of state/local brackets; built-in tables if unset)
+    # and stored runs for incremental reruns
+    payroll_tax_tables_file: str = os.getenv("PAYROLL_TAX_TABLES_FILE", "")
+    payroll_snapshot_dir: str = os.getenv("PAYROLL_SNAPSHOT_DIR", "")
+    
+    # Onboarding Pipeline (workers per stage, queue bound between stages)
+    onboarding_stage_concurrency: Dict[str, int] = json.loads(os.getenv(
+        "ONBOARDING_STAGE_CONCURRENCY",
+        '{"paperwork": 32, "provisioning": 16, "training": 32, "buddy_matching": 8}'
+    ))
+    onboarding_queue_size: int = int(os.getenv("ONBOARDING_QUEUE_SIZE", "256"))
+    onboarding_stage_retries: int = int(os.getenv("ONBOARDING_STAGE_RETRIES", "2"))
+    
+    # Benefits (JSON file of plan eligibility rules; built-in plans if unset)
+    benefits_plans_file: str = os.getenv("BENEFITS_PLANS_FILE", "")
+    # Seconds between checks for employee changes made by other processes
+    benefits_eligibility_recheck: float = float(os.getenv("BENEFITS_ELIGIBILITY_RECHECK", "1.0"))
+    # Worker processes for the CLI's --claims-file; API tasks use the CPU pool
+    claims_workers: int = int(os.getenv("CLAIMS_WORKERS", str(os.cpu_count() or 2)))
+    claims_chunk_size: int = int(os.getenv("CLAIMS_CHUNK_SIZE", "5000"))
+    # Claims files named by API tasks are read from <dir>/<tenant>/ only
+    claims_dir: str = os.getenv("CLAIMS_DIR", "")
+    benefits_answer_cache_size: int = int(os.getenv("BENEFITS_ANSWER_CACHE_SIZE", "10000"))
+    benefits_answer_similarity: float = float(os.getenv("BENEFITS_ANSWER_SIMILARITY", "0.7"))
+    
+    # Workflows
+    workflow_checkpoint_dir: str = os.getenv("WORKFLOW_CHECKPOINT_DIR", "")
+    
+    # Profiling (requests sent with an "X-Profile: 1" header)
+    profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+    profile_dir: str = os.getenv("PROFILE_DIR", "")
+    
+    # Resume Screening
+    embedding_dim: int = int(os.getenv("EMBEDDING_DIM", "256"))
+    embedding_cache_dir: str = os.getenv("EMBEDDING_CACHE_DIR", "")
+    screening_pool_size: int = int(os.getenv("SCREENING_POOL_SIZE", "200"))
+    
     # AI Model Settings
     default_llm_provider: str = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
     default_model: str = os.getenv("DEFAULT_MODEL", "gpt-4-turbo-preview")
     
+    # LLM Client
+    llm_timeout: float = float(os.getenv("LLM_TIMEOUT", "60.0"))
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+    llm_cache_size: int = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+    llm_cache_ttl: float = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    llm_requests_per_second: float = float(os.getenv("LLM_REQUESTS_PER_SECOND", "10.0"))
+    llm_burst: int = int(os.getenv("LLM_BURST", "20"))
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
+    
+    @model_validator(mode="after")
+    def _default_to_data_dir(self) -> "Settings":
+        """Point every empty file, directory or database setting into data_dir."""
+        self.data_dir = os.path.abspath(self.data_dir)
+        for name, file_name in _DATA_PATHS.items():
+            if not getattr(self, name):
+                setattr(self, name, os.path.join(self.data_dir, file_name))
+        for name, file_name in _DATA_DATABASES.items():
+            if not getattr(self, name):
+                setattr(self, name, "sqlite:///" + os.path.join(self.data_dir, file_name))
+        return self
+
+
+class LazySettings:
+    """
+    Stands in for Settings and builds it on first attribute access, so
+    importing this module does not read the environment or .env file.
+    """
+    
+    def __init__(self):
+        self._settings: Optional[Settings] = None
+    
+    def _resolve(self) -> Settings:
+        if self._settings is None:
+            self._settings = Settings()
+        return self._settings
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+    
+    def __repr__(self) -> str:
+        return repr(self._resolve())
 
 
-settings = Settings()
+settings = LazySettings()
 
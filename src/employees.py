@@ -0,0 +1,360 @@
+"""Employee repository - tenant-scoped employee records with a read-through cache."""
+
+import asyncio
+import os
+import sys
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    create_engine,
+    delete,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .utils.cache import TTLCache
+
+
+metadata = MetaData()
+
+employees_table = Table(
+    "employees",
+    metadata,
+    Column("tenant_id", String(64), primary_key=True),
+    Column("employee_id", String(64), primary_key=True),
+    Column("name", String(256)),
+    Column("email", String(256)),
+    Column("department", String(128)),
+    Column("job_title", String(128)),
+    Column("employment_type", String(32)),
+    Column("hours_per_week", Float),
+    Column("start_date", String(10)),
+    Column("annual_salary", Float, nullable=False, default=0.0),
+    Column("hourly_rate", Float, nullable=False, default=0.0),
+    Column("hours", Float, nullable=False, default=0.0),
+    Column("pretax_deductions", Float, nullable=False, default=0.0),
+    Column("posttax_deductions", Float, nullable=False, default=0.0),
+    Column("attributes", JSON),
+)
+
+# Bumped by every write to a tenant's employees; cached records are keyed by
+# it, so a change made by any process invalidates every other process's cache
+employee_versions_table = Table(
+    "employee_versions",
+    metadata,
+    Column("tenant_id", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+# Bound parameters per IN (...) query; SQLite allows 999 in older builds
+QUERY_CHUNK_SIZE = 500
+
+# Low-cardinality strings shared by many records; interned so each value is stored once
+_INTERNED = ("employee_id", "department", "job_title", "employment_type")
+
+_NUMERIC = ("annual_salary", "hourly_rate", "hours", "pretax_deductions", "posttax_deductions")
+
+# Called after each write with (tenant_id, new version, upserted records, removed IDs)
+ChangeListener = Callable[[str, int, List["EmployeeRecord"], List[str]], None]
+
+
+@dataclass(slots=True)
+class EmployeeRecord:
+    """One employee: identity, employment details and compensation."""
+
+    employee_id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    department: Optional[str] = None
+    job_title: Optional[str] = None
+    employment_type: Optional[str] = None
+    hours_per_week: Optional[float] = None
+    start_date: Optional[str] = None
+    annual_salary: float = 0.0
+    hourly_rate: float = 0.0
+    hours: float = 0.0
+    pretax_deductions: float = 0.0
+    posttax_deductions: float = 0.0
+    attributes: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EmployeeRecord":
+        """
+        Build a record from a dict; keys that are not fields go into attributes.
+
+        Raises:
+            ValueError: If employee_id is missing
+        """
+        if not data.get("employee_id"):
+            raise ValueError(f"Employee record missing 'employee_id': {data}")
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = dict(data.get("attributes") or {})
+        for key, value in data.items():
+            if key == "attributes":
+                continue
+            if key in _FIELD_NAMES:
+                values[key] = value
+            else:
+                extra[key] = value
+        for name in _INTERNED:
+            if values.get(name) is not None:
+                values[name] = sys.intern(str(values[name]))
+        for name in _NUMERIC:
+            values[name] = float(values.get(name) or 0.0)
+        if values.get("start_date") is not None:
+            values["start_date"] = str(values["start_date"])
+        return cls(**values, attributes=extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields as a flat dict, attributes merged in; None values omitted."""
+        data = {name: getattr(self, name) for name in _FIELD_NAMES if name != "attributes"}
+        data = {key: value for key, value in data.items() if value is not None}
+        if self.attributes:
+            data.update(self.attributes)
+        return data
+
+    def _row(self, tenant_id: str) -> Dict[str, Any]:
+        row = {name: getattr(self, name) for name in _FIELD_NAMES}
+        row["tenant_id"] = tenant_id
+        return row
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(EmployeeRecord))
+
+
+class EmployeeRepository:
+    """
+    Employee records per tenant, stored in SQL and cached in memory.
+
+    Lookups are read-through: each get_many() reads the tenant's version
+    counter (one primary-key query), cached records of that version are
+    returned as is, and all misses are fetched together with chunked ``IN``
+    queries rather than one query per employee. Every write bumps the
+    version, so API processes, job workers and other hosts sharing the
+    database never serve records older than the last write. Records are
+    slotted dataclasses whose IDs and other repeated strings are interned,
+    so the cache stays small at large headcounts.
+
+    Listeners added with add_listener() are told about every write made
+    through this repository, so derived in-memory state (such as benefits
+    eligibility) is updated where employee data changes rather than
+    recomputed on every read.
+
+    Database calls run on a worker thread; the cache and listeners are only
+    used from the event loop, and each thread running a loop (e.g.
+    thread-backend job workers) keeps its own.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, cache_size: Optional[int] = None):
+        self.database_url = database_url or settings.employee_database_url
+        self.cache_size = cache_size or settings.employee_cache_size
+        self._local = threading.local()
+        self._engine: Optional[Engine] = None
+        self._engine_pid = 0
+
+    @property
+    def _cache(self) -> TTLCache:
+        cache = getattr(self._local, "cache", None)
+        if cache is None:
+            cache = self._local.cache = TTLCache(maxsize=self.cache_size)
+        return cache
+
+    @property
+    def _listeners(self) -> List[ChangeListener]:
+        listeners = getattr(self._local, "listeners", None)
+        if listeners is None:
+            listeners = self._local.listeners = []
+        return listeners
+
+    @property
+    def engine(self) -> Engine:
+        """Database engine, created (with tables) on first use in each process."""
+        if self._engine is not None and self._engine_pid != os.getpid():
+            # Forked workers must not share the parent's pooled connections
+            self._engine.dispose(close=False)
+            self._engine = None
+        if self._engine is None:
+            if self.database_url.startswith("sqlite:///"):
+                directory = os.path.dirname(self.database_url[len("sqlite:///"):])
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            self._engine = create_engine(self.database_url)
+            self._engine_pid = os.getpid()
+            metadata.create_all(self._engine)
+        return self._engine
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Call listener after every write made through this repository on this thread."""
+        self._listeners.append(listener)
+
+    async def version(self, tenant_id: str) -> int:
+        """The tenant's version counter, bumped by every write from any process."""
+        return await asyncio.to_thread(self._version, tenant_id)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size of the record cache."""
+        return self._cache.stats()
+
+    async def get(self, tenant_id: str, employee_id: str) -> Optional[EmployeeRecord]:
+        """An employee's record, or None if the tenant has no such employee."""
+        return (await self.get_many(tenant_id, [employee_id])).get(employee_id)
+
+    async def get_many(
+        self, tenant_id: str, employee_ids: Iterable[str]
+    ) -> Dict[str, EmployeeRecord]:
+        """
+        Records for many employees in as few queries as possible.
+
+        Args:
+            tenant_id: Tenant owning the employees
+            employee_ids: Employee IDs; duplicates are looked up once
+
+        Returns:
+            Employee ID -> record, for the IDs that exist
+        """
+        found: Dict[str, EmployeeRecord] = {}
+        missing: List[str] = []
+        version = await asyncio.to_thread(self._version, tenant_id)
+        for employee_id in dict.fromkeys(str(e) for e in employee_ids):
+            record = self._cache.get((tenant_id, version, employee_id))
+            if record is None:
+                missing.append(employee_id)
+            else:
+                found[employee_id] = record
+        if missing:
+            version, records = await asyncio.to_thread(self._fetch, tenant_id, missing)
+            for record in records:
+                self._cache.set((tenant_id, version, record.employee_id), record)
+                found[record.employee_id] = record
+        return found
+
+    async def get_all(self, tenant_id: str) -> Dict[str, EmployeeRecord]:
+        """Every employee of a tenant (the whole roster), cached like get_many()."""
+        version, records = await asyncio.to_thread(self._fetch, tenant_id, None)
+        found: Dict[str, EmployeeRecord] = {}
+        for record in records:
+            self._cache.set((tenant_id, version, record.employee_id), record)
+            found[record.employee_id] = record
+        return found
+
+    async def upsert_many(
+        self, tenant_id: str, records: Sequence[Dict[str, Any]]
+    ) -> List[EmployeeRecord]:
+        """
+        Create or replace employees in one transaction.
+
+        Raises:
+            ValueError: If a record has no employee_id
+        """
+        # Later records for the same employee win
+        parsed = list({r.employee_id: r for r in map(EmployeeRecord.from_dict, records)}.values())
+        version = await asyncio.to_thread(self._write, tenant_id, parsed)
+        for record in parsed:
+            self._cache.set((tenant_id, version, record.employee_id), record)
+        for listener in self._listeners:
+            listener(tenant_id, version, parsed, [])
+        return parsed
+
+    async def delete(self, tenant_id: str, employee_ids: Iterable[str]) -> None:
+        """Remove employees; cached records of the tenant become stale."""
+        removed = [str(e) for e in employee_ids]
+        version = await asyncio.to_thread(self._delete, tenant_id, removed)
+        for listener in self._listeners:
+            listener(tenant_id, version, [], removed)
+
+    def clear_cache(self) -> None:
+        """Drop every cached record (the database is untouched)."""
+        self._cache.clear()
+
+    def close(self) -> None:
+        """Release database connections."""
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def _version(self, tenant_id: str, conn: Any = None) -> int:
+        if conn is None:
+            with self.engine.connect() as conn:
+                return self._version(tenant_id, conn)
+        version = conn.execute(
+            select(employee_versions_table.c.version)
+            .where(employee_versions_table.c.tenant_id == tenant_id)
+        ).scalar()
+        return version or 0
+
+    def _bump_version(self, conn: Any, tenant_id: str) -> int:
+        table = employee_versions_table
+        # A single upsert, so two first writers for a tenant cannot both insert
+        dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(conn.dialect.name)
+        if dialect is None:
+            raise ValueError(f"Unsupported employee database: {conn.dialect.name}")
+        conn.execute(
+            dialect.insert(table)
+            .values(tenant_id=tenant_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[table.c.tenant_id], set_={"version": table.c.version + 1}
+            )
+        )
+        return self._version(tenant_id, conn)
+
+    def _fetch(
+        self, tenant_id: str, employee_ids: Optional[List[str]]
+    ) -> Tuple[int, List[EmployeeRecord]]:
+        """The tenant's version and the given employees' rows (all rows for None)."""
+        table = employees_table
+        if employee_ids is None:
+            queries = [select(table).where(table.c.tenant_id == tenant_id)]
+        else:
+            queries = [
+                select(table).where(
+                    table.c.tenant_id == tenant_id,
+                    table.c.employee_id.in_(employee_ids[start:start + QUERY_CHUNK_SIZE]),
+                )
+                for start in range(0, len(employee_ids), QUERY_CHUNK_SIZE)
+            ]
+        records = []
+        # One transaction, so the version matches the rows read
+        with self.engine.begin() as conn:
+            version = self._version(tenant_id, conn)
+            for query in queries:
+                for row in conn.execute(query).mappings():
+                    data = {name: row[name] for name in _FIELD_NAMES}
+                    records.append(EmployeeRecord.from_dict(data))
+        return version, records
+
+    def _write(self, tenant_id: str, records: List[EmployeeRecord]) -> int:
+        # Delete then insert is a portable upsert across SQLite and PostgreSQL
+        with self.engine.begin() as conn:
+            self._delete_ids(conn, tenant_id, [r.employee_id for r in records])
+            if records:
+                conn.execute(insert(employees_table), [r._row(tenant_id) for r in records])
+            return self._bump_version(conn, tenant_id)
+
+    def _delete(self, tenant_id: str, employee_ids: List[str]) -> int:
+        with self.engine.begin() as conn:
+            self._delete_ids(conn, tenant_id, employee_ids)
+            return self._bump_version(conn, tenant_id)
+
+    @staticmethod
+    def _delete_ids(conn: Any, tenant_id: str, employee_ids: List[str]) -> None:
+        for start in range(0, len(employee_ids), QUERY_CHUNK_SIZE):
+            conn.execute(delete(employees_table).where(and_(
+                employees_table.c.tenant_id == tenant_id,
+                employees_table.c.employee_id.in_(employee_ids[start:start + QUERY_CHUNK_SIZE]),
+            )))
+
+
+employee_repository = EmployeeRepository()
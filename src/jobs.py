@@ -0,0 +1,254 @@
+"""Job queue - run agent tasks on worker processes outside the web event loop."""
+
+import asyncio
+import itertools
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+from .agents import AgentRegistry, registry
+from .billing import ledger
+from .config import settings
+from .utils.concurrency import run_on_worker_loop
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Task types without a configured priority run after all configured ones
+DEFAULT_PRIORITY = 100
+
+
+@dataclass
+class Job:
+    """A submitted agent task and its outcome."""
+
+    job_id: str
+    task_type: str
+    parameters: Dict[str, Any]
+    priority: int
+    tenant_id: str = ""
+    status: str = JOB_QUEUED
+    result: Optional[Dict[str, Any]] = None
+    pricing: float = 0.0
+    error: Optional[str] = None
+    submitted_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job state without its input parameters."""
+        return {
+            "job_id": self.job_id,
+            "task_type": self.task_type,
+            "priority": self.priority,
+            "tenant_id": self.tenant_id,
+            "status": self.status,
+            "result": self.result,
+            "pricing": self.pricing,
+            "error": self.error,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+# Agents of the current worker thread (or process)
+_worker = threading.local()
+
+
+def _run_task(task_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute a task to completion on a worker.
+
+    Each worker thread (or process) keeps its own agents and one event
+    loop for all its jobs: jobs running at once never share an agent's
+    mutable state, and loop-bound clients (such as the LLM client's HTTP
+    pool) stay valid from one job to the next. The agent is called
+    directly; the queue's worker count bounds concurrency.
+    """
+    agents = getattr(_worker, "registry", None)
+    if agents is None:
+        agents = _worker.registry = AgentRegistry(registry.agent_types)
+    return run_on_worker_loop(agents.get(task_type).execute(parameters))
+
+
+class JobQueue:
+    """
+    Priority queue of agent tasks drained by a pool of workers.
+
+    Submitted jobs are ordered by priority (lower runs first), then by
+    submission order. Each dispatcher coroutine hands one job at a time to
+    the executor, so at most ``workers`` jobs run concurrently and the web
+    event loop only awaits their futures.
+
+    Backends:
+        - process: ProcessPoolExecutor, for CPU-heavy work
+        - thread: ThreadPoolExecutor, for I/O-bound work or constrained hosts
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        workers: Optional[int] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        max_retained: Optional[int] = None
+    ):
+        self.backend = backend or settings.job_backend
+        if self.backend not in ("process", "thread"):
+            raise ValueError(f"Unknown job backend: {self.backend}")
+        self.workers = workers or settings.job_workers
+        self.priorities = dict(settings.job_priorities if priorities is None else priorities)
+        self.max_retained = max_retained or settings.job_max_retained
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._executor: Optional[Executor] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._on_done: Dict[str, Callable[[], None]] = {}
+
+    @property
+    def started(self) -> bool:
+        """Whether workers are running."""
+        return self._executor is not None
+
+    async def start(self) -> None:
+        """Start the executor and dispatcher coroutines."""
+        if self.started:
+            return
+        if self.backend == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="agenthr-job"
+            )
+        self._queue = asyncio.PriorityQueue()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop dispatching and shut the executor down; queued jobs are abandoned."""
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        # Abandoned jobs will not finish; let their submitters clean up
+        for on_done in self._on_done.values():
+            on_done()
+        self._on_done.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+    def priority_for(self, task_type: str) -> int:
+        """Default priority for a task type."""
+        return self.priorities.get(task_type, DEFAULT_PRIORITY)
+
+    async def submit(
+        self,
+        task_type: str,
+        parameters: Dict[str, Any],
+        priority: Optional[int] = None,
+        tenant_id: Optional[str] = None,
+        on_done: Optional[Callable[[], None]] = None
+    ) -> Job:
+        """
+        Queue a task for background execution.
+
+        Args:
+            task_type: Task type
+            parameters: Task parameters
+            priority: Overrides the task type's default priority
+            tenant_id: Tenant billed for the job
+            on_done: Called on the event loop once the job has finished (or
+                been abandoned by stop())
+
+        Returns:
+            The queued job
+
+        Raises:
+            UnknownTaskType: If no agent is registered for the task type
+            ValueError: If the task parameters are invalid
+        """
+        task_type = task_type.lower()
+        agent = registry.get(task_type)
+        if not agent.validate_task(parameters):
+            raise ValueError("Invalid task parameters")
+
+        await self.start()
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            task_type=task_type,
+            parameters=parameters,
+            priority=self.priority_for(task_type) if priority is None else priority,
+            tenant_id=tenant_id or settings.default_tenant
+        )
+        self._jobs[job.job_id] = job
+        if on_done is not None:
+            self._on_done[job.job_id] = on_done
+        self._evict()
+        self._queue.put_nowait((job.priority, next(self._sequence), job.job_id))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID."""
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, poll_interval: float = 0.01) -> Job:
+        """Wait until a job has finished."""
+        job = self._jobs[job_id]
+        while not job.done:
+            await asyncio.sleep(poll_interval)
+        return job
+
+    async def _dispatch(self) -> None:
+        """Hand queued jobs to the executor, one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            job.status = JOB_RUNNING
+            job.started_at = datetime.utcnow()
+            try:
+                job.result = await loop.run_in_executor(
+                    self._executor, _run_task, job.task_type, job.parameters
+                )
+            except Exception as e:
+                job.status = JOB_FAILED
+                job.error = str(e)
+            else:
+                job.status = JOB_SUCCEEDED
+                job.pricing = registry.get(job.task_type).get_pricing()
+                ledger.record_task(job.tenant_id, job.task_type, job.parameters, job.result)
+            finally:
+                job.finished_at = datetime.utcnow()
+                # Inputs can be large; they are not needed once the job ran
+                job.parameters = {}
+                on_done = self._on_done.pop(job_id, None)
+                if on_done is not None:
+                    on_done()
+
+    def _evict(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit."""
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        finished = (job_id for job_id, job in self._jobs.items() if job.done)
+        for job_id in list(itertools.islice(finished, excess)):
+            del self._jobs[job_id]
+
+
+job_queue = JobQueue()
@@ -0,0 +1,16 @@
+"""LLM client layer shared by all agents."""
+
+from .providers import LLMProvider, LLMResponse, OpenAIProvider, AnthropicProvider, FakeProvider
+from .client import LLMClient, get_llm_client, set_llm_client, close_llm_client
+
+__all__ = [
+    "LLMProvider",
+    "LLMResponse",
+    "OpenAIProvider",
+    "AnthropicProvider",
+    "FakeProvider",
+    "LLMClient",
+    "get_llm_client",
+    "set_llm_client",
+    "close_llm_client",
+]
@@ -0,0 +1,188 @@
+"""Shared LLM client: caching, request coalescing and rate limiting."""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .providers import AnthropicProvider, FakeProvider, LLMProvider, LLMResponse, OpenAIProvider
+from ..config import settings
+from ..utils.cache import TTLCache
+from ..utils.concurrency import SingleFlight
+from ..utils.ratelimit import TokenBucket
+
+
+class LLMClient:
+    """
+    Provider-agnostic completion client shared by all agents.
+
+    A completion request goes through, in order:
+        1. An LRU+TTL response cache keyed on provider, model and prompt
+        2. Single-flight coalescing, so identical in-flight prompts make
+           one provider call
+        3. A per-provider token bucket
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, LLMProvider],
+        default_provider: str,
+        default_model: str,
+        cache_size: int = 10000,
+        cache_ttl: Optional[float] = 3600,
+        requests_per_second: float = 10.0,
+        burst: int = 20
+    ):
+        if default_provider not in providers:
+            raise ValueError(f"Default LLM provider not configured: {default_provider}")
+        self.providers = providers
+        self.default_provider = default_provider
+        self.default_model = default_model
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._single_flight = SingleFlight()
+        self._buckets = {name: TokenBucket(requests_per_second, burst) for name in providers}
+
+    async def complete(
+        self,
+        prompt: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        system: Optional[str] = None,
+        use_cache: bool = True
+    ) -> LLMResponse:
+        """
+        Generate a completion.
+
+        Args:
+            prompt: User prompt
+            provider: Provider name (defaults to the client's default)
+            model: Model name (defaults to the client's default)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            system: Optional system prompt
+            use_cache: Serve and store the response in the cache
+
+        Returns:
+            The completion; ``cached`` is True when served from the cache
+        """
+        provider = provider or self.default_provider
+        model = model or self.default_model
+        backend = self.providers.get(provider)
+        if backend is None:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+
+        key = _cache_key(provider, model, prompt, system, max_tokens, temperature)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return dataclasses.replace(cached, cached=True)
+
+        async def call() -> LLMResponse:
+            await self._buckets[provider].acquire()
+            response = await backend.complete(prompt, model, max_tokens, temperature, system)
+            if use_cache:
+                self.cache.set(key, response)
+            return response
+
+        return await self._single_flight.do(key, call)
+
+    async def aclose(self) -> None:
+        """Close every provider's connections."""
+        for backend in self.providers.values():
+            await backend.aclose()
+
+
+def _cache_key(provider, model, prompt, system, max_tokens, temperature) -> str:
+    payload = json.dumps([provider, model, system, prompt, max_tokens, temperature])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Set by set_llm_client(); used on every event loop
+_client: Optional[LLMClient] = None
+
+# Event loop (None outside one) -> its client and HTTP pool. An HTTP pool
+# is bound to the loop it was first used on, so each loop gets its own
+_clients: Dict[Optional[asyncio.AbstractEventLoop], Tuple[LLMClient, httpx.AsyncClient]] = {}
+
+
+def _build_client() -> Tuple[LLMClient, httpx.AsyncClient]:
+    default_provider = settings.default_llm_provider
+    api_keys = {"openai": settings.openai_api_key, "anthropic": settings.anthropic_api_key}
+    if default_provider != "fake" and not api_keys.get(default_provider):
+        raise ValueError(
+            f"No API key configured for LLM provider {default_provider!r}; "
+            "set it, or set DEFAULT_LLM_PROVIDER=fake to run without an LLM"
+        )
+    http = httpx.AsyncClient(
+        timeout=settings.llm_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections
+        ),
+    )
+    providers: Dict[str, LLMProvider] = {"fake": FakeProvider()}
+    if settings.openai_api_key:
+        providers["openai"] = OpenAIProvider(settings.openai_api_key, http)
+    if settings.anthropic_api_key:
+        providers["anthropic"] = AnthropicProvider(settings.anthropic_api_key, http)
+    client = LLMClient(
+        providers,
+        default_provider=default_provider,
+        default_model=settings.default_model,
+        cache_size=settings.llm_cache_size,
+        cache_ttl=settings.llm_cache_ttl,
+        requests_per_second=settings.llm_requests_per_second,
+        burst=settings.llm_burst,
+    )
+    return client, http
+
+
+def get_llm_client() -> LLMClient:
+    """
+    The running event loop's LLM client, built from settings on first use.
+
+    Each event loop (the API's, and each job or CPU-pool worker's) gets its
+    own client, because the pooled HTTP connections cannot move between
+    loops. Providers with an API key configured share the loop's HTTP pool;
+    the fake provider is always available, but is only the default when
+    DEFAULT_LLM_PROVIDER is "fake".
+
+    Raises:
+        ValueError: If the default provider has no API key configured
+    """
+    if _client is not None:
+        return _client
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    entry = _clients.get(loop)
+    if entry is None:
+        # Clients of closed loops cannot be used (or closed) any more
+        for closed in [other for other in _clients if other is not None and other.is_closed()]:
+            del _clients[closed]
+        entry = _clients[loop] = _build_client()
+    return entry[0]
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Use one client on every event loop (e.g. a fake in tests); None restores the default."""
+    global _client
+    _client = client
+
+
+async def close_llm_client() -> None:
+    """Close the running loop's client (or the one set) and its HTTP connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    entry = _clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].aclose()
+        await entry[1].aclose()
@@ -0,0 +1,169 @@
+"""LLM providers behind a common completion interface."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional
+
+import httpx
+
+
+@dataclass(slots=True)
+class LLMResponse:
+    """A completion and its token usage."""
+
+    text: str
+    model: str
+    provider: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+
+
+class LLMProvider(ABC):
+    """Base class for LLM providers."""
+
+    name: str = ""
+
+    @abstractmethod
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        system: Optional[str] = None
+    ) -> LLMResponse:
+        """
+        Generate a completion.
+
+        Args:
+            prompt: User prompt
+            model: Model name
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            system: Optional system prompt
+
+        Returns:
+            The completion
+        """
+        pass
+
+    async def aclose(self) -> None:
+        """Release provider resources."""
+        pass
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions over a shared HTTP connection pool."""
+
+    name = "openai"
+
+    def __init__(
+        self, api_key: str, http: httpx.AsyncClient, base_url: str = "https://api.openai.com/v1"
+    ):
+        self.api_key = api_key
+        self.http = http
+        self.base_url = base_url
+
+    async def complete(
+        self, prompt, model, max_tokens=512, temperature=0.0, system=None
+    ) -> LLMResponse:
+        messages: List[Dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        response = await self.http.post(
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        usage = data.get("usage", {})
+        return LLMResponse(
+            text=data["choices"][0]["message"]["content"],
+            model=data.get("model", model),
+            provider=self.name,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+        )
+
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic messages API over a shared HTTP connection pool."""
+
+    name = "anthropic"
+
+    def __init__(
+        self, api_key: str, http: httpx.AsyncClient, base_url: str = "https://api.anthropic.com/v1"
+    ):
+        self.api_key = api_key
+        self.http = http
+        self.base_url = base_url
+
+    async def complete(
+        self, prompt, model, max_tokens=512, temperature=0.0, system=None
+    ) -> LLMResponse:
+        body: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            body["system"] = system
+
+        response = await self.http.post(
+            f"{self.base_url}/messages",
+            headers={"x-api-key": self.api_key, "anthropic-version": "2023-06-01"},
+            json=body,
+        )
+        response.raise_for_status()
+        data = response.json()
+        usage = data.get("usage", {})
+        return LLMResponse(
+            text="".join(block.get("text", "") for block in data["content"]),
+            model=data.get("model", model),
+            provider=self.name,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+        )
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic local provider for tests and offline development.
+
+    Responses come from ``responder(prompt)`` (by default an echo of the
+    prompt), after an optional simulated latency. ``calls`` counts requests
+    that actually reached the provider.
+    """
+
+    name = "fake"
+
+    def __init__(self, responder: Optional[Callable[[str], str]] = None, latency: float = 0.0):
+        self.responder = responder or (lambda prompt: f"[fake] {prompt}")
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(
+        self, prompt, model, max_tokens=512, temperature=0.0, system=None
+    ) -> LLMResponse:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = self.responder(prompt)
+        return LLMResponse(
+            text=text,
+            model=model,
+            provider=self.name,
+            input_tokens=len(prompt.split()),
+            output_tokens=len(text.split()),
+        )
@@ -0,0 +1,141 @@
+"""Per-agent latency, throughput and error metrics."""
+
+import bisect
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+
+# Latency histogram upper bounds, in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two increments."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Returns 0.0 when nothing has been observed, and the largest finite
+        bound when the quantile falls in the +Inf bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class AgentStats:
+    """Counters for one (agent_name, task_type) pair."""
+
+    __slots__ = ("latency", "requests", "errors", "in_flight")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+
+
+class MetricsRegistry:
+    """Process-wide collection of agent stats."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], AgentStats] = {}
+
+    def stats(self, agent_name: str, task_type: str) -> AgentStats:
+        """Stats for an agent and task type, created on first use."""
+        key = (agent_name, task_type)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = AgentStats()
+        return stats
+
+    def items(self) -> Iterator[Tuple[Tuple[str, str], AgentStats]]:
+        """((agent_name, task_type), stats) pairs in label order."""
+        return iter(sorted(self._stats.items()))
+
+    def reset(self) -> None:
+        """Drop all recorded stats."""
+        self._stats.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = [
+            "# HELP agenthr_task_duration_seconds Agent task execution latency.",
+            "# TYPE agenthr_task_duration_seconds histogram",
+        ]
+        for (agent_name, task_type), stats in self.items():
+            labels = f'agent="{agent_name}",task_type="{task_type}"'
+            cumulative = 0
+            bounds = [repr(b) for b in stats.latency.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, stats.latency.counts):
+                cumulative += count
+                bucket = f'agenthr_task_duration_seconds_bucket{{{labels},le="{bound}"}}'
+                lines.append(f"{bucket} {cumulative}")
+            lines.append(f"agenthr_task_duration_seconds_sum{{{labels}}} {stats.latency.sum}")
+            lines.append(f"agenthr_task_duration_seconds_count{{{labels}}} {stats.latency.count}")
+
+        for name, kind, help_text, attr in (
+            ("agenthr_tasks_total", "counter", "Agent tasks executed.", "requests"),
+            ("agenthr_task_errors_total", "counter", "Agent tasks that raised an error.", "errors"),
+            ("agenthr_tasks_in_flight", "gauge", "Agent tasks currently executing.", "in_flight"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (agent_name, task_type), stats in self.items():
+                labels = f'agent="{agent_name}",task_type="{task_type}"'
+                lines.append(f"{name}{{{labels}}} {getattr(stats, attr)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def instrument(execute: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an agent's execute coroutine to record latency, in-flight count and
+    errors under the agent's name and task type.
+    """
+    @functools.wraps(execute)
+    async def wrapper(self, task):
+        stats = metrics.stats(self.agent_name, self.task_type)
+        stats.requests += 1
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await execute(self, task)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.latency.observe(time.perf_counter() - start)
+
+    wrapper.__instrumented__ = True
+    return wrapper
@@ -0,0 +1,19 @@
+"""Onboarding components: the staged bulk onboarding pipeline."""
+
+from .pipeline import (
+    HireResult,
+    OnboardingPipeline,
+    OnboardingRecord,
+    Stage,
+    buddy_matcher,
+    default_stages,
+)
+
+__all__ = [
+    "HireResult",
+    "OnboardingPipeline",
+    "OnboardingRecord",
+    "Stage",
+    "buddy_matcher",
+    "default_stages",
+]
@@ -0,0 +1,247 @@
+"""Staged onboarding pipeline: paperwork, provisioning, training, buddy matching."""
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sized
+
+from ..serialization import Record
+
+
+# Stage handler: (hire, results of earlier stages) -> this stage's result
+StageHandler = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class Stage:
+    """One pipeline stage and its execution limits."""
+
+    name: str
+    handler: StageHandler
+    concurrency: int = 1
+    retries: int = 0
+    retry_delay: float = 0.05
+
+
+@dataclass(slots=True, eq=False)
+class HireResult(Record):
+    """One hire's outcome in task results; reads like a dict, encodes field by field."""
+
+    # Record type in onboarding output streams
+    record: str = field(default="hire", init=False)
+    index: int
+    employee_id: Any
+    employee_name: Any
+    status: str
+    stages: Dict[str, Any]
+    attempts: Dict[str, int]
+    failed_stage: Optional[str]
+    error: Optional[str]
+
+
+@dataclass(slots=True)
+class OnboardingRecord:
+    """A hire's progress through the pipeline."""
+
+    index: int
+    hire: Dict[str, Any]
+    stages: Dict[str, Any] = field(default_factory=dict)
+    attempts: Dict[str, int] = field(default_factory=dict)
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.failed_stage is None
+
+    def result(self) -> HireResult:
+        """The hire's outcome for task results."""
+        return HireResult(
+            index=self.index,
+            employee_id=self.hire.get("employee_id"),
+            employee_name=self.hire.get("employee_name"),
+            status="success" if self.ok else "error",
+            stages=self.stages,
+            attempts=self.attempts,
+            failed_stage=self.failed_stage,
+            error=self.error,
+        )
+
+
+_DONE = object()
+
+
+class OnboardingPipeline:
+    """
+    Runs hires through a sequence of stages connected by bounded queues.
+
+    Every stage has its own pool of worker coroutines, so a hire can be in
+    provisioning while the next one is still in paperwork; throughput is
+    set by the slowest stage rather than the sum of all stages. Bounded
+    queues apply back-pressure, so at most ``queue_size`` hires wait between
+    any two stages. A failing stage is retried with exponential backoff;
+    once its retries are exhausted the hire leaves the pipeline as failed.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 256):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, hires: Iterable[Dict[str, Any]]) -> AsyncIterator[OnboardingRecord]:
+        """
+        Onboard hires, yielding each record as it completes or fails.
+
+        Records arrive in completion order; ``record.index`` is the hire's
+        position in the input.
+
+        Args:
+            hires: Hire parameters (employee_id, employee_name, start_date, ...)
+
+        Yields:
+            One OnboardingRecord per hire
+        """
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        output: asyncio.Queue = asyncio.Queue(self.queue_size)
+        # No point starting more workers than there are hires
+        limit = len(hires) if isinstance(hires, Sized) else None
+        workers = [
+            max(1, min(stage.concurrency, limit)) if limit is not None else stage.concurrency
+            for stage in self.stages
+        ]
+
+        async def feed() -> None:
+            for index, hire in enumerate(hires):
+                await queues[0].put(OnboardingRecord(index, hire))
+            for _ in range(workers[0]):
+                await queues[0].put(_DONE)
+
+        async def work(position: int) -> None:
+            stage = self.stages[position]
+            inbox = queues[position]
+            outbox = queues[position + 1] if position + 1 < len(queues) else output
+            while True:
+                record = await inbox.get()
+                if record is _DONE:
+                    return
+                if await self._attempt(stage, record):
+                    await outbox.put(record)
+                else:
+                    await output.put(record)
+
+        async def run_stage(position: int) -> None:
+            await asyncio.gather(*(work(position) for _ in range(workers[position])))
+            # Every worker of this stage has finished: tell the next stage
+            if position + 1 < len(self.stages):
+                for _ in range(workers[position + 1]):
+                    await queues[position + 1].put(_DONE)
+            else:
+                await output.put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks.extend(asyncio.create_task(run_stage(i)) for i in range(len(self.stages)))
+        try:
+            while True:
+                record = await output.get()
+                if record is _DONE:
+                    break
+                yield record
+            # Surface any unexpected failure in the feeder or stage runners
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _attempt(stage: Stage, record: OnboardingRecord) -> bool:
+        """Run one stage for a record with retries; False once they are exhausted."""
+        for attempt in range(stage.retries + 1):
+            record.attempts[stage.name] = attempt + 1
+            try:
+                record.stages[stage.name] = await stage.handler(record.hire, record.stages)
+                return True
+            except Exception as e:
+                if attempt == stage.retries:
+                    record.failed_stage = stage.name
+                    record.error = str(e)
+                    return False
+                await asyncio.sleep(stage.retry_delay * 2 ** attempt)
+        return False
+
+
+# Default stage handlers. In production these call out to the document
+# signing, IT provisioning, LMS and directory services.
+
+async def prepare_paperwork(hire: Dict[str, Any], done: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and send new hire forms."""
+    await asyncio.sleep(0)
+    return {"documents": ["I-9", "W-4", "benefits_enrollment"], "completed": True}
+
+
+async def provision_equipment(hire: Dict[str, Any], done: Dict[str, Any]) -> Dict[str, Any]:
+    """Provision equipment and accounts."""
+    await asyncio.sleep(0)
+    return {
+        "equipment": ["laptop", "access_card"],
+        "accounts": ["email", "sso", (hire.get("department") or "general").lower()],
+        "completed": True,
+    }
+
+
+async def assign_training(hire: Dict[str, Any], done: Dict[str, Any]) -> Dict[str, Any]:
+    """Assign training modules for the hire's role."""
+    await asyncio.sleep(0)
+    modules = ["orientation", "security_awareness"]
+    if hire.get("role"):
+        modules.append(f"{hire['role'].lower().replace(' ', '_')}_essentials")
+    return {"modules": modules, "completed": True}
+
+
+def buddy_matcher(buddies: Iterable[Dict[str, Any]]) -> StageHandler:
+    """
+    Buddy matching stage that rotates through a pool of volunteers,
+    preferring buddies from the hire's department.
+
+    Args:
+        buddies: Volunteer records with employee_id and optional department
+    """
+    by_department: Dict[str, List[str]] = {}
+    everyone: List[str] = []
+    for buddy in buddies:
+        by_department.setdefault(buddy.get("department"), []).append(buddy["employee_id"])
+        everyone.append(buddy["employee_id"])
+    rotations = {department: itertools.cycle(ids) for department, ids in by_department.items()}
+    fallback = itertools.cycle(everyone) if everyone else None
+
+    async def match_buddy(hire: Dict[str, Any], done: Dict[str, Any]) -> Dict[str, Any]:
+        rotation = rotations.get(hire.get("department"), fallback)
+        return {"buddy_id": next(rotation) if rotation else None, "completed": True}
+
+    return match_buddy
+
+
+def default_stages(
+    concurrency: Dict[str, int],
+    retries: int = 2,
+    buddies: Iterable[Dict[str, Any]] = ()
+) -> List[Stage]:
+    """
+    The standard onboarding stages.
+
+    Args:
+        concurrency: Stage name -> worker count (missing stages get 1)
+        retries: Retries per stage
+        buddies: Buddy volunteer pool for matching
+    """
+    handlers = [
+        ("paperwork", prepare_paperwork),
+        ("provisioning", provision_equipment),
+        ("training", assign_training),
+        ("buddy_matching", buddy_matcher(buddies)),
+    ]
+    return [
+        Stage(name, handler, concurrency=concurrency.get(name, 1), retries=retries)
+        for name, handler in handlers
+    ]
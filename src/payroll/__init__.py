@@ -0,0 +1,31 @@
+"""Payroll computation module."""
+
+from .engine import (
+    PERIODS_PER_YEAR,
+    BracketSchedule,
+    PayrollInputs,
+    PayrollResult,
+    PayrollEngine,
+    PayStub,
+)
+from .snapshot import DeltaReport, IncrementalPayroll, PayrollSnapshot, SnapshotStore, input_hashes
+from .tax import TaxCalculator, TaxTables, WithholdingSchedule, jurisdiction, load_tax_tables
+
+__all__ = [
+    "PERIODS_PER_YEAR",
+    "BracketSchedule",
+    "PayrollInputs",
+    "PayrollResult",
+    "PayrollEngine",
+    "PayStub",
+    "DeltaReport",
+    "IncrementalPayroll",
+    "PayrollSnapshot",
+    "SnapshotStore",
+    "input_hashes",
+    "TaxCalculator",
+    "TaxTables",
+    "WithholdingSchedule",
+    "jurisdiction",
+    "load_tax_tables",
+]
@@ -0,0 +1,368 @@
+"""Columnar gross-to-net payroll engine.
+
+Every step of the calculation operates on whole NumPy columns, so the cost of a
+run is a handful of array operations regardless of headcount.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..serialization import Record
+from .tax import BracketSchedule, Jurisdiction, TaxCalculator, TaxTables, jurisdiction
+
+
+PERIODS_PER_YEAR: Dict[str, int] = {
+    "weekly": 52,
+    "biweekly": 26,
+    "semimonthly": 24,
+    "monthly": 12,
+    "quarterly": 4,
+    "annual": 1,
+}
+
+# Annual federal income tax brackets as (lower bound, marginal rate)
+FEDERAL_BRACKETS: List[Tuple[float, float]] = [
+    (0.0, 0.10),
+    (11600.0, 0.12),
+    (47150.0, 0.22),
+    (100525.0, 0.24),
+    (191950.0, 0.32),
+    (243725.0, 0.35),
+    (609350.0, 0.37),
+]
+
+SOCIAL_SECURITY_RATE = 0.062
+SOCIAL_SECURITY_WAGE_BASE = 168600.0
+MEDICARE_RATE = 0.0145
+
+_NUMERIC_COLUMNS = (
+    "annual_salary",
+    "hourly_rate",
+    "hours",
+    "pretax_deductions",
+    "posttax_deductions",
+)
+
+
+@dataclass(slots=True, eq=False)
+class PayStub(Record):
+    """One employee's pay for a period; reads like a dict, encodes field by field."""
+
+    # Record type in payroll output streams
+    record: str = field(default="pay_stub", init=False)
+    employee_id: str
+    gross: float
+    pretax_deductions: float
+    federal_tax: float
+    social_security: float
+    medicare: float
+    state_tax: float
+    local_tax: float
+    posttax_deductions: float
+    net: float
+    period: str
+
+
+def _factorize(
+    states: Sequence[Optional[str]], localities: Sequence[Optional[str]]
+) -> Tuple[np.ndarray, List[Jurisdiction]]:
+    """Integer codes for per-row (state, locality) pairs, and the distinct pairs."""
+    codes: Dict[Tuple[Any, Any], int] = {}
+    index: Dict[Jurisdiction, int] = {}
+
+    def code(raw: Tuple[Any, Any]) -> int:
+        value = codes.get(raw)
+        if value is None:
+            key = jurisdiction(raw[0] or "", raw[1] or "")
+            value = codes[raw] = index.setdefault(key, len(index))
+        return value
+
+    ids = np.fromiter(map(code, zip(states, localities)), dtype=np.int32, count=len(states))
+    return ids, list(index)
+
+
+@dataclass
+class PayrollInputs:
+    """Per-employee payroll inputs stored as parallel columns."""
+
+    employee_ids: np.ndarray
+    annual_salary: np.ndarray
+    hourly_rate: np.ndarray
+    hours: np.ndarray
+    pretax_deductions: np.ndarray
+    posttax_deductions: np.ndarray
+    # Row -> index into jurisdictions, the distinct (state, locality) pairs
+    jurisdiction_ids: Optional[np.ndarray] = None
+    jurisdictions: Optional[List[Jurisdiction]] = None
+
+    def __post_init__(self) -> None:
+        # No jurisdiction means no state or local withholding
+        if self.jurisdiction_ids is None:
+            self.jurisdiction_ids = np.zeros(len(self.employee_ids), dtype=np.int32)
+            self.jurisdictions = [jurisdiction("", "")]
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]]) -> "PayrollInputs":
+        """
+        Build inputs from a mapping of column name to values.
+
+        Missing numeric columns default to zero, and missing state or
+        locality codes to none.
+        """
+        employee_ids = np.asarray(columns.get("employee_id", []), dtype=str)
+        size = len(employee_ids)
+        values = {}
+        for name in _NUMERIC_COLUMNS:
+            column = columns.get(name)
+            if column is None:
+                values[name] = np.zeros(size, dtype=np.float64)
+            else:
+                values[name] = np.asarray(column, dtype=np.float64)
+                if len(values[name]) != size:
+                    raise ValueError(
+                        f"Column '{name}' has {len(values[name])} rows, expected {size}"
+                    )
+        states, localities = columns.get("state"), columns.get("locality")
+        if states is not None or localities is not None:
+            states = [""] * size if states is None else states
+            localities = [""] * size if localities is None else localities
+            if len(states) != size or len(localities) != size:
+                raise ValueError(f"Columns 'state' and 'locality' must have {size} rows")
+            values["jurisdiction_ids"], values["jurisdictions"] = _factorize(states, localities)
+        return cls(employee_ids=employee_ids, **values)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "PayrollInputs":
+        """Build inputs from a list of per-employee dicts."""
+        size = len(records)
+        columns: Dict[str, Any] = {
+            "employee_id": [record["employee_id"] for record in records]
+        }
+        for name in _NUMERIC_COLUMNS:
+            columns[name] = np.fromiter(
+                (record.get(name) or 0.0 for record in records), dtype=np.float64, count=size
+            )
+        if any("state" in record or "locality" in record for record in records):
+            columns["state"] = [record.get("state") for record in records]
+            columns["locality"] = [record.get("locality") for record in records]
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_task(
+        cls, employees: Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]]
+    ) -> "PayrollInputs":
+        """Build inputs from either row-oriented or column-oriented task data."""
+        if isinstance(employees, dict):
+            return cls.from_columns(employees)
+        return cls.from_records(employees)
+
+    def slice(self, start: int, stop: int) -> "PayrollInputs":
+        """Rows [start, stop) as views over the same columns."""
+        return PayrollInputs(
+            employee_ids=self.employee_ids[start:stop],
+            jurisdiction_ids=self.jurisdiction_ids[start:stop],
+            jurisdictions=self.jurisdictions,
+            **{name: getattr(self, name)[start:stop] for name in _NUMERIC_COLUMNS}
+        )
+
+    def select(self, employee_ids: Sequence[str]) -> "PayrollInputs":
+        """Restrict the inputs to the given employee IDs."""
+        return self.take(np.isin(self.employee_ids, np.asarray(employee_ids, dtype=str)))
+
+    def take(self, rows: np.ndarray) -> "PayrollInputs":
+        """Rows picked by a boolean mask or an array of row indices."""
+        return PayrollInputs(
+            employee_ids=self.employee_ids[rows],
+            jurisdiction_ids=self.jurisdiction_ids[rows],
+            jurisdictions=self.jurisdictions,
+            **{name: getattr(self, name)[rows] for name in _NUMERIC_COLUMNS}
+        )
+
+
+@dataclass
+class PayrollResult:
+    """Per-employee payroll results stored as parallel columns."""
+
+    period: str
+    employee_ids: np.ndarray
+    gross: np.ndarray
+    pretax_deductions: np.ndarray
+    taxable: np.ndarray
+    federal_tax: np.ndarray
+    social_security: np.ndarray
+    medicare: np.ndarray
+    state_tax: np.ndarray
+    local_tax: np.ndarray
+    posttax_deductions: np.ndarray
+    net: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    @property
+    def total_taxes(self) -> np.ndarray:
+        """Total employee taxes withheld per employee."""
+        return (
+            self.federal_tax
+            + self.social_security
+            + self.medicare
+            + self.state_tax
+            + self.local_tax
+        )
+
+    def totals(self) -> Dict[str, float]:
+        """Aggregate amounts across the run."""
+        return {
+            "gross": round(float(self.gross.sum()), 2),
+            "deductions": round(
+                float(self.pretax_deductions.sum() + self.posttax_deductions.sum()), 2
+            ),
+            "taxes": round(float(self.total_taxes.sum()), 2),
+            "net": round(float(self.net.sum()), 2),
+        }
+
+    def pay_stubs(self) -> Iterator[PayStub]:
+        """Iterate over pay stubs in row order."""
+        columns = [
+            self.employee_ids.tolist(),
+            self.gross.tolist(),
+            self.pretax_deductions.tolist(),
+            self.federal_tax.tolist(),
+            self.social_security.tolist(),
+            self.medicare.tolist(),
+            self.state_tax.tolist(),
+            self.local_tax.tolist(),
+            self.posttax_deductions.tolist(),
+            self.net.tolist(),
+        ]
+        for row in zip(*columns):
+            yield PayStub(*row, self.period)
+
+    def pay_stub(self, i: int) -> PayStub:
+        """Pay stub for the employee at row i."""
+        return next(self.slice(i, i + 1).pay_stubs())
+
+    def slice(self, start: int, stop: int) -> "PayrollResult":
+        """Rows [start, stop) as views over the same columns."""
+        return PayrollResult(
+            period=self.period,
+            employee_ids=self.employee_ids[start:stop],
+            gross=self.gross[start:stop],
+            pretax_deductions=self.pretax_deductions[start:stop],
+            taxable=self.taxable[start:stop],
+            federal_tax=self.federal_tax[start:stop],
+            social_security=self.social_security[start:stop],
+            medicare=self.medicare[start:stop],
+            state_tax=self.state_tax[start:stop],
+            local_tax=self.local_tax[start:stop],
+            posttax_deductions=self.posttax_deductions[start:stop],
+            net=self.net[start:stop],
+        )
+
+
+class PayrollEngine:
+    """Computes wages, deductions and taxes for a whole payroll run at once."""
+
+    def __init__(
+        self,
+        federal_brackets: Optional[Sequence[Tuple[float, float]]] = None,
+        tax_tables: Optional[TaxTables] = None
+    ):
+        self.federal = BracketSchedule(federal_brackets or FEDERAL_BRACKETS)
+        self.taxes = TaxCalculator(tax_tables)
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of every bracket schedule and rate the engine applies; equal
+        fingerprints pay equal inputs the same.
+        """
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            schedules = [("federal", self.federal)]
+            schedules += sorted(
+                (f"state/{code}", s) for code, s in self.taxes.tables.states.items()
+            )
+            schedules += sorted(
+                (f"local/{code}", s) for code, s in self.taxes.tables.localities.items()
+            )
+            for name, schedule in schedules:
+                h.update(f"{name}:{len(schedule.thresholds)}\0".encode())
+                h.update(schedule.thresholds.tobytes())
+                h.update(schedule.rates.tobytes())
+            h.update(np.array(
+                [SOCIAL_SECURITY_RATE, SOCIAL_SECURITY_WAGE_BASE, MEDICARE_RATE], dtype=np.float64
+            ).tobytes())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def run(self, inputs: PayrollInputs, period: str = "monthly") -> PayrollResult:
+        """
+        Compute gross-to-net pay for every employee in the inputs.
+
+        Args:
+            inputs: Columnar payroll inputs
+            period: Payroll period (weekly, biweekly, semimonthly, monthly, quarterly, annual)
+
+        Returns:
+            Columnar payroll results, rounded to cents
+        """
+        periods = PERIODS_PER_YEAR.get(period)
+        if periods is None:
+            raise ValueError(f"Unknown payroll period: {period}")
+
+        gross = inputs.annual_salary / periods + inputs.hourly_rate * inputs.hours
+        pretax = np.minimum(inputs.pretax_deductions, gross)
+        taxable = gross - pretax
+
+        # Withholding is computed on annualized wages, then de-annualized
+        annual_taxable = taxable * periods
+        federal_tax = self.federal.apply(annual_taxable) / periods
+        social_security = (
+            np.minimum(annual_taxable, SOCIAL_SECURITY_WAGE_BASE) * SOCIAL_SECURITY_RATE / periods
+        )
+        medicare = taxable * MEDICARE_RATE
+        state_tax, local_tax = self.taxes.withhold(
+            inputs.jurisdictions, inputs.jurisdiction_ids, taxable, periods
+        )
+
+        federal_tax = np.round(federal_tax, 2)
+        social_security = np.round(social_security, 2)
+        medicare = np.round(medicare, 2)
+        state_tax = np.round(state_tax, 2)
+        local_tax = np.round(local_tax, 2)
+        gross = np.round(gross, 2)
+        pretax = np.round(pretax, 2)
+        posttax = np.round(inputs.posttax_deductions, 2)
+        net = (
+            gross
+            - pretax
+            - federal_tax
+            - social_security
+            - medicare
+            - state_tax
+            - local_tax
+            - posttax
+        )
+
+        return PayrollResult(
+            period=period,
+            employee_ids=inputs.employee_ids,
+            gross=gross,
+            pretax_deductions=pretax,
+            taxable=np.round(taxable, 2),
+            federal_tax=federal_tax,
+            social_security=social_security,
+            medicare=medicare,
+            state_tax=state_tax,
+            local_tax=local_tax,
+            posttax_deductions=posttax,
+            net=np.round(net, 2),
+        )
@@ -0,0 +1,353 @@
+"""Per-period payroll snapshots and incremental reruns.
+
+Each stored run keeps its results together with a content hash of every
+employee's inputs and the fingerprint of the engine's tax tables. A rerun of
+the same run hashes the new inputs, recomputes only the employees whose hash
+changed (or who are new, or everyone if the tax tables changed), merges them
+into the stored results and reports what moved.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .engine import _NUMERIC_COLUMNS, PayrollEngine, PayrollInputs, PayrollResult
+
+
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_RESULT_COLUMNS = tuple(f.name for f in fields(PayrollResult) if f.name != "period")
+
+# Amounts compared per employee in a delta report
+_DELTA_FIELDS = ("gross", "total_taxes", "net")
+
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: every input bit affects every output bit
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def _string_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def input_hashes(inputs: PayrollInputs) -> np.ndarray:
+    """
+    64-bit content hash of each employee's payroll inputs.
+
+    Covers pay, hours, deductions and tax jurisdiction, but not the
+    employee ID, which is the key the hash is stored under. Stable across
+    processes, so hashes can be compared with those of earlier runs.
+    """
+    with np.errstate(over="ignore"):
+        h = np.full(len(inputs), _FNV_OFFSET, dtype=np.uint64)
+        for name in _NUMERIC_COLUMNS:
+            # + 0.0 folds -0.0 into 0.0 so equal amounts hash equally
+            values = np.ascontiguousarray(getattr(inputs, name) + 0.0, dtype=np.float64)
+            h = _mix(h ^ values.view(np.uint64))
+        places = np.array(
+            [_string_hash(f"{state}/{locality}") for state, locality in inputs.jurisdictions],
+            dtype=np.uint64,
+        )
+        return _mix(h ^ places[inputs.jurisdiction_ids])
+
+
+@dataclass
+class PayrollSnapshot:
+    """
+    A stored payroll run: results, the input hash of every employee and the
+    fingerprint of the engine that computed them.
+    """
+
+    run_id: str
+    result: PayrollResult
+    input_hashes: np.ndarray
+    engine_fingerprint: str = ""
+
+    @property
+    def period(self) -> str:
+        return self.result.period
+
+
+class SnapshotStore:
+    """
+    One ``.npz`` file per tenant and run, replaced atomically on every save.
+
+    lock() serializes reruns of a run across threads and processes, so
+    concurrent reruns never merge into the same stored run and lose each
+    other's changes.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.payroll_snapshot_dir
+
+    def _path(self, tenant_id: str, run_id: str) -> str:
+        for value in (tenant_id, run_id):
+            if not _RUN_ID.match(value):
+                raise ValueError(f"Invalid payroll run id or tenant: {value}")
+        return os.path.join(self.directory, tenant_id, f"{run_id}.npz")
+
+    @contextmanager
+    def lock(self, tenant_id: str, run_id: str) -> Iterator[None]:
+        """Exclusive lock on a run, held e.g. from load() to save() of a rerun."""
+        path = self._path(tenant_id, run_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def save(self, tenant_id: str, snapshot: PayrollSnapshot) -> None:
+        """Write a snapshot; a crash mid-write leaves the previous one intact."""
+        path = self._path(tenant_id, snapshot.run_id)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # A unique temporary file, so concurrent writers never share one
+        fd, temporary = tempfile.mkstemp(
+            dir=directory, prefix=f".{snapshot.run_id}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    period=np.array(snapshot.period),
+                    input_hashes=snapshot.input_hashes,
+                    engine_fingerprint=np.array(snapshot.engine_fingerprint),
+                    **{name: getattr(snapshot.result, name) for name in _RESULT_COLUMNS}
+                )
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def load(self, tenant_id: str, run_id: str) -> Optional[PayrollSnapshot]:
+        """A stored run, or None if it was never saved."""
+        try:
+            with np.load(self._path(tenant_id, run_id), allow_pickle=False) as data:
+                result = PayrollResult(
+                    period=str(data["period"]),
+                    **{name: data[name] for name in _RESULT_COLUMNS}
+                )
+                fingerprint = (
+                    str(data["engine_fingerprint"]) if "engine_fingerprint" in data.files else ""
+                )
+                return PayrollSnapshot(run_id, result, data["input_hashes"], fingerprint)
+        except FileNotFoundError:
+            return None
+
+
+@dataclass
+class DeltaReport:
+    """What a rerun changed relative to the stored run."""
+
+    run_id: str
+    period: str
+    employees: int
+    recomputed: int
+    full: bool = False
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    totals_before: Dict[str, float] = field(default_factory=dict)
+    totals_after: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self, limit: int = 1000) -> Dict[str, Any]:
+        """The report, with each ID list cut to ``limit`` entries (counts are exact)."""
+        return {
+            "run_id": self.run_id,
+            "period": self.period,
+            "employees": self.employees,
+            "recomputed": self.recomputed,
+            "full": self.full,
+            "added_count": len(self.added),
+            "removed_count": len(self.removed),
+            "changed_count": len(self.changed),
+            "added": self.added[:limit],
+            "removed": self.removed[:limit],
+            "changed": self.changed[:limit],
+            "totals_before": self.totals_before,
+            "totals_after": self.totals_after,
+            "totals_delta": {
+                key: round(self.totals_after[key] - self.totals_before.get(key, 0.0), 2)
+                for key in self.totals_after
+            },
+        }
+
+
+def _changes(
+    before: PayrollResult,
+    before_rows: np.ndarray,
+    after: PayrollResult,
+    after_rows: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Before/after amounts for each employee whose pay moved."""
+    columns = []
+    for result, rows in ((before, before_rows), (after, after_rows)):
+        columns.append({key: getattr(result, key)[rows].round(2).tolist() for key in _DELTA_FIELDS})
+    old, new = columns
+    return [
+        {
+            "employee_id": employee_id,
+            **{key: {"before": old[key][i], "after": new[key][i]} for key in _DELTA_FIELDS},
+        }
+        for i, employee_id in enumerate(after.employee_ids[after_rows].tolist())
+        if any(old[key][i] != new[key][i] for key in _DELTA_FIELDS)
+    ]
+
+
+def _concat(
+    result: PayrollResult, rows: np.ndarray, extra: PayrollResult, extra_rows: np.ndarray
+) -> PayrollResult:
+    """result[rows] followed by extra[extra_rows], column by column."""
+    return PayrollResult(
+        period=result.period,
+        **{
+            name: np.concatenate((getattr(result, name)[rows], getattr(extra, name)[extra_rows]))
+            for name in _RESULT_COLUMNS
+        }
+    )
+
+
+class IncrementalPayroll:
+    """
+    Payroll runs that, when repeated, only recompute what changed.
+
+    The first run of a ``run_id`` computes everyone and stores a snapshot.
+    Later runs of the same ``run_id`` recompute only employees whose input
+    hash differs from the snapshot, copy everyone else's stored results,
+    and store the merged run. If the engine's fingerprint differs from the
+    snapshot's (e.g. new tax tables), everyone in the inputs is recomputed.
+    Reruns of one run are serialized with the store's lock.
+    """
+
+    def __init__(
+        self, engine: Optional[PayrollEngine] = None, store: Optional[SnapshotStore] = None
+    ):
+        self.engine = engine or PayrollEngine()
+        self.store = store or SnapshotStore()
+
+    def run(
+        self,
+        inputs: PayrollInputs,
+        period: str,
+        run_id: str,
+        tenant_id: Optional[str] = None,
+        partial: bool = False,
+        full: bool = False
+    ) -> Tuple[PayrollResult, DeltaReport]:
+        """
+        Run or rerun payroll for a stored run.
+
+        Args:
+            inputs: Payroll inputs; the whole roster unless ``partial``
+            period: Payroll period
+            run_id: Stored run to rerun, e.g. "2024-06-14"
+            tenant_id: Tenant owning the run
+            partial: Inputs hold only corrected employees; everyone else
+                keeps their stored results instead of being removed
+            full: Recompute every employee in the inputs regardless of hashes;
+                implied when the snapshot was computed with other tax tables
+
+        Returns:
+            The merged run and the delta against the stored run
+
+        Raises:
+            ValueError: If the stored run is for a different period
+        """
+        tenant_id = tenant_id or settings.default_tenant
+        hashes = input_hashes(inputs)
+        with self.store.lock(tenant_id, run_id):
+            previous = self.store.load(tenant_id, run_id)
+            if previous is not None and previous.period != period:
+                raise ValueError(f"Payroll run {run_id} is {previous.period}, not {period}")
+            if previous is None:
+                result = self.engine.run(inputs, period)
+                report = DeltaReport(
+                    run_id, period, len(result), len(result), full=True,
+                    added=result.employee_ids.tolist(), totals_after=result.totals()
+                )
+            else:
+                full = full or previous.engine_fingerprint != self.engine.fingerprint
+                result, hashes, report = self._merge(previous, inputs, hashes, partial, full)
+            self.store.save(
+                tenant_id, PayrollSnapshot(run_id, result, hashes, self.engine.fingerprint)
+            )
+        return result, report
+
+    def _merge(
+        self,
+        previous: PayrollSnapshot,
+        inputs: PayrollInputs,
+        hashes: np.ndarray,
+        partial: bool,
+        full: bool
+    ) -> Tuple[PayrollResult, np.ndarray, DeltaReport]:
+        """The stored run with changed employees recomputed, its hashes, and the delta."""
+        run_id, period = previous.run_id, previous.period
+
+        stored = previous.result
+        # Row of each input employee in the stored run, via one sort of stored IDs
+        # unless the roster is unchanged
+        if np.array_equal(stored.employee_ids, inputs.employee_ids):
+            stored_rows = np.arange(len(inputs))
+            found = np.ones(len(inputs), dtype=bool)
+        elif len(stored):
+            order = np.argsort(stored.employee_ids, kind="stable")
+            positions = np.searchsorted(stored.employee_ids, inputs.employee_ids, sorter=order)
+            stored_rows = order[np.minimum(positions, len(order) - 1)]
+            found = stored.employee_ids[stored_rows] == inputs.employee_ids
+        else:
+            stored_rows = np.zeros(len(inputs), dtype=np.intp)
+            found = np.zeros(len(inputs), dtype=bool)
+        dirty = np.ones(len(inputs), dtype=bool) if full else ~found
+        dirty |= found & (previous.input_hashes[stored_rows] != hashes)
+
+        recomputed = self.engine.run(inputs.take(dirty), period)
+        updated = found[dirty]
+        targets = stored_rows[dirty][updated]
+        new_rows = np.flatnonzero(~updated)
+
+        # Recomputed employees overwrite their stored row; new ones are appended
+        merged = PayrollResult(
+            period=period, **{name: getattr(stored, name).copy() for name in _RESULT_COLUMNS}
+        )
+        merged_hashes = previous.input_hashes.copy()
+        for name in _RESULT_COLUMNS:
+            getattr(merged, name)[targets] = getattr(recomputed, name)[updated]
+        merged_hashes[targets] = hashes[dirty][updated]
+
+        if partial:
+            keep = np.ones(len(stored), dtype=bool)
+        else:
+            keep = np.zeros(len(stored), dtype=bool)
+            keep[stored_rows[found]] = True
+        merged = _concat(merged, keep, recomputed, new_rows)
+        merged_hashes = np.concatenate((merged_hashes[keep], hashes[dirty][new_rows]))
+
+        report = DeltaReport(
+            run_id,
+            period,
+            employees=len(merged),
+            recomputed=len(recomputed),
+            full=full,
+            added=recomputed.employee_ids[new_rows].tolist(),
+            removed=stored.employee_ids[~keep].tolist(),
+            changed=_changes(stored, targets, recomputed, np.flatnonzero(updated)),
+            totals_before=stored.totals(),
+            totals_after=merged.totals(),
+        )
+        return merged, merged_hashes, report
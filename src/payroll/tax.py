@@ -0,0 +1,256 @@
+"""State and local income tax withholding by jurisdiction.
+
+Bracket tables are loaded once into sorted arrays. Payroll inputs carry each
+employee's (state, locality) combination as an integer code; each distinct
+combination resolves to a single precomputed per-period withholding schedule,
+shared by every employee in that combination, and the brackets are applied
+to all of them at once with ``np.searchsorted``.
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+Brackets = Sequence[Tuple[float, float]]
+
+# (state, locality) codes, upper-case; "" when absent
+Jurisdiction = Tuple[str, str]
+
+
+class BracketSchedule:
+    """Progressive bracket schedule evaluated with a single searchsorted."""
+
+    def __init__(self, brackets: Sequence[Tuple[float, float]]):
+        if not brackets or brackets[0][0] != 0.0:
+            raise ValueError("Bracket schedule must start at 0")
+        self.thresholds = np.array([b[0] for b in brackets], dtype=np.float64)
+        self.rates = np.array([b[1] for b in brackets], dtype=np.float64)
+        if np.any(np.diff(self.thresholds) <= 0):
+            raise ValueError("Bracket thresholds must be strictly increasing")
+        # Tax owed at the bottom of each bracket
+        widths = np.diff(self.thresholds)
+        self.base = np.concatenate(([0.0], np.cumsum(widths * self.rates[:-1])))
+
+    def apply(self, income: np.ndarray) -> np.ndarray:
+        """
+        Compute tax for every income in the array.
+
+        Args:
+            income: Annual taxable income per employee
+
+        Returns:
+            Annual tax per employee
+        """
+        income = np.maximum(income, 0.0)
+        idx = np.searchsorted(self.thresholds, income, side="right") - 1
+        return self.base[idx] + (income - self.thresholds[idx]) * self.rates[idx]
+
+
+_NO_TAX: List[Tuple[float, float]] = [(0.0, 0.0)]
+
+# Annual brackets as (lower bound, marginal rate), single filer, simplified
+DEFAULT_STATE_BRACKETS: Dict[str, Brackets] = {
+    **{state: _NO_TAX for state in ("AK", "FL", "NH", "NV", "SD", "TN", "TX", "WA", "WY")},
+    "AZ": [(0.0, 0.025)],
+    "CO": [(0.0, 0.044)],
+    "IL": [(0.0, 0.0495)],
+    "IN": [(0.0, 0.0305)],
+    "MA": [(0.0, 0.05), (1053750.0, 0.09)],
+    "MI": [(0.0, 0.0425)],
+    "NC": [(0.0, 0.045)],
+    "PA": [(0.0, 0.0307)],
+    "UT": [(0.0, 0.0465)],
+    "OH": [(0.0, 0.0), (26050.0, 0.0275), (100000.0, 0.035)],
+    "CA": [
+        (0.0, 0.01),
+        (10756.0, 0.02),
+        (25499.0, 0.04),
+        (40245.0, 0.06),
+        (55866.0, 0.08),
+        (70606.0, 0.093),
+        (360659.0, 0.103),
+        (432787.0, 0.113),
+        (721314.0, 0.123),
+        (1000000.0, 0.133),
+    ],
+    "NY": [
+        (0.0, 0.04),
+        (8500.0, 0.045),
+        (11700.0, 0.0525),
+        (13900.0, 0.055),
+        (80650.0, 0.06),
+        (215400.0, 0.0685),
+        (1077550.0, 0.0965),
+        (5000000.0, 0.103),
+        (25000000.0, 0.109),
+    ],
+}
+
+# Keyed "STATE/LOCALITY"
+DEFAULT_LOCAL_BRACKETS: Dict[str, Brackets] = {
+    "NY/NYC": [(0.0, 0.03078), (12000.0, 0.03762), (25000.0, 0.03819), (50000.0, 0.03876)],
+    "NY/YONKERS": [(0.0, 0.0161135)],
+    "PA/PHILADELPHIA": [(0.0, 0.0375)],
+    "PA/PITTSBURGH": [(0.0, 0.03)],
+    "OH/COLUMBUS": [(0.0, 0.025)],
+    "OH/CLEVELAND": [(0.0, 0.025)],
+    "MI/DETROIT": [(0.0, 0.024)],
+}
+
+
+def _code(value: str) -> str:
+    return sys.intern(value.strip().upper())
+
+
+def jurisdiction(state: str, locality: str = "") -> Jurisdiction:
+    """Normalized, interned (state, locality) codes."""
+    return (_code(state), _code(locality))
+
+
+class TaxTables:
+    """State and local bracket schedules, compiled once into sorted arrays."""
+
+    def __init__(self, states: Dict[str, Brackets], localities: Dict[str, Brackets]):
+        self.states: Dict[str, BracketSchedule] = {
+            _code(state): BracketSchedule(brackets) for state, brackets in states.items()
+        }
+        self.localities: Dict[str, BracketSchedule] = {
+            _code(key): BracketSchedule(brackets) for key, brackets in localities.items()
+        }
+
+    @classmethod
+    def default(cls) -> "TaxTables":
+        """The built-in tables."""
+        return cls(DEFAULT_STATE_BRACKETS, DEFAULT_LOCAL_BRACKETS)
+
+
+def load_tax_tables(path: Optional[str]) -> TaxTables:
+    """
+    Tax tables from a JSON file, or the built-in tables when no path is set.
+
+    The file holds ``{"states": {"CA": [[0, 0.01], ...]}, "localities":
+    {"NY/NYC": [[0, 0.03078], ...]}}``.
+    """
+    if not path:
+        return TaxTables.default()
+    with open(path) as f:
+        data = json.load(f)
+    return TaxTables(data.get("states", {}), data.get("localities", {}))
+
+
+@dataclass(frozen=True, slots=True)
+class WithholdingSchedule:
+    """Per-period state and local schedules for one jurisdiction combination."""
+
+    state: str
+    locality: str
+    state_brackets: Optional[BracketSchedule]
+    local_brackets: Optional[BracketSchedule]
+
+
+def _per_period(schedule: BracketSchedule, periods: int) -> BracketSchedule:
+    # Scaling the thresholds by 1/periods yields annual tax / periods on per-period wages
+    thresholds = (schedule.thresholds / periods).tolist()
+    return BracketSchedule(list(zip(thresholds, schedule.rates.tolist())))
+
+
+class TaxCalculator:
+    """
+    State and local withholding for whole payroll runs.
+
+    Schedules are derived per (state, locality, periods) on first use and
+    cached, so later runs for the same period reuse them untouched.
+    Employees with no state are not withheld state or local tax.
+    """
+
+    def __init__(self, tables: Optional[TaxTables] = None):
+        self.tables = tables or TaxTables.default()
+        self._schedules: Dict[Tuple[str, str, int], WithholdingSchedule] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(self, state: str, locality: str, periods: int) -> WithholdingSchedule:
+        """
+        The withholding schedule for a jurisdiction combination and pay frequency.
+
+        Raises:
+            ValueError: If the state, or the locality within it, has no tax table
+        """
+        state_code, locality_code = jurisdiction(state, locality)
+        key = (state_code, locality_code, periods)
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self.hits += 1
+            return schedule
+        self.misses += 1
+
+        state_brackets = local_brackets = None
+        if state_code:
+            annual = self.tables.states.get(state_code)
+            if annual is None:
+                raise ValueError(f"Unknown tax jurisdiction: {state_code}")
+            state_brackets = _per_period(annual, periods)
+        if locality_code:
+            annual = self.tables.localities.get(f"{state_code}/{locality_code}")
+            if annual is None:
+                raise ValueError(f"Unknown tax jurisdiction: {state_code}/{locality_code}")
+            local_brackets = _per_period(annual, periods)
+
+        schedule = WithholdingSchedule(state_code, locality_code, state_brackets, local_brackets)
+        self._schedules[key] = schedule
+        return schedule
+
+    def withhold(
+        self,
+        jurisdictions: Sequence[Jurisdiction],
+        jurisdiction_ids: np.ndarray,
+        taxable: np.ndarray,
+        periods: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        State and local tax on each employee's per-period taxable wages.
+
+        Employees are grouped by jurisdiction code with one integer sort, and
+        each group's brackets are applied to the whole group in one pass.
+
+        Args:
+            jurisdictions: Distinct (state, locality) pairs
+            jurisdiction_ids: Per employee, an index into jurisdictions
+            taxable: Per-period taxable wages per employee
+            periods: Pay periods per year
+
+        Returns:
+            State tax and local tax per employee
+        """
+        state_tax = np.zeros(len(taxable), dtype=np.float64)
+        local_tax = np.zeros(len(taxable), dtype=np.float64)
+        if not len(taxable):
+            return state_tax, local_tax
+
+        counts = np.bincount(jurisdiction_ids, minlength=len(jurisdictions))
+        used = np.flatnonzero(counts)
+        if len(used) == 1:
+            groups = [(int(used[0]), slice(None))]
+        else:
+            order = np.argsort(jurisdiction_ids, kind="stable")
+            ends = np.cumsum(counts)
+            groups = [(int(g), order[ends[g] - counts[g]:ends[g]]) for g in used]
+
+        for group, rows in groups:
+            state, locality = jurisdictions[group]
+            if not state and not locality:
+                continue
+            schedule = self.schedule(state, locality, periods)
+            if schedule.state_brackets is not None:
+                state_tax[rows] = schedule.state_brackets.apply(taxable[rows])
+            if schedule.local_brackets is not None:
+                local_tax[rows] = schedule.local_brackets.apply(taxable[rows])
+        return state_tax, local_tax
+
+    def stats(self) -> Dict[str, int]:
+        """Schedule cache counters."""
+        return {"schedules": len(self._schedules), "hits": self.hits, "misses": self.misses}
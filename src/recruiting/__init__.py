@@ -0,0 +1,20 @@
+"""Recruiting components: candidate search, screening and scheduling."""
+
+from .candidate_index import Candidate, CandidateMatch, CandidateIndex, RankedCandidate
+from .repository import CandidateRepository, candidate_repository
+from .screening import EmbeddingCache, ResumeScreener
+from .scheduling import Interview, Schedule, schedule_interviews
+
+__all__ = [
+    "Candidate",
+    "CandidateMatch",
+    "CandidateIndex",
+    "RankedCandidate",
+    "CandidateRepository",
+    "candidate_repository",
+    "EmbeddingCache",
+    "ResumeScreener",
+    "Interview",
+    "Schedule",
+    "schedule_interviews",
+]
@@ -0,0 +1,248 @@
+"""In-memory candidate index for ranking candidates against a job."""
+
+import bisect
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..serialization import Record
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a skill or location for index lookups."""
+    return " ".join(term.lower().split())
+
+
+@dataclass(slots=True)
+class Candidate:
+    """A candidate in the recruiting pool."""
+
+    candidate_id: str
+    name: str = ""
+    skills: FrozenSet[str] = frozenset()
+    location: Optional[str] = None
+    salary: float = 0.0
+    resume: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Candidate":
+        """Build a candidate from a task payload, normalizing skills and location."""
+        location = data.get("location")
+        return cls(
+            candidate_id=str(data["candidate_id"]),
+            name=data.get("name", ""),
+            skills=frozenset(normalize_term(s) for s in data.get("skills", [])),
+            location=normalize_term(location) if location else None,
+            salary=float(data.get("salary", 0.0)),
+            resume=data.get("resume", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form, accepted back by from_dict()."""
+        return {
+            "candidate_id": self.candidate_id,
+            "name": self.name,
+            "skills": sorted(self.skills),
+            "location": self.location,
+            "salary": self.salary,
+            "resume": self.resume,
+        }
+
+
+@dataclass(slots=True, eq=False)
+class RankedCandidate(Record):
+    """A match summary in task results; reads like a dict, encodes field by field."""
+
+    candidate_id: str
+    name: str
+    location: Optional[str]
+    salary: float
+    score: float
+    matched_skills: List[str]
+    similarity: Optional[float]
+
+
+@dataclass(slots=True)
+class CandidateMatch:
+    """A candidate ranked against a job's requirements."""
+
+    candidate: Candidate
+    score: float
+    matched_skills: List[str] = field(default_factory=list)
+    similarity: Optional[float] = None
+
+    def summary(self) -> RankedCandidate:
+        """Match summary for task results."""
+        return RankedCandidate(
+            candidate_id=self.candidate.candidate_id,
+            name=self.candidate.name,
+            location=self.candidate.location,
+            salary=self.candidate.salary,
+            score=round(self.score, 4),
+            matched_skills=self.matched_skills,
+            similarity=None if self.similarity is None else round(self.similarity, 4),
+        )
+
+
+class CandidateIndex:
+    """
+    Candidate pool indexed for requirement, location and budget queries.
+
+    - An inverted index maps each skill to the candidates that have it, so a
+      search only touches candidates sharing at least one required skill.
+    - Location buckets map a normalized location to its candidates.
+    - A sorted (salary, candidate_id) list answers "within budget" with a
+      binary search when no skills narrow the pool.
+
+    Candidates are added and removed incrementally; nothing is rebuilt.
+    """
+
+    def __init__(self, candidates: Optional[Iterable[Candidate]] = None):
+        self._candidates: Dict[str, Candidate] = {}
+        self._by_skill: Dict[str, Set[str]] = {}
+        self._by_location: Dict[str, Set[str]] = {}
+        self._by_salary: List[Tuple[float, str]] = []
+        if candidates is not None:
+            self.add_many(candidates)
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._candidates
+
+    def get(self, candidate_id: str) -> Optional[Candidate]:
+        """Look up a candidate by ID."""
+        return self._candidates.get(candidate_id)
+
+    def add(self, candidate: Candidate) -> None:
+        """Add a candidate, replacing any existing entry with the same ID."""
+        self._index(candidate)
+        bisect.insort(self._by_salary, (candidate.salary, candidate.candidate_id))
+
+    def add_many(self, candidates: Iterable[Candidate]) -> int:
+        """
+        Add candidates in bulk, replacing existing entries with the same IDs.
+
+        The salary index is re-sorted once instead of insorting each entry.
+
+        Returns:
+            Number of candidates added
+        """
+        # Last entry wins when the same ID appears more than once
+        latest = {candidate.candidate_id: candidate for candidate in candidates}
+        added = [self._index(candidate) for candidate in latest.values()]
+        self._by_salary.extend((c.salary, c.candidate_id) for c in added)
+        self._by_salary.sort()
+        return len(added)
+
+    def _index(self, candidate: Candidate) -> Candidate:
+        """Add a candidate to every index except the salary list."""
+        if candidate.candidate_id in self._candidates:
+            self.remove(candidate.candidate_id)
+        candidate_id = candidate.candidate_id
+        self._candidates[candidate_id] = candidate
+        for skill in candidate.skills:
+            self._by_skill.setdefault(skill, set()).add(candidate_id)
+        if candidate.location:
+            self._by_location.setdefault(candidate.location, set()).add(candidate_id)
+        return candidate
+
+    def remove(self, candidate_id: str) -> bool:
+        """
+        Remove a candidate.
+
+        Returns:
+            True if the candidate was in the index
+        """
+        candidate = self._candidates.pop(candidate_id, None)
+        if candidate is None:
+            return False
+        for skill in candidate.skills:
+            _discard(self._by_skill, skill, candidate_id)
+        if candidate.location:
+            _discard(self._by_location, candidate.location, candidate_id)
+        pos = bisect.bisect_left(self._by_salary, (candidate.salary, candidate_id))
+        del self._by_salary[pos]
+        return True
+
+    def search(
+        self,
+        requirements: Optional[Iterable[str]] = None,
+        location: Optional[str] = None,
+        budget: Optional[float] = None,
+        k: int = 10
+    ) -> Tuple[List[CandidateMatch], int]:
+        """
+        Rank candidates against a job.
+
+        Candidates are scored by the fraction of required skills they have;
+        ties go to the lower salary expectation.
+
+        Args:
+            requirements: Required skills
+            location: Job location (exact bucket match)
+            budget: Maximum salary
+            k: Number of matches to return
+
+        Returns:
+            The top k matches and the total number of matching candidates
+        """
+        required = {normalize_term(r) for r in requirements or () if r.strip()}
+        location = normalize_term(location) if location else None
+        in_location = self._by_location.get(location, set()) if location else None
+
+        if required:
+            # Only candidates sharing a required skill are ever touched
+            hits: Counter = Counter()
+            for skill in required:
+                hits.update(self._by_skill.get(skill, ()))
+            pool = (
+                (self._candidates[candidate_id], count / len(required))
+                for candidate_id, count in hits.items()
+            )
+        elif in_location is not None:
+            pool = ((self._candidates[candidate_id], 1.0) for candidate_id in in_location)
+        else:
+            # Salary index is sorted ascending, so the cheapest k within
+            # budget are already the best-ranked
+            end = (
+                len(self._by_salary) if budget is None
+                else bisect.bisect_right(self._by_salary, budget, key=_salary)
+            )
+            matches = [
+                CandidateMatch(candidate=self._candidates[candidate_id], score=1.0)
+                for _, candidate_id in self._by_salary[:min(k, end)]
+            ]
+            return matches, end
+
+        eligible = [
+            (candidate, score) for candidate, score in pool
+            if (in_location is None or candidate.candidate_id in in_location)
+            and (budget is None or candidate.salary <= budget)
+        ]
+        top = heapq.nlargest(k, eligible, key=lambda pair: (pair[1], -pair[0].salary))
+        matches = [
+            CandidateMatch(
+                candidate=candidate,
+                score=score,
+                matched_skills=sorted(required & candidate.skills),
+            )
+            for candidate, score in top
+        ]
+        return matches, len(eligible)
+
+
+def _salary(entry: Tuple[float, str]) -> float:
+    return entry[0]
+
+
+def _discard(index: Dict[str, Set[str]], key: str, candidate_id: str) -> None:
+    """Remove a candidate from an index bucket, dropping empty buckets."""
+    bucket = index.get(key)
+    if bucket is None:
+        return
+    bucket.discard(candidate_id)
+    if not bucket:
+        del index[key]
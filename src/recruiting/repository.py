@@ -0,0 +1,201 @@
+"""Candidate repository - tenant-scoped candidate pools, searched in memory."""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    create_engine,
+    delete,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .candidate_index import Candidate, CandidateIndex
+
+
+metadata = MetaData()
+
+candidates_table = Table(
+    "candidates",
+    metadata,
+    Column("tenant_id", String(64), primary_key=True),
+    Column("candidate_id", String(64), primary_key=True),
+    Column("data", JSON, nullable=False),
+)
+
+# Bumped by every write to a tenant's pool; an index built at an older
+# version, by this or any other process, is rebuilt before it is searched
+candidate_versions_table = Table(
+    "candidate_versions",
+    metadata,
+    Column("tenant_id", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+# Bound parameters per IN (...) query; SQLite allows 999 in older builds
+QUERY_CHUNK_SIZE = 500
+
+
+class CandidateRepository:
+    """
+    Candidate pools per tenant, stored in SQL and searched through one
+    in-memory CandidateIndex per tenant.
+
+    A tenant only ever sees and changes its own pool. Each index() call
+    reads the tenant's version counter (one primary-key query); the cached
+    index is used as is when it is current, and rebuilt from the database
+    otherwise, so API processes and job or CPU-pool workers all search the
+    same pool. Writes from this process update the cached index in place.
+
+    Database calls run on a worker thread; the indexes are only used from
+    the event loop, and each thread running a loop (e.g. thread-backend job
+    workers) keeps its own.
+    """
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.database_url = database_url or settings.candidate_database_url
+        self._local = threading.local()
+        self._engine: Optional[Engine] = None
+        self._engine_pid = 0
+
+    @property
+    def _indexes(self) -> Dict[str, Tuple[int, CandidateIndex]]:
+        indexes = getattr(self._local, "indexes", None)
+        if indexes is None:
+            indexes = self._local.indexes = {}
+        return indexes
+
+    @property
+    def engine(self) -> Engine:
+        """Database engine, created (with tables) on first use in each process."""
+        if self._engine is not None and self._engine_pid != os.getpid():
+            # Forked workers must not share the parent's pooled connections
+            self._engine.dispose(close=False)
+            self._engine = None
+        if self._engine is None:
+            if self.database_url.startswith("sqlite:///"):
+                directory = os.path.dirname(self.database_url[len("sqlite:///"):])
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            self._engine = create_engine(self.database_url)
+            self._engine_pid = os.getpid()
+            metadata.create_all(self._engine)
+        return self._engine
+
+    async def index(self, tenant_id: str) -> CandidateIndex:
+        """The tenant's current candidate pool."""
+        version = await asyncio.to_thread(self._version, tenant_id)
+        cached = self._indexes.get(tenant_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        version, candidates = await asyncio.to_thread(self._fetch, tenant_id)
+        index = CandidateIndex(candidates)
+        self._indexes[tenant_id] = (version, index)
+        return index
+
+    async def update(
+        self,
+        tenant_id: str,
+        candidates: Iterable[Candidate] = (),
+        remove: Iterable[str] = ()
+    ) -> CandidateIndex:
+        """
+        Add or replace candidates and remove others in one transaction.
+
+        Returns:
+            The tenant's updated candidate pool
+        """
+        candidates = list({c.candidate_id: c for c in candidates}.values())
+        remove = [str(candidate_id) for candidate_id in remove]
+        if not candidates and not remove:
+            return await self.index(tenant_id)
+        previous, version = await asyncio.to_thread(self._write, tenant_id, candidates, remove)
+        cached = self._indexes.get(tenant_id)
+        if cached is None or cached[0] != previous:
+            # Another write landed in between: rebuild from the database
+            self._indexes.pop(tenant_id, None)
+            return await self.index(tenant_id)
+        index = cached[1]
+        for candidate_id in remove:
+            index.remove(candidate_id)
+        index.add_many(candidates)
+        self._indexes[tenant_id] = (version, index)
+        return index
+
+    def clear_cache(self) -> None:
+        """Drop every cached index (the database is untouched)."""
+        self._indexes.clear()
+
+    def close(self) -> None:
+        """Release database connections."""
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def _version(self, tenant_id: str, conn: Any = None) -> int:
+        if conn is None:
+            with self.engine.connect() as conn:
+                return self._version(tenant_id, conn)
+        version = conn.execute(
+            select(candidate_versions_table.c.version)
+            .where(candidate_versions_table.c.tenant_id == tenant_id)
+        ).scalar()
+        return version or 0
+
+    def _bump_version(self, conn: Any, tenant_id: str) -> int:
+        table = candidate_versions_table
+        dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(conn.dialect.name)
+        if dialect is None:
+            raise ValueError(f"Unsupported candidate database: {conn.dialect.name}")
+        conn.execute(
+            dialect.insert(table)
+            .values(tenant_id=tenant_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[table.c.tenant_id], set_={"version": table.c.version + 1}
+            )
+        )
+        return self._version(tenant_id, conn)
+
+    def _fetch(self, tenant_id: str) -> Tuple[int, List[Candidate]]:
+        table = candidates_table
+        # One transaction, so the version matches the rows read
+        with self.engine.begin() as conn:
+            version = self._version(tenant_id, conn)
+            rows = conn.execute(select(table.c.data).where(table.c.tenant_id == tenant_id))
+            return version, [Candidate.from_dict(data) for data in rows.scalars()]
+
+    def _write(
+        self, tenant_id: str, candidates: List[Candidate], remove: List[str]
+    ) -> Tuple[int, int]:
+        """Apply a write; returns the tenant's version before and after it."""
+        table = candidates_table
+        ids = remove + [c.candidate_id for c in candidates]
+        with self.engine.begin() as conn:
+            # The version bump comes first so concurrent writers serialize on it
+            version = self._bump_version(conn, tenant_id)
+            for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+                conn.execute(delete(table).where(and_(
+                    table.c.tenant_id == tenant_id,
+                    table.c.candidate_id.in_(ids[start:start + QUERY_CHUNK_SIZE]),
+                )))
+            if candidates:
+                conn.execute(insert(table), [
+                    {"tenant_id": tenant_id, "candidate_id": c.candidate_id, "data": c.to_dict()}
+                    for c in candidates
+                ])
+        return version - 1, version
+
+
+candidate_repository = CandidateRepository()
@@ -0,0 +1,164 @@
+"""Interview scheduling over interviewer and candidate availability."""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Sequence, Tuple, Union
+
+
+TimeValue = Union[str, int, float]
+
+
+def _to_seconds(value: TimeValue) -> float:
+    """Epoch seconds from an ISO 8601 string or a number of seconds."""
+    if isinstance(value, str):
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    return float(value)
+
+
+def _merge(intervals: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Sort intervals and merge overlapping or touching ones."""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+@dataclass(slots=True)
+class Interview:
+    """A booked interview."""
+
+    candidate_id: str
+    interviewer_id: str
+    start: float
+    end: float
+
+    def to_dict(self, iso: bool = True) -> Dict[str, Any]:
+        """Interview as a dict, with ISO 8601 (UTC) or epoch-second times."""
+        if iso:
+            start = datetime.fromtimestamp(self.start, timezone.utc).isoformat()
+            end = datetime.fromtimestamp(self.end, timezone.utc).isoformat()
+        else:
+            start, end = self.start, self.end
+        return {
+            "candidate_id": self.candidate_id,
+            "interviewer_id": self.interviewer_id,
+            "start": start,
+            "end": end,
+        }
+
+
+@dataclass
+class Schedule:
+    """Outcome of a scheduling run."""
+
+    interviews: List[Interview] = field(default_factory=list)
+    unscheduled: List[str] = field(default_factory=list)
+    solve_time_ms: float = 0.0
+
+
+def schedule_interviews(
+    interviewers: Dict[str, Sequence[Tuple[TimeValue, TimeValue]]],
+    candidates: Dict[str, Sequence[Tuple[TimeValue, TimeValue]]],
+    duration: float
+) -> Schedule:
+    """
+    Book at most one interview per candidate without double-booking anyone.
+
+    A sweep line advances through time over two kinds of events: candidate
+    windows opening, and interviewer cursors (one per free interval)
+    becoming available. Open windows wait in an earliest-deadline-first heap
+    and leave it once they can no longer fit an interview. An available
+    cursor books the most urgent waiting candidate; with nobody waiting it
+    parks until a window opens and wakes it. Earliest-deadline-first is
+    optimal for a single interviewer and a good heuristic across many.
+
+    Every window wakes at most one cursor and every cursor step either books
+    an interview or parks, so the run is O(n log n) in the number of
+    intervals, windows and bookings.
+
+    Args:
+        interviewers: Interviewer ID -> free (start, end) intervals
+        candidates: Candidate ID -> available (start, end) windows, in
+            priority order of the dict when deadlines tie
+        duration: Interview length in seconds
+
+    Returns:
+        Booked interviews (sorted by start), candidates that could not be
+        placed, and the solve time
+    """
+    started = time.perf_counter()
+
+    # Candidate windows, ordered by start; each carries its rank for tie-breaks
+    windows: List[Tuple[float, float, int, str]] = []
+    for rank, (candidate_id, slots) in enumerate(candidates.items()):
+        for start, end in _merge((_to_seconds(s), _to_seconds(e)) for s, e in slots):
+            if end - start >= duration:
+                windows.append((start, end, rank, candidate_id))
+    windows.sort()
+
+    # One cursor per interviewer interval: (current time, interval end, interviewer)
+    cursors: List[Tuple[float, float, str]] = []
+    for interviewer_id, slots in interviewers.items():
+        for start, end in _merge((_to_seconds(s), _to_seconds(e)) for s, e in slots):
+            if end - start >= duration:
+                cursors.append((start, end, interviewer_id))
+    heapq.heapify(cursors)
+
+    waiting: List[Tuple[float, int, str]] = []  # (window end, rank, candidate)
+    parked: List[Tuple[float, str]] = []  # idle cursors: (interval end, interviewer)
+    booked: Dict[str, Interview] = {}
+    next_window = 0
+
+    while len(booked) < len(candidates):
+        cursor_time = cursors[0][0] if cursors else float("inf")
+        window_time = windows[next_window][0] if next_window < len(windows) else float("inf")
+        if cursor_time == window_time == float("inf"):
+            break
+
+        if window_time <= cursor_time:
+            # A candidate window opens: queue it and wake one idle interviewer
+            # that can still fit an interview, preferring the tightest fit
+            end, rank, candidate_id = windows[next_window][1:]
+            next_window += 1
+            if candidate_id in booked:
+                continue
+            heapq.heappush(waiting, (end, rank, candidate_id))
+            while parked and parked[0][0] - window_time < duration:
+                heapq.heappop(parked)
+            if parked:
+                interval_end, interviewer_id = heapq.heappop(parked)
+                heapq.heappush(cursors, (window_time, interval_end, interviewer_id))
+            continue
+
+        now, interval_end, interviewer_id = heapq.heappop(cursors)
+
+        # The sweep never moves backwards, so windows too short from now on
+        # are useless to every interviewer
+        while waiting and (waiting[0][0] - now < duration or waiting[0][2] in booked):
+            heapq.heappop(waiting)
+
+        if not waiting:
+            heapq.heappush(parked, (interval_end, interviewer_id))
+            continue
+
+        _, _, candidate_id = heapq.heappop(waiting)
+        booked[candidate_id] = Interview(candidate_id, interviewer_id, now, now + duration)
+        now += duration
+        if interval_end - now >= duration:
+            heapq.heappush(cursors, (now, interval_end, interviewer_id))
+
+    return Schedule(
+        interviews=sorted(booked.values(), key=lambda i: (i.start, i.interviewer_id)),
+        unscheduled=[c for c in candidates if c not in booked],
+        solve_time_ms=(time.perf_counter() - started) * 1000,
+    )
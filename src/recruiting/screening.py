@@ -0,0 +1,175 @@
+"""Resume screening by vector similarity against job requirements."""
+
+import fcntl
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from ..utils.embeddings import EmbeddingFunction, hashing_embedding
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a resume's content."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Append-only on-disk embedding store keyed by content hash.
+
+    Vectors live in a raw float32 file read through a memory map, so
+    screening a large pool only pages in the rows it touches. Keys are
+    appended to a text file whose line number is the row number; vectors
+    are written before keys, so a crash between the two leaves at most a
+    few orphaned rows, which are truncated before the next append.
+
+    The directory may be shared by several processes (the API and its job
+    workers): appends hold an exclusive lock on a lock file and number new
+    rows from the keys already on disk, and lookups pick up rows other
+    processes have appended since.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.dim = dim
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "embeddings.f32")
+        self._keys_path = os.path.join(directory, "keys.txt")
+        self._lock_path = os.path.join(directory, "lock")
+        self._row_bytes = dim * np.dtype(np.float32).itemsize
+        self._rows: Dict[str, int] = {}
+        # Lines and bytes of the keys file already read into _rows
+        self._lines = 0
+        self._keys_read = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._sync()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _sync(self) -> None:
+        """Read keys appended to disk since the last sync; the caller holds _lock."""
+        try:
+            if os.path.getsize(self._keys_path) <= self._keys_read:
+                return
+        except FileNotFoundError:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_read)
+            data = f.read()
+        # A line without its newline is still being written
+        data = data[:data.rfind(b"\n") + 1]
+        for key in data.decode().splitlines():
+            self._rows.setdefault(key, self._lines)
+            self._lines += 1
+        self._keys_read += len(data)
+        self._matrix = None
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the cache directory, across threads and processes."""
+        with self._lock, open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def lookup(self, keys: Sequence[str]) -> List[Optional[int]]:
+        """Row number for each key, or None if not cached."""
+        with self._lock:
+            self._sync()
+            return [self._rows.get(key) for key in keys]
+
+    def append(self, keys: Sequence[str], vectors: np.ndarray) -> List[int]:
+        """
+        Store vectors for keys that are not cached yet.
+
+        Returns:
+            Row number of each key, including keys another process cached first
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._file_lock():
+            self._sync()
+            new: Dict[str, int] = {}
+            for i, key in enumerate(keys):
+                if key not in self._rows:
+                    new.setdefault(key, i)
+            if new:
+                start = self._lines
+                with open(self._vectors_path, "ab") as f:
+                    # Drop rows orphaned by a writer that crashed before its keys
+                    f.truncate(start * self._row_bytes)
+                    f.write(vectors[list(new.values())].tobytes())
+                with open(self._keys_path, "a") as f:
+                    f.writelines(f"{key}\n" for key in new)
+                self._sync()
+            return [self._rows[key] for key in keys]
+
+    def matrix(self) -> np.ndarray:
+        """Memory-mapped (rows, dim) view of every cached vector."""
+        with self._lock:
+            if self._matrix is None:
+                if not self._lines:
+                    return np.empty((0, self.dim), dtype=np.float32)
+                self._matrix = np.memmap(
+                    self._vectors_path, dtype=np.float32, mode="r", shape=(self._lines, self.dim)
+                )
+            return self._matrix
+
+
+class ResumeScreener:
+    """Scores resumes against job requirements by cosine similarity."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        dim: int = 256,
+        embed: EmbeddingFunction = hashing_embedding,
+        embedder_name: Optional[str] = None
+    ):
+        self.dim = dim
+        self.embed = embed
+        # Vectors from different embedders or dimensions must never mix
+        name = embedder_name or getattr(embed, "__name__", "embedding")
+        self.cache = EmbeddingCache(os.path.join(cache_dir, f"{name}-{dim}"), dim)
+
+    def score(self, query: str, resumes: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity of each resume to the query.
+
+        Only resumes whose content has never been seen are embedded, in a
+        single batch; scoring is one matrix-vector product over the cached
+        rows.
+
+        Args:
+            query: Job requirements text
+            resumes: Resume texts
+
+        Returns:
+            float32 array of scores in [-1, 1], one per resume
+        """
+        if not resumes:
+            return np.empty(0, dtype=np.float32)
+
+        keys = [content_hash(resume) for resume in resumes]
+        rows = self.cache.lookup(keys)
+
+        missing: Dict[str, str] = {}
+        for key, row, resume in zip(keys, rows, resumes):
+            if row is None and key not in missing:
+                missing[key] = resume
+        if missing:
+            new_rows = self.cache.append(
+                list(missing), self.embed(list(missing.values()), self.dim)
+            )
+            assigned = dict(zip(missing, new_rows))
+            rows = [assigned[key] if row is None else row for key, row in zip(keys, rows)]
+
+        query_vector = self.embed([query], self.dim)[0]
+        return self.cache.matrix()[np.asarray(rows)] @ query_vector
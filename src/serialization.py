@@ -0,0 +1,154 @@
+"""Response encoding: compact JSON and, optionally, MessagePack.
+
+Agent results are already plain data (or slotted ``Record`` dataclasses), so
+they are encoded directly, without a validation pass over every value.
+orjson is used when installed, falling back to the standard library; the
+MessagePack format is only offered when ``msgpack`` is installed.
+"""
+
+import dataclasses
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Media types clients use for MessagePack
+_MSGPACK_ALIASES = frozenset(
+    (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+)
+
+_JSON_RANGES = frozenset((JSON_MEDIA_TYPE, "application/*", "*/*"))
+
+
+class Record(Mapping):
+    """
+    Read-only dict access for slotted result dataclasses.
+
+    Subclasses are ``@dataclass(slots=True, eq=False)``: they cost a fraction
+    of a dict per instance and are encoded field by field, while code written
+    against dict results (``record["net"]``, ``{**record}``, ``==`` with a
+    dict) keeps working.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields as a plain dict."""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+
+def to_builtins(value: Any) -> Any:
+    """
+    Encoder fallback for values JSON and MessagePack do not cover natively.
+
+    Raises:
+        TypeError: If the value has no plain-data form
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any) -> bytes:
+        """Compact JSON."""
+        return orjson.dumps(value, default=to_builtins, option=_ORJSON_OPTIONS)
+
+    def dumps_pretty(value: Any) -> str:
+        """JSON indented by two spaces, for terminals."""
+        options = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=to_builtins, option=options).decode()
+else:  # pragma: no cover - depends on the environment
+    def dumps(value: Any) -> bytes:
+        """Compact JSON."""
+        return json.dumps(
+            value, default=to_builtins, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+    def dumps_pretty(value: Any) -> str:
+        """JSON indented by two spaces, for terminals."""
+        return json.dumps(value, default=to_builtins, indent=2)
+
+
+def packb(value: Any) -> bytes:
+    """
+    MessagePack.
+
+    Raises:
+        RuntimeError: If msgpack is not installed
+    """
+    if msgpack is None:
+        raise RuntimeError("MessagePack support requires the msgpack package")
+    return msgpack.packb(value, default=to_builtins, use_bin_type=True)
+
+
+def encode(value: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Encode a value in a media type returned by negotiate()."""
+    return packb(value) if media_type == MSGPACK_MEDIA_TYPE else dumps(value)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Response media type for an Accept header: MessagePack when the client
+    prefers it (and msgpack is installed), JSON otherwise.
+
+    An explicit MessagePack type wins over wildcards of the same quality.
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+    json_q = msgpack_q = 0.0
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in _MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in _JSON_RANGES:
+            json_q = max(json_q, q)
+    return MSGPACK_MEDIA_TYPE if msgpack_q > 0 and msgpack_q >= json_q else JSON_MEDIA_TYPE
@@ -0,0 +1,73 @@
+"""Asyncio concurrency helpers."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable
+
+
+_worker_loops = threading.local()
+
+
+def run_on_worker_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on this thread's long-lived event loop.
+
+    For worker threads and processes that run one task after another:
+    unlike asyncio.run(), the loop is kept between tasks, so loop-bound
+    resources a task leaves behind (HTTP connection pools, locks) are still
+    usable by the next one.
+    """
+    loop = getattr(_worker_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _worker_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers that arrive while
+    it is in flight await the same result (or exception) instead of
+    running it again. Once it finishes the key is released.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for key unless a call for key is already in flight.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine function
+
+        Returns:
+            fn's result, shared by every coalesced caller
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            # shield: one waiter being cancelled must not cancel the rest
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
@@ -0,0 +1,49 @@
+"""Local text embeddings that need no model download or network access."""
+
+import re
+import zlib
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+# Maps a batch of texts to an (n, dim) float32 matrix of unit-length rows
+EmbeddingFunction = Callable[[Sequence[str], int], np.ndarray]
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[+#.][a-z0-9+#]*)?")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens, keeping names like c++, c# and node.js intact."""
+    return _TOKEN.findall(text.lower())
+
+
+def hashing_embedding(texts: Sequence[str], dim: int = 256) -> np.ndarray:
+    """
+    Embed texts with the hashing trick over unigrams and bigrams.
+
+    Each token is hashed (CRC32, stable across processes) into one of dim
+    buckets with a hash-derived sign. Rows are L2-normalized so a dot product
+    is cosine similarity.
+
+    Args:
+        texts: Texts to embed
+        dim: Embedding dimension
+
+    Returns:
+        float32 matrix of shape (len(texts), dim)
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features)
+        )
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(matrix[row], hashes % dim, signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
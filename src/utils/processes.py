@@ -0,0 +1,217 @@
+"""Process pool for CPU-bound work, with shared-memory transfer of NumPy arrays."""
+
+import asyncio
+import dataclasses
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .concurrency import run_on_worker_loop
+
+
+Blocks = List[shared_memory.SharedMemory]
+
+
+def in_worker() -> bool:
+    """Whether this is a child process (pool worker, job worker, ...)."""
+    return multiprocessing.parent_process() is not None
+
+
+@dataclass(frozen=True, slots=True)
+class SharedArray:
+    """Picklable handle to an array placed in a shared memory block."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def share_arrays(value: Any, min_bytes: int, blocks: Blocks) -> Any:
+    """
+    Copy arrays of at least min_bytes into shared memory, replacing them with handles.
+
+    Walks dicts, lists, tuples and dataclass instances; everything else is
+    left to pickle. New blocks are appended to ``blocks`` so the caller can
+    release them.
+    """
+    if isinstance(value, np.ndarray):
+        if value.nbytes < max(min_bytes, 1) or value.dtype.hasobject:
+            return value
+        block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        blocks.append(block)
+        np.ndarray(value.shape, value.dtype, buffer=block.buf)[...] = value
+        return SharedArray(block.name, value.shape, value.dtype.str)
+    if isinstance(value, dict):
+        return {key: share_arrays(item, min_bytes, blocks) for key, item in value.items()}
+    if isinstance(value, list):
+        return [share_arrays(item, min_bytes, blocks) for item in value]
+    if isinstance(value, tuple):
+        return tuple(share_arrays(item, min_bytes, blocks) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _rebuild(value, lambda item: share_arrays(item, min_bytes, blocks))
+    return value
+
+
+def _rebuild(instance: Any, convert: Callable[[Any], Any]) -> Any:
+    """A copy of a dataclass instance with convert applied to each init field."""
+    return type(instance)(**{
+        f.name: convert(getattr(instance, f.name)) for f in dataclasses.fields(instance) if f.init
+    })
+
+
+def attach_arrays(value: Any, blocks: Blocks) -> Any:
+    """Replace SharedArray handles with arrays viewing their blocks, without copying."""
+    if isinstance(value, SharedArray):
+        block = shared_memory.SharedMemory(name=value.name)
+        blocks.append(block)
+        return np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf)
+    if isinstance(value, dict):
+        return {key: attach_arrays(item, blocks) for key, item in value.items()}
+    if isinstance(value, list):
+        return [attach_arrays(item, blocks) for item in value]
+    if isinstance(value, tuple):
+        return tuple(attach_arrays(item, blocks) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _rebuild(value, lambda item: attach_arrays(item, blocks))
+    return value
+
+
+def release(blocks: Blocks, unlink: bool = False) -> None:
+    """Close (and optionally unlink) shared memory blocks."""
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # An array still views the block; the mapping goes with the process
+            pass
+        if unlink:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _call(fn: Callable[..., Any], args: Tuple[Any, ...], min_bytes: int) -> Any:
+    """Worker side: view shared arguments, run fn, share the result's arrays."""
+    inputs: Blocks = []
+    outputs: Blocks = []
+    try:
+        result = fn(*attach_arrays(args, inputs))
+        if asyncio.iscoroutine(result):
+            result = run_on_worker_loop(result)
+        return share_arrays(result, min_bytes, outputs)
+    except BaseException:
+        release(outputs, unlink=True)
+        raise
+    finally:
+        # The parent unlinks argument blocks, and result blocks once collected
+        release(inputs)
+        release(outputs)
+
+
+class ProcessPool:
+    """
+    Runs functions in worker processes, keeping the event loop free.
+
+    Arguments and results are pickled, except NumPy arrays of at least
+    ``min_shared_bytes``, which travel through shared memory: workers view
+    argument arrays in place, and result arrays come back as views of
+    blocks that are freed when the array is garbage collected.
+
+    Until start() is called, and inside any child process, run() calls the
+    function inline, so pools are never nested.
+    """
+
+    def __init__(self):
+        self.workers = 0
+        self.min_shared_bytes = 1 << 16
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether work is sent to worker processes."""
+        # A forked child inherits the executor, but must not use it
+        return self._executor is not None and not in_worker()
+
+    @property
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        The worker processes, for plain submit() calls that need no shared
+        memory (e.g. a stream of small chunks); None until started.
+        """
+        return self._executor if self.started else None
+
+    def start(self, workers: int, min_shared_bytes: Optional[int] = None) -> None:
+        """
+        Start the worker processes; workers < 1 keeps running work inline.
+
+        Args:
+            workers: Worker processes
+            min_shared_bytes: Smallest array sent through shared memory
+        """
+        if self.started or workers < 1 or in_worker():
+            return
+        if min_shared_bytes is not None:
+            self.min_shared_bytes = min_shared_bytes
+        # Workers must report blocks to this process's tracker, not their own,
+        # or a worker exiting would unlink results still in use here
+        resource_tracker.ensure_running()
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def stop(self) -> None:
+        """Shut the workers down; running calls are abandoned."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Call fn(*args) in a worker process and await its result.
+
+        fn must be picklable, i.e. defined at module level or a method of a
+        module-level class. A coroutine function runs to completion on the
+        worker's own event loop.
+        """
+        if not self.started:
+            result = fn(*args)
+            return await result if asyncio.iscoroutine(result) else result
+
+        blocks: Blocks = []
+        try:
+            shared_args = share_arrays(args, self.min_shared_bytes, blocks)
+            future = self._executor.submit(_call, fn, shared_args, self.min_shared_bytes)
+            shared_result = await asyncio.wrap_future(future)
+        finally:
+            release(blocks, unlink=True)
+
+        result_blocks: Blocks = []
+        result = attach_arrays(shared_result, result_blocks)
+        for array, block in zip(_shared_arrays(result, shared_result), result_blocks):
+            weakref.finalize(array, release, [block], True)
+        return result
+
+
+def _shared_arrays(value: Any, shared: Any):
+    """Arrays in value that came from SharedArray handles, in attach order."""
+    if isinstance(shared, SharedArray):
+        yield value
+    elif isinstance(shared, dict):
+        for key, item in shared.items():
+            yield from _shared_arrays(value[key], item)
+    elif isinstance(shared, (list, tuple)):
+        for item, shared_item in zip(value, shared):
+            yield from _shared_arrays(item, shared_item)
+    elif dataclasses.is_dataclass(shared) and not isinstance(shared, type):
+        for f in dataclasses.fields(shared):
+            if f.init:
+                yield from _shared_arrays(getattr(value, f.name), getattr(shared, f.name))
+
+
+# Shared by cpu_bound agents; started by the API, so work runs inline elsewhere
+cpu_pool = ProcessPool()
@@ -0,0 +1,59 @@
+"""Token-bucket rate limiting."""
+
+import asyncio
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate tokens per second, holding at
+    most capacity tokens.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping tokens accrued so far."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._refill()
+        self.rate = rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available without waiting."""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        """Seconds until tokens could be acquired."""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until tokens are available, then take them."""
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket holds")
+        while not self.try_acquire(tokens):
+            await asyncio.sleep(self.time_until_available(tokens))
@@ -0,0 +1,26 @@
+"""Workflow engine: chain agent tasks into resumable DAGs."""
+
+from .engine import (
+    CheckpointStore,
+    RunInProgressError,
+    StepState,
+    Workflow,
+    WorkflowEngine,
+    WorkflowRun,
+    WorkflowStep,
+    workflow_engine,
+)
+from .templates import WORKFLOW_TEMPLATES, hire_workflow
+
+__all__ = [
+    "CheckpointStore",
+    "RunInProgressError",
+    "StepState",
+    "Workflow",
+    "WorkflowEngine",
+    "WorkflowRun",
+    "WorkflowStep",
+    "workflow_engine",
+    "WORKFLOW_TEMPLATES",
+    "hire_workflow",
+]
@@ -0,0 +1,450 @@
+"""Workflow engine: DAGs of agent tasks with checkpointed, resumable runs."""
+
+import asyncio
+import fcntl
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..agents import registry as default_registry
+from ..agents.registry import AgentRegistry
+from ..config import settings
+from ..serialization import to_builtins
+
+
+STEP_PENDING = "pending"
+STEP_RUNNING = "running"
+STEP_SUCCEEDED = "succeeded"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+
+RUN_RUNNING = "running"
+RUN_SUCCEEDED = "succeeded"
+RUN_FAILED = "failed"
+
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Called after each successful step with the step, its resolved parameters
+# and its result
+StepCallback = Callable[["WorkflowStep", Dict[str, Any], Dict[str, Any]], None]
+
+
+@dataclass
+class WorkflowStep:
+    """
+    One agent task in a workflow.
+
+    ``inputs`` maps parameter names to references into earlier results,
+    written ``"<step id>.<key>.<key>..."``; list items are addressed by
+    index (``"recruit.candidates.0.candidate_id"``). Referenced steps are
+    implicit dependencies.
+    """
+
+    id: str
+    task_type: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    inputs: Dict[str, str] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def dependencies(self) -> List[str]:
+        """Explicit and input-implied dependencies, deduplicated in order."""
+        implied = (reference.split(".", 1)[0] for reference in self.inputs.values())
+        return list(dict.fromkeys([*self.depends_on, *implied]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "task_type": self.task_type,
+            "parameters": self.parameters,
+            "inputs": self.inputs,
+            "depends_on": self.depends_on,
+        }
+
+
+class Workflow:
+    """A validated DAG of workflow steps."""
+
+    def __init__(self, steps: List[WorkflowStep], name: str = "workflow"):
+        self.name = name
+        self.steps = {}
+        for step in steps:
+            if step.id in self.steps:
+                raise ValueError(f"Duplicate workflow step: {step.id}")
+            self.steps[step.id] = step
+        for step in steps:
+            for dependency in step.dependencies:
+                if dependency not in self.steps:
+                    raise ValueError(f"Step {step.id} depends on unknown step: {dependency}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        """Kahn's algorithm; any step left unvisited sits on a cycle."""
+        remaining = {step_id: len(step.dependencies) for step_id, step in self.steps.items()}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in self.steps}
+        for step in self.steps.values():
+            for dependency in step.dependencies:
+                dependents[dependency].append(step.id)
+        ready = [step_id for step_id, count in remaining.items() if not count]
+        visited = 0
+        while ready:
+            visited += 1
+            for dependent in dependents[ready.pop()]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ready.append(dependent)
+        if visited != len(self.steps):
+            raise ValueError("Workflow steps contain a dependency cycle")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Workflow":
+        """Build from ``{"name": ..., "steps": [{"id", "task_type", ...}]}``."""
+        steps = []
+        for raw in data.get("steps", []):
+            if "id" not in raw or "task_type" not in raw:
+                raise ValueError("Workflow steps need an id and a task_type")
+            steps.append(WorkflowStep(
+                id=raw["id"],
+                task_type=raw["task_type"].lower(),
+                parameters=dict(raw.get("parameters", {})),
+                inputs=dict(raw.get("inputs", {})),
+                depends_on=list(raw.get("depends_on", [])),
+            ))
+        if not steps:
+            raise ValueError("A workflow needs at least one step")
+        return cls(steps, name=data.get("name", "workflow"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "steps": [step.to_dict() for step in self.steps.values()]}
+
+
+@dataclass(slots=True)
+class StepState:
+    """Progress of one step within a run."""
+
+    status: str = STEP_PENDING
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms,
+        }
+
+
+@dataclass
+class WorkflowRun:
+    """A workflow execution and the state of each of its steps."""
+
+    run_id: str
+    workflow: Workflow
+    status: str = RUN_RUNNING
+    steps: Dict[str, StepState] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: Optional[str] = None
+    duration_ms: Optional[float] = None
+    tenant_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "workflow": self.workflow.to_dict(),
+            "status": self.status,
+            "steps": {step_id: state.to_dict() for step_id, state in self.steps.items()},
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "duration_ms": self.duration_ms,
+            "tenant_id": self.tenant_id,
+        }
+
+    def unfinished_steps(self) -> List[WorkflowStep]:
+        """Steps that have not succeeded, i.e. those a resume runs."""
+        return [
+            step for step_id, step in self.workflow.steps.items()
+            if self.steps[step_id].status != STEP_SUCCEEDED
+        ]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowRun":
+        return cls(
+            run_id=data["run_id"],
+            workflow=Workflow.from_dict(data["workflow"]),
+            status=data["status"],
+            steps={step_id: StepState(**state) for step_id, state in data["steps"].items()},
+            created_at=data["created_at"],
+            updated_at=data.get("updated_at"),
+            duration_ms=data.get("duration_ms"),
+            tenant_id=data.get("tenant_id"),
+        )
+
+
+class RunInProgressError(ValueError):
+    """The workflow run is already being executed, by this or another process."""
+
+
+class CheckpointStore:
+    """
+    One JSON file per tenant and run, replaced atomically on every save.
+
+    Runs without a tenant are stored under the default tenant.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.workflow_checkpoint_dir
+
+    def _path(self, tenant_id: Optional[str], run_id: str) -> str:
+        tenant_id = tenant_id or settings.default_tenant
+        if not _RUN_ID.match(tenant_id):
+            raise ValueError(f"Invalid tenant: {tenant_id}")
+        if not _RUN_ID.match(run_id):
+            raise ValueError(f"Invalid workflow run id: {run_id}")
+        return os.path.join(self.directory, tenant_id, f"{run_id}.json")
+
+    @contextmanager
+    def claim(self, tenant_id: Optional[str], run_id: str) -> Iterator[None]:
+        """
+        Exclusive claim on a run while it executes, across threads and processes.
+
+        Raises:
+            RunInProgressError: If the run is already claimed
+        """
+        path = self._path(tenant_id, run_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RunInProgressError(f"Workflow run is already running: {run_id}") from None
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def save(self, snapshot: Dict[str, Any]) -> None:
+        """Write a run snapshot; a crash mid-write leaves the previous one intact."""
+        path = self._path(snapshot.get("tenant_id"), snapshot["run_id"])
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(
+            dir=directory, prefix=f".{snapshot['run_id']}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=to_builtins)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def load(self, tenant_id: Optional[str], run_id: str) -> Optional[Dict[str, Any]]:
+        """Latest snapshot of a tenant's run, or None if it was never checkpointed."""
+        try:
+            with open(self._path(tenant_id, run_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+def resolve_reference(results: Dict[str, Dict[str, Any]], reference: str) -> Any:
+    """Look up ``"<step id>.<key>..."`` in completed step results."""
+    step_id, *path = reference.split(".")
+    value: Any = results[step_id]
+    for key in path:
+        try:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Unresolved workflow input: {reference}") from None
+    return value
+
+
+class WorkflowEngine:
+    """
+    Executes workflows over the agent registry.
+
+    A step starts as soon as all of its dependencies have succeeded, so
+    independent branches run concurrently and a run takes as long as its
+    critical path. After every step the run is checkpointed; resuming a run
+    skips steps that already succeeded and reuses their results. When a step
+    fails, steps that depend on it are skipped while unrelated branches
+    carry on. A run is claimed while it executes, so it is never started or
+    resumed twice at once.
+    """
+
+    def __init__(
+        self,
+        agent_registry: Optional[AgentRegistry] = None,
+        checkpoints: Optional[CheckpointStore] = None
+    ):
+        self.registry = agent_registry or default_registry
+        self.checkpoints = checkpoints or CheckpointStore()
+
+    async def start(
+        self,
+        workflow: Workflow,
+        run_id: Optional[str] = None,
+        on_step_complete: Optional[StepCallback] = None,
+        tenant_id: Optional[str] = None
+    ) -> WorkflowRun:
+        """
+        Run a workflow from the beginning.
+
+        Args:
+            workflow: Workflow to run
+            run_id: Run ID (generated if omitted); must not already exist
+            on_step_complete: Called after each successful step
+            tenant_id: Tenant the run belongs to; every step runs for it,
+                overriding any tenant_id in step parameters or inputs
+
+        Returns:
+            The finished run
+
+        Raises:
+            ValueError: If the run already exists
+            RunInProgressError: If the run is being started elsewhere
+        """
+        run_id = run_id or uuid.uuid4().hex
+        with self.checkpoints.claim(tenant_id, run_id):
+            if await asyncio.to_thread(self.checkpoints.load, tenant_id, run_id) is not None:
+                raise ValueError(f"Workflow run already exists: {run_id}")
+            steps = {step_id: StepState() for step_id in workflow.steps}
+            run = WorkflowRun(run_id, workflow, steps=steps, tenant_id=tenant_id)
+            return await self._run(run, on_step_complete)
+
+    async def resume(
+        self,
+        run_id: str,
+        on_step_complete: Optional[StepCallback] = None,
+        tenant_id: Optional[str] = None
+    ) -> WorkflowRun:
+        """
+        Continue a checkpointed run, re-running only steps that did not succeed.
+
+        Args:
+            run_id: Run to resume
+            on_step_complete: Called after each successful step
+            tenant_id: Tenant resuming the run; must be the tenant it was started for
+
+        Raises:
+            KeyError: If no checkpoint exists for run_id, or it belongs to
+                another tenant
+            RunInProgressError: If the run is still executing, e.g. another
+                resume of it
+        """
+        with self.checkpoints.claim(tenant_id, run_id):
+            # Read under the claim, so steps an earlier resume finished are not rerun
+            snapshot = await self.get(run_id, tenant_id)
+            if snapshot is None:
+                raise KeyError(run_id)
+            return await self._run(WorkflowRun.from_dict(snapshot), on_step_complete)
+
+    async def get(self, run_id: str, tenant_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Latest checkpoint of a run, or None if there is none for tenant_id."""
+        snapshot = await asyncio.to_thread(self.checkpoints.load, tenant_id, run_id)
+        if snapshot is None or snapshot.get("tenant_id") != tenant_id:
+            return None
+        return snapshot
+
+    async def _run(self, run: WorkflowRun, on_step_complete: Optional[StepCallback]) -> WorkflowRun:
+        started = time.perf_counter()
+        run.status = RUN_RUNNING
+        steps = run.workflow.steps
+        results = {
+            step_id: state.result
+            for step_id, state in run.steps.items() if state.status == STEP_SUCCEEDED
+        }
+        # Unmet dependencies of every step still to run
+        waiting = {
+            step_id: {d for d in step.dependencies if d not in results}
+            for step_id, step in steps.items() if step_id not in results
+        }
+        for step_id in waiting:
+            run.steps[step_id] = StepState()
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch_ready() -> None:
+            for step_id in [s for s, unmet in waiting.items() if not unmet]:
+                del waiting[step_id]
+                task = asyncio.create_task(
+                    self._execute(run, steps[step_id], results, on_step_complete)
+                )
+                running[task] = step_id
+
+        await self._checkpoint(run)
+        launch_ready()
+        try:
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    step_id = running.pop(task)
+                    if run.steps[step_id].status == STEP_SUCCEEDED:
+                        for unmet in waiting.values():
+                            unmet.discard(step_id)
+                await self._checkpoint(run)
+                launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+
+        # Whatever is still waiting depends on a failed step
+        for step_id in waiting:
+            run.steps[step_id].status = STEP_SKIPPED
+        failed = any(state.status != STEP_SUCCEEDED for state in run.steps.values())
+        run.status = RUN_FAILED if failed else RUN_SUCCEEDED
+        run.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        await self._checkpoint(run)
+        return run
+
+    async def _execute(
+        self,
+        run: WorkflowRun,
+        step: WorkflowStep,
+        results: Dict[str, Dict[str, Any]],
+        on_step_complete: Optional[StepCallback]
+    ) -> None:
+        """Run one step, recording its outcome on the run."""
+        state = run.steps[step.id]
+        state.status = STEP_RUNNING
+        state.started_at = datetime.utcnow().isoformat()
+        started = time.perf_counter()
+        try:
+            parameters = dict(step.parameters)
+            for name, reference in step.inputs.items():
+                parameters[name] = resolve_reference(results, reference)
+            # Applied last, so neither parameters nor inputs can pick a tenant
+            if run.tenant_id is not None:
+                parameters["tenant_id"] = run.tenant_id
+            result = await self.registry.execute(step.task_type, parameters)
+        except Exception as e:
+            state.status = STEP_FAILED
+            state.error = str(e)
+        else:
+            state.status = STEP_SUCCEEDED
+            state.result = results[step.id] = result
+            if on_step_complete is not None:
+                on_step_complete(step, parameters, result)
+        finally:
+            state.finished_at = datetime.utcnow().isoformat()
+            state.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    async def _checkpoint(self, run: WorkflowRun) -> None:
+        run.updated_at = datetime.utcnow().isoformat()
+        # Snapshot on the event loop so the file matches a consistent state
+        await asyncio.to_thread(self.checkpoints.save, run.to_dict())
+
+
+workflow_engine = WorkflowEngine()
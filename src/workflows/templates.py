@@ -0,0 +1,61 @@
+"""Built-in workflow templates."""
+
+from typing import Any, Callable, Dict
+
+from .engine import Workflow, WorkflowStep
+
+
+def hire_workflow(parameters: Dict[str, Any]) -> Workflow:
+    """
+    Recruit a candidate, onboard them, then enroll them in benefits.
+
+    Onboarding creates the hire's employee record (at the candidate's
+    expected salary), and enrollment checks eligibility against that
+    record, so it runs once onboarding has finished.
+
+    Args:
+        parameters: Recruiting task parameters (job_title, requirements,
+            budget, location, candidates, ...) plus start_date, department,
+            role, employment_type (default full_time), hours_per_week
+            (default 40) and benefits plan for the hire
+    """
+    hire_keys = (
+        "start_date", "department", "role", "employment_type", "hours_per_week", "plan"
+    )
+    recruiting = {key: value for key, value in parameters.items() if key not in hire_keys}
+    recruiting["top_k"] = 1
+    return Workflow(
+        [
+            WorkflowStep("recruit", "recruiting", parameters=recruiting),
+            WorkflowStep(
+                "onboard",
+                "onboarding",
+                parameters={
+                    "start_date": parameters.get("start_date"),
+                    "department": parameters.get("department"),
+                    "role": parameters.get("role", parameters.get("job_title")),
+                    "employment_type": parameters.get("employment_type", "full_time"),
+                    "hours_per_week": parameters.get("hours_per_week", 40),
+                    "create_employee": True,
+                },
+                inputs={
+                    "employee_id": "recruit.candidates.0.candidate_id",
+                    "employee_name": "recruit.candidates.0.name",
+                    "annual_salary": "recruit.candidates.0.salary",
+                },
+            ),
+            WorkflowStep(
+                "enroll_benefits",
+                "benefits",
+                parameters={"action": "enroll", "plan": parameters.get("plan")},
+                inputs={"employee_id": "recruit.candidates.0.candidate_id"},
+                depends_on=["onboard"],
+            ),
+        ],
+        name="hire",
+    )
+
+
+WORKFLOW_TEMPLATES: Dict[str, Callable[[Dict[str, Any]], Workflow]] = {
+    "hire": hire_workflow,
+}
@@ -0,0 +1,27 @@
+"""Keep every file and database the tests write out of the working tree."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Set before src is imported: module-level stores (employee and candidate
+# repositories, billing ledger, workflow checkpoints, ...) are created at
+# import time and keep the paths they were given
+_DATA_DIR = tempfile.mkdtemp(prefix="agenthr-tests-")
+os.environ["DATA_DIR"] = _DATA_DIR
+
+from src.config import Settings, settings  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Settings whose files and SQLite databases default to the test's tmp_path."""
+    directory = tmp_path / "data"
+    monkeypatch.setattr(settings, "_settings", Settings(data_dir=str(directory)))
+    return directory
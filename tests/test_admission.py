@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.admission import AdmissionController, AdmissionRejected
+from src.jobs import JobQueue
+from src.metrics import MetricsRegistry
+
+ACTIVE = ("queued", "running")
+
+
+def test_buckets_and_in_flight_limit() -> None:
+    now = [0.0]
+    controller = AdmissionController(
+        max_in_flight=3, tenant_rate=1, tenant_burst=2, task_rates={"payroll": 1},
+        burst_seconds=10, stats=MetricsRegistry(), clock=lambda: now[0]
+    )
+    controller.admit("acme", "payroll")
+    controller.admit("acme", "payroll")
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit("acme", "payroll")
+    assert rejected.value.reason == "tenant"
+    assert rejected.value.retry_after_header == "1"
+
+    # Another tenant is unaffected until the global cap
+    controller.admit("globex", "benefits")
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit("globex", "benefits")
+    assert rejected.value.reason == "in_flight"
+    controller.release()
+    controller.admit("globex", "benefits")
+    assert controller.stats()["rejected"] == {"tenant": 1, "in_flight": 1}
+
+
+def test_requests_count_every_task_in_flight() -> None:
+    controller = AdmissionController(
+        max_in_flight=10, tenant_rate=1, tenant_burst=5, task_rates={"payroll": 1}
+    )
+    # One token per bucket, however many tasks
+    controller.admit("acme", "payroll", "benefits", tasks=8)
+    assert controller.in_flight == 8
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit("acme", "benefits", tasks=3)
+    assert rejected.value.reason == "in_flight"
+    controller.release(8)
+    # Even when idle, no request may hold more than the limit
+    with pytest.raises(ValueError):
+        controller.admit("acme", "benefits", tasks=11)
+    controller.admit("acme", "benefits", tasks=10)
+    assert controller.in_flight == 10
+
+
+def test_task_rate_adapts_to_p95() -> None:
+    now = [0.0]
+    stats = MetricsRegistry()
+    controller = AdmissionController(
+        task_rates={"payroll": 10}, target_p95={"payroll": 1.0},
+        adapt_interval=5, stats=stats, clock=lambda: now[0]
+    )
+    for _ in range(50):
+        stats.stats("payroll_agent", "payroll").latency.observe(3.0)
+    controller.adapt()
+    assert controller.stats()["task_rates"]["payroll"] == 7.0
+
+    # Fast tasks in the next window let the rate recover
+    for _ in range(50):
+        stats.stats("payroll_agent", "payroll").latency.observe(0.1)
+    now[0] = 5.0
+    controller.admit("acme", "payroll")
+    assert controller.stats()["task_rates"]["payroll"] == 8.0
+
+
+def test_execute_returns_429_with_retry_after(monkeypatch) -> None:
+    monkeypatch.setattr(main, "admission", AdmissionController(tenant_rate=1, tenant_burst=1))
+    client = TestClient(main.app)
+    request = {"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}}
+    headers = {"X-Tenant-ID": "storm"}
+
+    assert client.post("/api/v1/tasks/execute", json=request, headers=headers).status_code == 200
+    response = client.post("/api/v1/tasks/execute", json=request, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert main.admission.in_flight == 0
+
+
+def test_batches_and_jobs_are_admitted(monkeypatch) -> None:
+    monkeypatch.setattr(main, "admission", AdmissionController(tenant_rate=1, tenant_burst=1))
+    monkeypatch.setattr(main, "job_queue", JobQueue(backend="thread", workers=1))
+    task = {"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}}
+
+    def post(client, url, body, tenant):
+        return client.post(url, json=body, headers={"X-Tenant-ID": tenant})
+
+    with TestClient(main.app) as client:
+        batch = {"tasks": [task] * 3}
+        assert post(client, "/api/v1/tasks/batch", batch, "a").status_code == 200
+        assert post(client, "/api/v1/tasks/batch", batch, "a").status_code == 429
+        assert len(post(client, "/api/v1/tasks/batch/stream", batch, "b").text.splitlines()) == 3
+        assert post(client, "/api/v1/jobs", task, "b").status_code == 429
+
+        job = post(client, "/api/v1/jobs", task, "c").json()
+        url = f"/api/v1/jobs/{job['job_id']}"
+        while client.get(url, headers={"X-Tenant-ID": "c"}).json()["status"] in ACTIVE:
+            time.sleep(0.01)
+        assert main.admission.in_flight == 0
+
+
+def test_batch_larger_than_the_limit_runs_within_it(monkeypatch) -> None:
+    controller = AdmissionController(max_in_flight=4, tenant_rate=10, tenant_burst=10)
+    monkeypatch.setattr(main, "admission", controller)
+    peak = []
+    execute = main.registry.execute
+
+    async def tracked(task_type, parameters):
+        peak.append(controller.in_flight)
+        return await execute(task_type, parameters)
+
+    monkeypatch.setattr(main.registry, "execute", tracked)
+    task = {"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}}
+    client = TestClient(main.app)
+
+    response = client.post("/api/v1/tasks/batch", json={"tasks": [task] * 10})
+    assert response.status_code == 200 and response.json()["succeeded"] == 10
+    assert max(peak) == 4 and controller.in_flight == 0
+    # A workflow needs a slot per step, so one wider than the limit cannot run
+    steps = [{"id": f"s{i}", **task} for i in range(5)]
+    assert client.post("/api/v1/workflows", json={"steps": steps}).status_code == 413
+
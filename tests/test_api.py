@@ -0,0 +1,68 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+
+
+client = TestClient(app)
+
+
+def test_execute_task_unknown_type() -> None:
+    response = client.post("/api/v1/tasks/execute", json={"task_type": "nope", "parameters": {}})
+    assert response.status_code == 400
+
+
+def test_batch_reports_per_item_results() -> None:
+    response = client.post("/api/v1/tasks/batch", json={
+        "tasks": [
+            {"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}},
+            {"task_type": "benefits", "parameters": {}},
+            {"task_type": "nope", "parameters": {}},
+        ],
+        "max_concurrency": 2
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "partial"
+    assert (body["succeeded"], body["failed"]) == (1, 2)
+    assert [item["status"] for item in body["results"]] == ["success", "error", "error"]
+    assert body["total_pricing"] == body["results"][0]["pricing"]
+
+
+def test_stream_payroll_as_ndjson() -> None:
+    employees = {"employee_id": [f"e{i}" for i in range(3)], "annual_salary": [60000] * 3}
+    response = client.post("/api/v1/tasks/stream", json={
+        "task_type": "payroll",
+        "parameters": {"period": "monthly", "employees": employees}
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["record"] for r in records] == ["pay_stub"] * 3 + ["summary"]
+    assert records[-1]["total_amount"] == 15000.0
+
+
+def test_stream_batch_yields_every_item() -> None:
+    response = client.post("/api/v1/tasks/batch/stream", json={
+        "tasks": [
+            {"task_type": "benefits", "parameters": {"employee_id": f"e{i}"}} for i in range(5)
+        ]
+    })
+    indexes = sorted(json.loads(line)["index"] for line in response.text.splitlines())
+    assert indexes == list(range(5))
+
+
+def test_idempotency_key_replays_response() -> None:
+    hire = {"employee_id": "e-idem", "employee_name": "Ada", "start_date": "2025-01-06"}
+    request = {"task_type": "onboarding", "parameters": hire}
+    headers = {"Idempotency-Key": "hire-e-idem", "X-Tenant-ID": "idem-test"}
+    first = client.post("/api/v1/tasks/execute", json=request, headers=headers)
+    retry = client.post("/api/v1/tasks/execute", json=request, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    changed = {"task_type": "onboarding", "parameters": {**hire, "employee_id": "e-other"}}
+    assert client.post("/api/v1/tasks/execute", json=changed, headers=headers).status_code == 422
@@ -0,0 +1,26 @@
+import asyncio
+
+from benchmarks.harness import compare, measure
+
+
+def test_measure_reports_percentiles() -> None:
+    async def request():
+        await asyncio.sleep(0)
+
+    result = asyncio.run(measure(request, requests=40, concurrency=4, warmup=1))
+    assert result["requests"] == 40 and result["concurrency"] == 4
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    baseline = {
+        "fast": {"p95_ms": 0.1, "throughput_rps": 1000.0},
+        "slow": {"p95_ms": 10.0, "throughput_rps": 100.0},
+    }
+    current = {
+        "fast": {"p95_ms": 0.3, "throughput_rps": 950.0},  # within noise floor
+        "slow": {"p95_ms": 13.0, "throughput_rps": 70.0},
+    }
+    regressions = compare(current, baseline, threshold=0.2)
+    assert len(regressions) == 2 and all(r.startswith("slow:") for r in regressions)
+    assert compare(current, baseline, threshold=0.5) == []
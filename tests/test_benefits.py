@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from src.agents import BenefitsAgent, benefits_agent
+from src.benefits import EligibilityIndex, SemanticAnswerCache
+from src.config import settings
+from src.employees import EmployeeRepository
+from src.llm import client
+
+PLANS = [
+    {"plan_id": "ppo", "rules": [
+        {"field": "employment_type", "op": "==", "value": "full_time"},
+        {"field": "hours_per_week", "op": ">=", "value": 30},
+    ]},
+    {"plan_id": "dental", "rules": [
+        {"field": "employment_type", "op": "in", "value": ["full_time", "part_time"]},
+    ]},
+    {"plan_id": "401k", "rules": [{"field": "age", "op": ">=", "value": 21}]},
+]
+
+
+def test_index_updates_incrementally() -> None:
+    index = EligibilityIndex(PLANS)
+    attributes = {"employment_type": "part_time", "hours_per_week": 35, "age": 30}
+    assert index.upsert_employee("e1", attributes) == {"dental", "401k"}
+    plans = index.upsert_employee("e1", {"employment_type": "full_time"})
+    assert plans == {"ppo", "dental", "401k"}
+    assert index.upsert_employee("e1", {"hours_per_week": 20, "age": None}) == {"dental"}
+
+    index.add_plan({"plan_id": "hmo", "rules": [
+        {"field": "hours_per_week", "op": ">=", "value": 20},
+    ]})
+    assert index.eligible_plans("e1") == {"dental", "hmo"}
+    index.remove_plan("dental")
+    assert index.is_eligible("e1", "dental") is False
+    assert index.eligible_plans("unknown") is None
+
+
+def test_agent_enrollment_checks_eligibility(tmp_path, monkeypatch) -> None:
+    repo = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db")
+    monkeypatch.setattr(benefits_agent, "employee_repository", repo)
+    agent = BenefitsAgent()
+
+    async def run(task):
+        return await agent.execute({"tenant_id": "acme", "employee_id": "e9", **task})
+
+    async def scenario():
+        await repo.upsert_many("acme", [{
+            "employee_id": "e9", "employment_type": "part_time", "hours_per_week": 25,
+            "start_date": "2020-01-06", "age": 40,
+        }])
+        # Plans and attributes in a task are not trusted
+        query = await run({
+            "action": "query",
+            "attributes": {"employment_type": "full_time", "hours_per_week": 40},
+            "plans": [{"plan_id": "gold", "rules": []}],
+        })
+        assert query["eligible_plans"] == ["401k", "dental", "medical_hmo"]
+        with pytest.raises(ValueError, match="not eligible"):
+            await run({"action": "enroll", "plan": "medical_ppo"})
+        assert (await run({"action": "enroll", "plan": "dental"}))["processed"]
+
+        await repo.upsert_many("acme", [{"employee_id": "e9", "employment_type": "contractor"}])
+        with pytest.raises(ValueError, match="not eligible"):
+            await run({"action": "enroll", "plan": "dental"})
+        # Another tenant's employee, or no record at all, cannot enroll
+        with pytest.raises(ValueError, match="Unknown employee"):
+            await run({"tenant_id": "globex", "action": "enroll", "plan": "dental"})
+        with pytest.raises(ValueError, match="Unknown employee"):
+            await run({"employee_id": "e10", "action": "enroll", "plan": "dental"})
+
+    asyncio.run(scenario())
+    repo.close()
+
+
+def test_eligibility_is_indexed_until_employees_change(tmp_path, monkeypatch) -> None:
+    url = f"sqlite:///{tmp_path}/employees.db"
+    repo, other_process = EmployeeRepository(database_url=url), EmployeeRepository(database_url=url)
+    monkeypatch.setattr(benefits_agent, "employee_repository", repo)
+    monkeypatch.setattr(settings, "benefits_eligibility_recheck", 3600.0)
+    agent = BenefitsAgent()
+    part_time = {"employee_id": "e1", "employment_type": "part_time", "hours_per_week": 25}
+    reads = []
+    get = repo.get
+
+    async def counting_get(*key):
+        reads.append(key)
+        return await get(*key)
+
+    monkeypatch.setattr(repo, "get", counting_get)
+
+    async def scenario():
+        await repo.upsert_many("acme", [part_time])
+        assert await agent.eligible_plans("acme", "e1") == {"dental", "medical_hmo"}
+        # Indexed: the record is not read again
+        assert await agent.eligible_plans("acme", "e1") == {"dental", "medical_hmo"}
+        assert reads == [("acme", "e1")]
+
+        full_time = {**part_time, "employment_type": "full_time", "hours_per_week": 40}
+        await other_process.upsert_many("acme", [full_time])
+        monkeypatch.setattr(settings, "benefits_eligibility_recheck", 0.0)
+        return await agent.eligible_plans("acme", "e1")
+
+    plans = asyncio.run(scenario())
+    repo.close()
+    other_process.close()
+    # A write from another process is seen once the tenant's version is rechecked
+    assert plans == {"dental", "medical_hmo", "medical_ppo"}
+
+
+def test_answer_cache_serves_near_duplicates_per_plan() -> None:
+    cache = SemanticAnswerCache(maxsize=3)
+    cache.store("What's my deductible?", "$500", scope="ppo")
+    hit = cache.lookup("what is the deductible", scope="ppo")
+    assert hit is not None and hit.answer == "$500" and hit.exact
+    cache.store("What is the out of pocket maximum?", "$3,000", scope="ppo")
+    hit = cache.lookup("what's the maximum out of pocket", scope="ppo")
+    assert hit is not None and hit.answer == "$3,000" and not hit.exact
+    assert cache.lookup("What's my deductible?", scope="hmo") is None
+    assert cache.lookup("How do I add a dependent?", scope="ppo") is None
+
+    cache.store("How do I add a dependent?", "Use the portal", scope="ppo")
+    cache.store("Is vision covered?", "Yes", scope="hmo")
+    assert len(cache) == 3 and cache.lookup("my deductible?", scope="ppo") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_answers_are_cached_per_tenant(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "default_llm_provider", "fake")
+    monkeypatch.setattr(client, "_client", None)
+    monkeypatch.setattr(client, "_clients", {})
+    agent = BenefitsAgent()
+
+    async def ask(tenant_id):
+        return await agent.execute({
+            "employee_id": "e1", "action": "query", "plan": "ppo",
+            "question": "What is my deductible?", "tenant_id": tenant_id,
+        })
+
+    async def scenario():
+        return [await ask(tenant) for tenant in ("acme", "globex", "acme")]
+
+    acme, globex, acme_again = asyncio.run(scenario())
+    assert not acme["answer_cached"]
+    assert not globex["answer_cached"]
+    assert acme_again["answer_cached"]
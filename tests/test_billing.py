@@ -0,0 +1,32 @@
+import asyncio
+from datetime import date, timedelta
+
+from src.billing import BillingLedger
+
+
+def test_flushes_fold_into_daily_rollups(tmp_path) -> None:
+    ledger = BillingLedger(database_url=f"sqlite:///{tmp_path}/billing.db", batch_size=2)
+
+    async def run():
+        await ledger.start()
+        try:
+            ledger.record("acme", "PayrollAgent", "payroll", 0.5, employee_id="e1")
+            ledger.record("acme", "PayrollAgent", "payroll", 0.5, employee_id="e2")
+            ledger.record("other", "PayrollAgent", "payroll", 0.5)
+            assert await ledger.flush() == 3
+            result = {"agent": "BenefitsAgent", "pricing": 0.25}
+            ledger.record_task("acme", "benefits", {"employee_id": "e1"}, result)
+            ledger.record("acme", "PayrollAgent", "payroll", 0.5)
+        finally:
+            await ledger.stop()
+
+    asyncio.run(run())
+    today = date.today()
+    invoice = ledger.invoice("acme", today - timedelta(days=1), today + timedelta(days=1))
+    assert invoice["lines"] == [
+        {"agent": "BenefitsAgent", "task_type": "benefits", "transactions": 1, "amount": 0.25},
+        {"agent": "PayrollAgent", "task_type": "payroll", "transactions": 3, "amount": 1.5},
+    ]
+    assert invoice["total"] == 1.75
+    empty = ledger.invoice("acme", today + timedelta(days=1), today + timedelta(days=2))
+    assert empty["lines"] == []
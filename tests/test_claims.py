@@ -0,0 +1,116 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from src.agents.benefits_agent import BenefitsAgent
+from src.benefits import claims
+from src.benefits import (
+    OversizedSegment,
+    adjudicate,
+    iter_segments,
+    process_claims,
+    process_claims_file,
+)
+from src.config import settings
+from src.utils.processes import ProcessPool
+
+CLAIMS = (
+    "ISA*00*SENDER~GS*HC*20250106~\n"
+    "CLM*c1*e1*ppo*99213*120.00*20250106~\n"
+    "CLM*c2*e2*ppo*99999*80.00*20250106~\n"
+    "CLM*c3*e3*ppo*99283*bad*20250106~\n"
+    "CLM*c4*e1*ppo*99283*1150.00*2025-01-07~\n"
+    "GE*1~IEA*1"
+)
+
+
+def test_segments_split_across_reads() -> None:
+    segments = list(iter_segments(io.StringIO(CLAIMS), read_size=7))
+    assert segments[0] == ("ISA", "00", "SENDER")
+    assert segments[2] == ("CLM", "c1", "e1", "ppo", "99213", "120.00", "20250106")
+    assert segments[-1] == ("IEA", "1")
+
+
+def test_oversized_segments_are_invalid_not_buffered() -> None:
+    stream = io.StringIO("CLM*c1*" + "x" * 100 + "~CLM*c2*e2*ppo*80053*100*20250106~" + "y" * 100)
+    segments = list(iter_segments(stream, read_size=16, max_segment_length=50))
+    assert segments[0] == ("CLM", "c1") and isinstance(segments[0], OversizedSegment)
+    assert segments[1] == ("CLM", "c2", "e2", "ppo", "80053", "100", "20250106")
+    assert isinstance(segments[2], OversizedSegment) and len(segments) == 3
+    assert adjudicate(segments[0]) == {
+        "claim_id": "c1", "status": "invalid", "reason": "segment too long"
+    }
+
+
+@pytest.mark.parametrize("amount", ["nan", "inf", "-inf", "0", "-5"])
+def test_non_finite_or_non_positive_amounts_are_invalid(amount) -> None:
+    outcome = adjudicate(("CLM", "c1", "e1", "ppo", "99213", amount, "20250106"))
+    assert outcome["status"] == "invalid"
+
+
+def test_claims_are_adjudicated_in_order() -> None:
+    output = io.StringIO()
+    report = process_claims(io.StringIO(CLAIMS), output, chunk_size=2)
+    outcomes = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [o["status"] for o in outcomes] == ["approved", "denied", "invalid", "approved"]
+    assert outcomes[0]["plan_pays"] == 95.0
+    assert outcomes[3]["plan_pays"] == 800.0
+    assert (report.claims, report.approved, report.denied, report.invalid) == (4, 2, 1, 1)
+    assert report.plan_paid == 895.0
+
+
+def test_claims_file_across_worker_processes(tmp_path) -> None:
+    path = tmp_path / "claims.edi"
+    path.write_text("".join(f"CLM*c{i}*e{i}*ppo*80053*100*20250106~" for i in range(1000)))
+    report = process_claims_file(str(path), str(tmp_path / "out.ndjson"), workers=2, chunk_size=100)
+    assert report.claims == report.approved == 1000
+    assert round(report.plan_paid, 2) == 90000.0
+    assert len((tmp_path / "out.ndjson").read_text().splitlines()) == 1000
+
+
+def test_agent_reads_claims_only_from_tenant_directory(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "claims_dir", str(tmp_path))
+    (tmp_path / "acme").mkdir()
+    (tmp_path / "acme" / "batch.edi").write_text(CLAIMS)
+    agent = BenefitsAgent()
+
+    def claim(**parameters):
+        task = {"employee_id": "e1", "action": "claim", "tenant_id": "acme", **parameters}
+        return asyncio.run(agent.execute(task))
+
+    result = claim(claims_file="batch.edi")
+    assert result["claims"]["claims"] == 4
+    results_file = tmp_path / result["claims"]["results_file"]
+    assert results_file.parent == tmp_path / "acme" / "results"
+    assert len(results_file.read_text().splitlines()) == 4
+
+    for name in ("/etc/hostname", "../acme/batch.edi", ".hidden"):
+        with pytest.raises(ValueError, match="Invalid claims file name"):
+            claim(claims_file=name)
+    with pytest.raises(ValueError, match="results_file"):
+        claim(claims_file="batch.edi", results_file=str(tmp_path / "victim.txt"))
+
+
+def test_agent_adjudicates_on_the_shared_cpu_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "claims_dir", str(tmp_path))
+    (tmp_path / "acme").mkdir()
+    (tmp_path / "acme" / "batch.edi").write_text(CLAIMS * 50)
+    pool = ProcessPool()
+    monkeypatch.setattr("src.utils.processes.cpu_pool", pool)
+
+    def no_new_pool(*args, **kwargs):
+        raise AssertionError("claims tasks must not start their own process pool")
+
+    monkeypatch.setattr(claims, "ProcessPoolExecutor", no_new_pool)
+    task = {"employee_id": "e1", "action": "claim", "tenant_id": "acme", "claims_file": "batch.edi"}
+
+    async def run():
+        pool.start(2)
+        try:
+            return await BenefitsAgent().execute(task)
+        finally:
+            pool.stop()
+
+    assert asyncio.run(run())["claims"]["claims"] == 200
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from src.cli import cli
+
+# Wall-clock budget for importing the CLI and rendering --help in a fresh
+# interpreter (measured from inside it, so interpreter startup is excluded)
+CLI_HELP_BUDGET_MS = 250
+
+HEAVY_MODULES = [
+    "numpy", "httpx", "pydantic_settings", "sqlalchemy", "fastapi", "src.agents", "src.config"
+]
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+from src.cli import cli
+try:
+    cli(["--help"])
+except SystemExit:
+    pass
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def test_help_stays_within_import_budget() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    assert probe["loaded"] == []
+    assert probe["ms"] < CLI_HELP_BUDGET_MS
+
+
+def test_pricing_command() -> None:
+    result = CliRunner().invoke(cli, ["pricing"])
+    assert result.exit_code == 0
+    assert "Hiring: $" in result.output
@@ -0,0 +1,18 @@
+import os
+
+from src.config import Settings, settings
+
+
+def test_unset_paths_default_into_the_data_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    configured = Settings(data_dir="state", claims_dir="/srv/claims")
+    data_dir = str(tmp_path / "state")
+    assert configured.data_dir == data_dir
+    assert configured.employee_database_url == f"sqlite:///{data_dir}/employees.db"
+    assert configured.workflow_checkpoint_dir == os.path.join(data_dir, "workflows")
+    assert configured.claims_dir == "/srv/claims"
+
+
+def test_tests_write_under_tmp_path(data_dir) -> None:
+    assert settings.billing_database_url == f"sqlite:///{data_dir}/billing.db"
+    assert settings.payroll_snapshot_dir == str(data_dir / "payroll")
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents import payroll_agent
+from src.agents.payroll_agent import PayrollAgent
+from src.api import main
+from src.employees import EmployeeRecord, EmployeeRepository
+from src.jobs import JobQueue
+
+
+def test_read_through_cache_and_tenant_isolation(tmp_path) -> None:
+    repo = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db", cache_size=10)
+
+    async def run():
+        await repo.upsert_many("acme", [
+            {"employee_id": "e1", "name": "Ada", "department": "eng", "annual_salary": 120000,
+             "level": 3},
+            {"employee_id": "e2", "name": "Bo", "department": "eng", "hourly_rate": 40,
+             "hours": 80},
+        ])
+        await repo.upsert_many("other", [{"employee_id": "e1", "name": "Cy"}])
+        repo.clear_cache()
+
+        first = await repo.get_many("acme", ["e1", "e2", "e1", "missing"])
+        again = await repo.get_many("acme", ["e1", "e2"])
+        return first, again, await repo.get("other", "e1")
+
+    first, again, other = asyncio.run(run())
+    repo.close()
+    assert sorted(first) == ["e1", "e2"]
+    assert first["e1"].to_dict() == {
+        "employee_id": "e1", "name": "Ada", "department": "eng", "annual_salary": 120000.0,
+        "hourly_rate": 0.0, "hours": 0.0, "pretax_deductions": 0.0, "posttax_deductions": 0.0,
+        "level": 3,
+    }
+    # Served from the cache: the same objects, with shared interned strings
+    assert again["e1"] is first["e1"]
+    assert first["e1"].department is first["e2"].department
+    assert repo.cache_stats()["hits"] == 2
+    assert other.name == "Cy"
+
+
+def test_record_requires_employee_id() -> None:
+    with pytest.raises(ValueError):
+        EmployeeRecord.from_dict({"name": "Nobody"})
+
+
+def test_payroll_loads_employee_ids_from_repository(tmp_path, monkeypatch) -> None:
+    repo = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db")
+    monkeypatch.setattr(payroll_agent, "employee_repository", repo)
+    agent = PayrollAgent()
+
+    async def run():
+        await repo.upsert_many("acme", [
+            {"employee_id": "e1", "annual_salary": 60000},
+            {"employee_id": "e2", "annual_salary": 120000},
+        ])
+        result = await agent.execute(
+            {"tenant_id": "acme", "employee_ids": ["e2", "e1"], "period": "monthly"}
+        )
+        with pytest.raises(ValueError, match="Unknown employees: e3"):
+            await agent.execute({"tenant_id": "acme", "employee_ids": ["e1", "e3"]})
+        # Without employee_ids the tenant's whole roster is paid
+        roster = await agent.execute({"tenant_id": "acme"})
+        with pytest.raises(ValueError, match="no employees"):
+            await agent.execute({"tenant_id": "empty"})
+        return result, roster
+
+    result, roster = asyncio.run(run())
+    repo.close()
+    assert result["employees_processed"] == roster["employees_processed"] == 2
+    assert result["totals"] == roster["totals"]
+    assert result["totals"]["gross"] == 15000.0
+
+
+def test_first_writers_of_a_tenant_do_not_conflict(tmp_path) -> None:
+    repo = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db")
+    repo.engine  # Create the tables before the writers race
+
+    def write(i: int) -> int:
+        return repo._write("acme", [EmployeeRecord(employee_id=f"e{i}")])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = list(pool.map(write, range(8)))
+    repo.close()
+    assert sorted(versions) == list(range(1, 9))
+
+
+def test_jobs_see_employee_updates_made_through_the_api(tmp_path, monkeypatch) -> None:
+    repo = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db")
+    queue = JobQueue(backend="process", workers=1)
+    monkeypatch.setattr(main, "employee_repository", repo)
+    monkeypatch.setattr(payroll_agent, "employee_repository", repo)
+    monkeypatch.setattr(main, "job_queue", queue)
+    headers = {"X-Tenant-ID": "acme"}
+
+    def pay(client: TestClient) -> float:
+        job = client.post("/api/v1/jobs", headers=headers, json={
+            "task_type": "payroll", "parameters": {"employee_ids": ["e1"], "period": "monthly"}
+        }).json()
+        for _ in range(500):
+            job = client.get(f"/api/v1/jobs/{job['job_id']}", headers=headers).json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            time.sleep(0.01)
+        assert job["status"] == "succeeded", job["error"]
+        return job["result"]["total_amount"]
+
+    def put(client: TestClient, employee) -> int:
+        body = {"employees": [employee]}
+        return client.put("/api/v1/employees", headers=headers, json=body).status_code
+
+    with TestClient(main.app) as client:
+        assert put(client, {"employee_id": "e1", "annual_salary": 120000}) == 200
+        assert pay(client) == 10000.0
+        # The worker process has e1 cached; the update must still reach it
+        assert put(client, {"employee_id": "e1", "annual_salary": 240000}) == 200
+        assert pay(client) == 20000.0
+    repo.close()
@@ -0,0 +1,28 @@
+import asyncio
+
+from src.api.idempotency import IdempotencyCache, SQLiteIdempotencyStore
+
+
+def test_concurrent_requests_run_once_and_persist(tmp_path) -> None:
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"status": "success", "pricing": 1.0}
+
+    async def run():
+        cache = IdempotencyCache(SQLiteIdempotencyStore(str(tmp_path / "idem.db")), ttl=60)
+        results = await asyncio.gather(*(cache.run("t:k", "h", handler) for _ in range(5)))
+        await cache.aclose()
+
+        # A fresh process only has the durable store
+        restarted = IdempotencyCache(SQLiteIdempotencyStore(str(tmp_path / "idem.db")), ttl=60)
+        after_restart = await restarted.run("t:k", "h", handler)
+        await restarted.aclose()
+        return results, after_restart
+
+    results, after_restart = asyncio.run(run())
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert after_restart == ({"status": "success", "pricing": 1.0}, True)
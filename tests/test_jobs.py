@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.config import settings
+from src.jobs import JOB_FAILED, JOB_SUCCEEDED, JobQueue
+from src.llm import client
+
+
+def test_jobs_run_in_priority_order() -> None:
+    async def run():
+        queue = JobQueue(backend="thread", workers=1)
+        try:
+            benefits = await queue.submit("benefits", {"employee_id": "e1", "action": "query"})
+            payroll = await queue.submit("payroll", {
+                "period": "monthly", "employees": [{"employee_id": "e1", "annual_salary": 60000}]
+            })
+            await queue.wait(benefits.job_id)
+            await queue.wait(payroll.job_id)
+        finally:
+            await queue.stop()
+        return benefits, payroll
+
+    benefits, payroll = asyncio.run(run())
+    assert benefits.status == payroll.status == JOB_SUCCEEDED
+    assert payroll.priority < benefits.priority
+    assert payroll.started_at <= benefits.started_at
+
+
+def test_job_failure_is_recorded() -> None:
+    async def run():
+        queue = JobQueue(backend="thread", workers=1)
+        try:
+            job = await queue.submit("payroll", {"employee_ids": ["e1"]})
+            return await queue.wait(job.job_id)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+    assert job.status == JOB_FAILED
+    assert "employees" in job.error
+
+
+def test_consecutive_llm_jobs_share_a_worker_loop(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "default_llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(client, "_client", None)
+    monkeypatch.setattr(client, "_clients", {})
+    created = []
+    http_client = httpx.AsyncClient
+
+    def http_on_this_loop(**kwargs):
+        # An HTTP pool only works on the loop it was created on
+        loop = asyncio.get_event_loop()
+        created.append(loop)
+
+        def handle(request):
+            assert asyncio.get_running_loop() is loop
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Yes."}}]})
+
+        return http_client(transport=httpx.MockTransport(handle), **kwargs)
+
+    monkeypatch.setattr(client.httpx, "AsyncClient", http_on_this_loop)
+
+    async def run():
+        queue = JobQueue(backend="thread", workers=1)
+        try:
+            jobs = []
+            for question in ("Is dental covered?", "When does open enrollment start?"):
+                job = await queue.submit("benefits", {
+                    "employee_id": "e1", "action": "query", "question": question
+                })
+                jobs.append(await queue.wait(job.job_id))
+            return jobs
+        finally:
+            await queue.stop()
+
+    jobs = asyncio.run(run())
+    assert [job.status for job in jobs] == [JOB_SUCCEEDED, JOB_SUCCEEDED], jobs[-1].error
+    assert [job.result["answer"] for job in jobs] == ["Yes.", "Yes."]
+    assert len(created) == 1
+
+
+def test_submit_rejects_invalid_parameters() -> None:
+    async def run():
+        await JobQueue(backend="thread").submit("benefits", {})
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_jobs_are_only_visible_to_their_tenant(monkeypatch) -> None:
+    monkeypatch.setattr(main, "job_queue", JobQueue(backend="thread", workers=1))
+    request = {"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}}
+    with TestClient(main.app) as client:
+        job = client.post("/api/v1/jobs", json=request, headers={"X-Tenant-ID": "acme"}).json()
+        url = f"/api/v1/jobs/{job['job_id']}"
+        assert client.get(url, headers={"X-Tenant-ID": "acme"}).status_code == 200
+        assert client.get(url, headers={"X-Tenant-ID": "globex"}).status_code == 404
+        assert client.get(url).status_code == 404
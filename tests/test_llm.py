@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.llm import FakeProvider, LLMClient, client, get_llm_client
+from src.utils.cache import TTLCache
+from src.utils.ratelimit import TokenBucket
+
+
+def make_client(provider: FakeProvider, **kwargs) -> LLMClient:
+    return LLMClient({"fake": provider}, default_provider="fake", default_model="test", **kwargs)
+
+
+def test_responses_are_cached() -> None:
+    provider = FakeProvider()
+    client = make_client(provider)
+
+    async def run():
+        first = await client.complete("what is my deductible?")
+        second = await client.complete("what is my deductible?")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert provider.calls == 1
+    assert (first.cached, second.cached) == (False, True)
+    assert first.text == second.text
+
+
+def test_identical_in_flight_prompts_are_coalesced() -> None:
+    provider = FakeProvider(latency=0.02)
+    client = make_client(provider)
+
+    async def run():
+        return await asyncio.gather(*(client.complete("same", use_cache=False) for _ in range(5)))
+
+    responses = asyncio.run(run())
+    assert provider.calls == 1
+    assert len({r.text for r in responses}) == 1
+
+
+def test_missing_api_key_is_a_configuration_error(monkeypatch) -> None:
+    monkeypatch.setattr(client, "_client", None)
+    monkeypatch.setattr(client, "_clients", {})
+    monkeypatch.setattr(settings, "default_llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    with pytest.raises(ValueError, match="DEFAULT_LLM_PROVIDER=fake"):
+        get_llm_client()
+
+    monkeypatch.setattr(settings, "default_llm_provider", "fake")
+    assert get_llm_client().default_provider == "fake"
+
+
+def test_ttl_cache_expiry_and_lru_eviction() -> None:
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts b, the least recently used
+    assert "b" not in cache
+    now[0] = 11
+    assert cache.get("a") is None
+
+
+def test_token_bucket_refills_over_time() -> None:
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.time_until_available() == 0.5
+    now[0] = 0.5
+    assert bucket.try_acquire()
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.agents import BenefitsAgent
+from src.config import settings
+from src.metrics import Histogram, metrics
+
+
+def test_agent_execute_is_instrumented() -> None:
+    metrics.reset()
+    agent = BenefitsAgent()
+    asyncio.run(agent.execute({"employee_id": "e1", "action": "query"}))
+    with pytest.raises(ValueError):
+        asyncio.run(agent.execute({}))
+
+    stats = metrics.stats("benefits_agent", "benefits")
+    assert (stats.requests, stats.errors, stats.in_flight) == (2, 1, 0)
+    assert stats.latency.count == 2
+
+    text = metrics.render_prometheus()
+    assert 'agenthr_tasks_total{agent="benefits_agent",task_type="benefits"} 2' in text
+    labels = 'agent="benefits_agent",task_type="benefits"'
+    assert f'agenthr_task_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+
+
+def test_histogram_quantile_interpolates_within_bucket() -> None:
+    histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == pytest.approx(0.15)
+    assert histogram.quantile(1.0) == pytest.approx(0.4)
+    assert Histogram().quantile(0.95) == 0.0
+
+
+def test_metrics_endpoint_and_profile_header(tmp_path, monkeypatch) -> None:
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/tasks/execute",
+        json={"task_type": "benefits", "parameters": {"employee_id": "e1", "action": "query"}},
+        headers={"X-Profile": "1"},
+    )
+    profile_id = response.headers["X-Profile-Id"]
+    assert "cumulative" in client.get(f"/api/v1/metrics/profiles/{profile_id}").text
+    assert client.get("/api/v1/metrics/profiles/unknown").status_code == 404
+
+    response = client.get("/api/v1/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'agenthr_tasks_in_flight{agent="benefits_agent",task_type="benefits"} 0' in response.text
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from src.agents import OnboardingAgent
+from src.onboarding import OnboardingPipeline, Stage
+
+
+def _sleeper(delay):
+    async def handler(hire, done):
+        await asyncio.sleep(delay)
+        return {"completed": True}
+    return handler
+
+
+def test_throughput_is_bounded_by_slowest_stage() -> None:
+    stages = [Stage(name, _sleeper(0.01)) for name in ("a", "b", "c")]
+
+    async def run():
+        started = time.perf_counter()
+        records = [r async for r in OnboardingPipeline(stages, queue_size=4).run([{}] * 30)]
+        return records, time.perf_counter() - started
+
+    records, elapsed = asyncio.run(run())
+    assert len(records) == 30 and all(r.ok for r in records)
+    # Sequential stages would take 30 * 3 * 0.01s; pipelined is ~32 * 0.01s
+    assert elapsed < 0.6
+
+
+def test_workers_are_capped_at_the_number_of_hires() -> None:
+    tasks = []
+
+    async def count_tasks(hire, done):
+        tasks.append(len(asyncio.all_tasks()))
+        return {"completed": True}
+
+    async def run(concurrency):
+        stages = [Stage(name, count_tasks, concurrency=concurrency) for name in ("a", "b", "c")]
+        return [r async for r in OnboardingPipeline(stages).run([{}])]
+
+    asyncio.run(run(1))
+    asyncio.run(run(8))
+    # A single hire starts one worker per stage however wide the stages are
+    assert tasks[:3] == tasks[3:]
+
+
+def test_failed_stage_is_retried_then_reported() -> None:
+    attempts = {}
+
+    async def flaky(hire, done):
+        attempts[hire["employee_id"]] = attempts.get(hire["employee_id"], 0) + 1
+        if hire["employee_id"] == "bad" or attempts[hire["employee_id"]] < 2:
+            raise RuntimeError("provisioning unavailable")
+        return {"completed": True}
+
+    stages = [
+        Stage("provisioning", flaky, concurrency=2, retries=2, retry_delay=0),
+        Stage("training", _sleeper(0)),
+    ]
+
+    async def run():
+        hires = [{"employee_id": "ok"}, {"employee_id": "bad"}]
+        return {r.hire["employee_id"]: r async for r in OnboardingPipeline(stages).run(hires)}
+
+    records = asyncio.run(run())
+    assert records["ok"].ok and records["ok"].attempts == {"provisioning": 2, "training": 1}
+    assert records["bad"].failed_stage == "provisioning"
+    assert records["bad"].attempts == {"provisioning": 3}
+    assert "training" not in records["bad"].stages
+
+
+def test_agent_onboards_hires_in_bulk() -> None:
+    hires = [
+        {"employee_id": f"e{i}", "employee_name": f"Hire {i}", "start_date": "2025-01-06",
+         "department": "Eng"}
+        for i in range(50)
+    ]
+    task = {"hires": hires, "buddies": [{"employee_id": "b1", "department": "Eng"}]}
+    result = asyncio.run(OnboardingAgent().execute(task))
+    assert (result["hires_processed"], result["succeeded"], result["failed"]) == (50, 50, 0)
+    assert [r["employee_id"] for r in result["results"]] == [h["employee_id"] for h in hires]
+    assert result["results"][0]["stages"]["buddy_matching"]["buddy_id"] == "b1"
@@ -0,0 +1,74 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.agents import PayrollAgent
+from src.payroll import BracketSchedule, PayrollEngine, PayrollInputs
+
+
+def test_bracket_schedule_matches_marginal_calculation() -> None:
+    schedule = BracketSchedule([(0.0, 0.10), (10000.0, 0.20), (50000.0, 0.30)])
+    taxes = schedule.apply(np.array([0.0, 5000.0, 10000.0, 60000.0, -10.0]))
+    assert taxes.tolist() == pytest.approx([0.0, 500.0, 1000.0, 12000.0, 0.0])
+
+
+def test_engine_gross_to_net() -> None:
+    inputs = PayrollInputs.from_records([
+        {"employee_id": "e1", "hourly_rate": 30, "hours": 160},
+        {"employee_id": "e2", "annual_salary": 120000, "pretax_deductions": 500},
+    ])
+    result = PayrollEngine().run(inputs, "monthly")
+    assert result.gross.tolist() == [4800.0, 10000.0]
+    assert result.federal_tax[0] == pytest.approx(643.75)
+    assert result.net[0] == pytest.approx(4800.0 - 643.75 - 297.6 - 69.6)
+    assert result.totals()["gross"] == 14800.0
+
+
+def test_payroll_agent_filters_employee_ids() -> None:
+    task = {
+        "period": "biweekly",
+        "employees": {"employee_id": ["a", "b", "c"], "annual_salary": [52000, 78000, 104000]},
+        "employee_ids": ["a", "c"],
+    }
+    result = asyncio.run(PayrollAgent().execute(task))
+    assert result["employees_processed"] == 2
+    assert result["total_amount"] == 6000.0
+
+
+def test_payroll_agent_rejects_unknown_period() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(PayrollAgent().execute({"period": "fortnightly"}))
+
+
+def test_state_and_local_withholding_by_jurisdiction() -> None:
+    inputs = PayrollInputs.from_records([
+        {"employee_id": "ny", "annual_salary": 120000, "state": "NY", "locality": "NYC"},
+        {"employee_id": "tx", "annual_salary": 120000, "state": "tx"},
+        {"employee_id": "pa", "annual_salary": 120000, "state": "PA", "locality": "Philadelphia"},
+        {"employee_id": "none", "annual_salary": 120000},
+    ])
+    engine = PayrollEngine()
+    result = engine.run(inputs, "monthly")
+    ny_state = (8500 * 0.04 + 3200 * 0.045 + 2200 * 0.0525 + 66750 * 0.055 + 39350 * 0.06) / 12
+    expected_state = [ny_state, 0.0, 120000 * 0.0307 / 12, 0.0]
+    assert result.state_tax.tolist() == pytest.approx(expected_state, abs=0.01)
+    assert result.local_tax[0] == pytest.approx(
+        (12000 * 0.03078 + 13000 * 0.03762 + 25000 * 0.03819 + 70000 * 0.03876) / 12, abs=0.01
+    )
+    assert result.local_tax[2] == pytest.approx(375.0)
+    assert result.net[3] - result.net[2] == pytest.approx(result.state_tax[2] + result.local_tax[2])
+
+    # Schedules are derived once per jurisdiction and period, then reused
+    assert engine.taxes.stats() == {"schedules": 3, "hits": 0, "misses": 3}
+    engine.run(inputs.slice(0, 2), "monthly")
+    assert engine.taxes.stats()["hits"] == 2
+    assert engine.taxes.schedule("ny", " nyc ", 12) is engine.taxes.schedule("NY", "NYC", 12)
+
+
+def test_unknown_jurisdiction_is_rejected() -> None:
+    inputs = PayrollInputs.from_records(
+        [{"employee_id": "e1", "annual_salary": 50000, "state": "ZZ"}]
+    )
+    with pytest.raises(ValueError, match="ZZ"):
+        PayrollEngine().run(inputs, "monthly")
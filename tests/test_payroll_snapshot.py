@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.agents.payroll_agent import PayrollAgent
+from src.payroll import (
+    IncrementalPayroll,
+    PayrollEngine,
+    PayrollInputs,
+    SnapshotStore,
+    TaxTables,
+    input_hashes,
+)
+
+
+def _employee(i: int):
+    return {
+        "employee_id": f"e{i}",
+        "annual_salary": 50000 + 1000 * i,
+        "state": "CA",
+        "pretax_deductions": 100,
+    }
+
+
+def _roster(size: int, **overrides):
+    records = [_employee(i) for i in range(size)]
+    for employee_id, changes in overrides.items():
+        records[int(employee_id[1:])].update(changes)
+    return PayrollInputs.from_records(records)
+
+
+def test_input_hashes_track_inputs_not_ids() -> None:
+    a = input_hashes(_roster(3))
+    b = input_hashes(_roster(3, e1={"hours": 0.0, "pretax_deductions": 100.0}))
+    c = input_hashes(_roster(3, e1={"state": "NY"}))
+    assert a.tolist() == b.tolist()
+    assert a[1] != c[1] and a[0] == c[0]
+
+
+def test_rerun_recomputes_only_changed_employees(tmp_path) -> None:
+    reruns = IncrementalPayroll(PayrollEngine(), SnapshotStore(str(tmp_path)))
+    first, report = reruns.run(_roster(50), "biweekly", "2024-06-14", "acme")
+    assert report.recomputed == 50 and len(report.added) == 50
+
+    corrected = _roster(50, e7={"annual_salary": 90000}, e9={"state": "TX"})
+    merged, report = reruns.run(corrected, "biweekly", "2024-06-14", "acme")
+    assert report.recomputed == 2
+    assert [c["employee_id"] for c in report.changed] == ["e7", "e9"]
+    assert report.added == [] and report.removed == []
+
+    # Identical to recomputing everyone
+    expected = PayrollEngine().run(corrected, "biweekly")
+    assert merged.employee_ids.tolist() == expected.employee_ids.tolist()
+    assert merged.net.tolist() == pytest.approx(expected.net.tolist())
+    delta = report.to_dict()["totals_delta"]
+    assert delta["gross"] == pytest.approx(expected.totals()["gross"] - first.totals()["gross"])
+
+    # Dropped and new employees on a full roster; nothing else recomputed
+    roster = PayrollInputs.from_records(
+        [_employee(i) for i in range(1, 50)] + [{"employee_id": "new", "annual_salary": 70000}]
+    )
+    merged, report = reruns.run(roster, "biweekly", "2024-06-14", "acme")
+    assert report.removed == ["e0"] and report.added == ["new"]
+    assert report.recomputed == 3  # e7 and e9 revert to their original inputs
+    assert len(merged) == 50
+
+    with pytest.raises(ValueError):
+        reruns.run(roster, "monthly", "2024-06-14", "acme")
+
+
+def test_payroll_agent_partial_correction(tmp_path) -> None:
+    agent = PayrollAgent()
+    agent.reruns.store = SnapshotStore(str(tmp_path))
+    employees = [{"employee_id": f"e{i}", "annual_salary": 60000} for i in range(10)]
+
+    async def run():
+        await agent.execute({"period": "monthly", "employees": employees, "run_id": "june"})
+        return await agent.execute({
+            "period": "monthly",
+            "employees": [{"employee_id": "e3", "annual_salary": 72000}],
+            "run_id": "june",
+            "partial": True,
+        })
+
+    result = asyncio.run(run())
+    assert result["employees_processed"] == 10
+    assert result["delta"]["recomputed"] == 1
+    assert result["delta"]["changed"][0]["gross"] == {"before": 5000.0, "after": 6000.0}
+    assert result["total_amount"] == 51000.0
+
+
+def test_new_tax_tables_recompute_everyone(tmp_path) -> None:
+    store = SnapshotStore(str(tmp_path))
+    IncrementalPayroll(PayrollEngine(), store).run(_roster(20), "monthly", "june", "acme")
+    tables = TaxTables({"CA": [(0.0, 0.05)]}, {})
+    reruns = IncrementalPayroll(PayrollEngine(tax_tables=tables), store)
+    merged, report = reruns.run(_roster(20), "monthly", "june", "acme")
+    assert report.recomputed == 20 and report.full
+    assert len(report.changed) == 20
+
+    # Stored with the new fingerprint: the next rerun is incremental again
+    _, report = reruns.run(_roster(20), "monthly", "june", "acme")
+    assert report.recomputed == 0 and not report.full
+
+
+def test_reruns_of_a_run_are_serialized(tmp_path) -> None:
+    store = SnapshotStore(str(tmp_path))
+    reruns = IncrementalPayroll(PayrollEngine(), store)
+    rerun = threading.Thread(target=reruns.run, args=(_roster(5), "monthly", "june", "acme"))
+    with store.lock("acme", "june"):
+        rerun.start()
+        time.sleep(0.2)
+        assert rerun.is_alive() and store.load("acme", "june") is None
+    rerun.join(5)
+    assert len(store.load("acme", "june").result) == 5
+    # Only the snapshot and its lock file; temporary files are unique and removed
+    assert sorted(p.name for p in (tmp_path / "acme").iterdir()) == ["june.npz", "june.npz.lock"]
@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+import numpy as np
+
+from src.agents import payroll_agent
+from src.agents.payroll_agent import PayrollAgent
+from src.payroll import PayrollInputs
+from src.utils.processes import ProcessPool, cpu_pool
+
+
+def _scaled(values: np.ndarray, factor: float):
+    return {"pid": os.getpid(), "values": values * factor, "sum": float(values.sum())}
+
+
+async def _negated(values: np.ndarray) -> np.ndarray:
+    return -values
+
+
+def test_pool_shares_arrays_with_workers() -> None:
+    pool = ProcessPool()
+    values = np.arange(10000, dtype=np.float64)
+
+    async def run():
+        inline = await pool.run(_scaled, values, 2.0)
+        pool.start(2, min_shared_bytes=1024)
+        try:
+            return inline, await pool.run(_scaled, values, 2.0), await pool.run(_negated, values)
+        finally:
+            pool.stop()
+
+    inline, shared, negated = asyncio.run(run())
+    assert inline["pid"] == os.getpid()
+    assert shared["pid"] != os.getpid()
+    np.testing.assert_array_equal(shared["values"], values * 2.0)
+    assert shared["sum"] == inline["sum"]
+    np.testing.assert_array_equal(negated, -values)
+
+
+def test_cpu_bound_agent_runs_in_pool(monkeypatch) -> None:
+    pool = ProcessPool()
+    monkeypatch.setattr("src.utils.processes.cpu_pool", pool)
+    task = {
+        "period": "monthly",
+        "employees": {"employee_id": ["e1", "e2"], "annual_salary": [60000, 120000]},
+    }
+
+    async def run():
+        inline = await PayrollAgent().execute(task)
+        pool.start(1)
+        try:
+            return inline, await PayrollAgent().execute(task)
+        finally:
+            pool.stop()
+
+    inline, pooled = asyncio.run(run())
+    assert not cpu_pool.started
+    assert pooled["totals"] == inline["totals"]
+    assert pooled["employees_processed"] == 2
+
+
+def test_stream_chunks_send_only_inputs_to_workers(monkeypatch) -> None:
+    pool = ProcessPool()
+    monkeypatch.setattr("src.utils.processes.cpu_pool", pool)
+    monkeypatch.setattr(payroll_agent.settings, "payroll_stream_chunk_size", 2)
+    calls = []
+    run = pool.run
+
+    async def recording_run(fn, *args):
+        calls.append((fn, args))
+        return await run(fn, *args)
+
+    monkeypatch.setattr(pool, "run", recording_run)
+    task = {
+        "period": "monthly",
+        "employees": {"employee_id": ["e1", "e2", "e3"], "annual_salary": [60000, 120000, 90000]},
+    }
+
+    async def stream():
+        return [record async for record in PayrollAgent().stream(task)]
+
+    inline = asyncio.run(stream())
+    pool.start(1)
+    try:
+        pooled = asyncio.run(stream())
+    finally:
+        pool.stop()
+    assert [stub.to_dict() for stub in pooled[:-1]] == [stub.to_dict() for stub in inline[:-1]]
+    assert pooled[-1]["totals"] == inline[-1]["totals"]
+    assert len(calls) == 4
+    assert all(fn is payroll_agent._run_chunk for fn, _ in calls)
+    assert all(isinstance(args[0], PayrollInputs) for _, args in calls)
@@ -0,0 +1,170 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.agents import RecruitingAgent, recruiting_agent
+from src.recruiting import (
+    Candidate,
+    CandidateIndex,
+    CandidateRepository,
+    ResumeScreener,
+    schedule_interviews,
+)
+from src.recruiting.screening import EmbeddingCache
+
+
+@pytest.fixture
+def candidates(tmp_path, monkeypatch) -> CandidateRepository:
+    repo = CandidateRepository(database_url=f"sqlite:///{tmp_path}/candidates.db")
+    monkeypatch.setattr(recruiting_agent, "candidate_repository", repo)
+    yield repo
+    repo.close()
+
+
+def make_index() -> CandidateIndex:
+    return CandidateIndex([Candidate.from_dict(c) for c in [
+        {"candidate_id": "a", "skills": ["Python", "SQL"], "location": "NYC", "salary": 120000},
+        {"candidate_id": "b", "skills": ["python"], "location": "nyc", "salary": 100000},
+        {"candidate_id": "c", "skills": ["Go"], "location": "SF", "salary": 90000},
+    ]])
+
+
+def test_search_ranks_by_skill_overlap_within_budget() -> None:
+    index = make_index()
+    matches, total = index.search(["python", "sql"], location="NYC", budget=130000)
+    assert total == 2
+    assert [m.candidate.candidate_id for m in matches] == ["a", "b"]
+    assert matches[1].score == 0.5
+
+    matches, total = index.search(["python", "sql"], budget=110000)
+    assert (total, matches[0].candidate.candidate_id) == (1, "b")
+
+
+def test_search_by_budget_only_uses_salary_order() -> None:
+    matches, total = make_index().search(budget=100000, k=1)
+    assert total == 2
+    assert matches[0].candidate.candidate_id == "c"
+
+
+def test_incremental_add_and_remove() -> None:
+    index = make_index()
+    assert index.remove("a")
+    assert not index.remove("a")
+    index.add(Candidate.from_dict({"candidate_id": "b", "skills": ["rust"], "salary": 50000}))
+    assert index.search(["python"])[1] == 0
+    assert index.search(["rust"])[1] == 1
+    assert index.search(budget=60000)[1] == 1
+    assert len(index) == 2
+
+
+def test_recruiting_agent_ranks_candidates(candidates) -> None:
+    agent = RecruitingAgent()
+    result = asyncio.run(agent.execute({
+        "job_title": "Data Engineer",
+        "budget": 150000,
+        "requirements": ["python"],
+        "candidates": [
+            {"candidate_id": "x", "skills": ["python"], "salary": 140000},
+            {"candidate_id": "y", "skills": ["python"], "salary": 160000},
+        ],
+    }))
+    assert result["candidates_found"] == 1
+    assert result["candidates"][0]["candidate_id"] == "x"
+
+
+def test_candidate_pools_are_scoped_to_their_tenant(tmp_path, candidates) -> None:
+    agent = RecruitingAgent()
+    secret = {"candidate_id": "secret-1", "name": "Alice Private", "skills": ["python"],
+              "salary": 150000}
+    job = {"job_title": "Engineer", "budget": 200000, "requirements": ["python"]}
+
+    async def run():
+        await agent.execute({**job, "tenant_id": "acme", "candidates": [secret]})
+        seen = await agent.execute({**job, "tenant_id": "globex"})
+        await agent.execute({**job, "tenant_id": "globex", "remove_candidates": ["secret-1"]})
+        kept = await agent.execute({**job, "tenant_id": "acme"})
+        # A second repository on the same database stands in for a job worker
+        worker = CandidateRepository(database_url=candidates.database_url)
+        found = (await worker.index("acme")).get("secret-1")
+        worker.close()
+        return seen, kept, found
+
+    seen, kept, found = asyncio.run(run())
+    assert seen["candidates_found"] == 0 and seen["candidates"] == []
+    assert [c["candidate_id"] for c in kept["candidates"]] == ["secret-1"]
+    assert found == Candidate.from_dict(secret)
+
+
+def test_candidate_index_follows_writes_from_other_processes(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path}/candidates.db"
+    api, worker = CandidateRepository(database_url=url), CandidateRepository(database_url=url)
+
+    async def run():
+        await api.update("acme", [Candidate.from_dict({"candidate_id": "a", "salary": 1})])
+        assert len(await worker.index("acme")) == 1
+        await worker.update("acme", remove=["a"])
+        await worker.update("acme", [Candidate.from_dict({"candidate_id": "b", "salary": 2})])
+        return await api.index("acme")
+
+    index = asyncio.run(run())
+    api.close()
+    worker.close()
+    assert "a" not in index and index.get("b").salary == 2.0
+
+
+def test_screener_caches_embeddings_on_disk(tmp_path) -> None:
+    screener = ResumeScreener(cache_dir=str(tmp_path), dim=64)
+    resumes = ["python sql data pipelines", "frontend react css", "python sql data pipelines"]
+    scores = screener.score("python sql", resumes)
+    assert len(screener.cache) == 2
+    assert scores[0] == scores[2] > scores[1]
+
+    reopened = ResumeScreener(cache_dir=str(tmp_path), dim=64)
+    assert len(reopened.cache) == 2
+    assert reopened.score("python sql", resumes[:1])[0] == scores[0]
+    assert len(reopened.cache) == 2
+
+
+def test_embedding_cache_shared_between_processes(tmp_path) -> None:
+    # Two handles on one directory stand in for the API and a job worker
+    api, worker = EmbeddingCache(str(tmp_path), 4), EmbeddingCache(str(tmp_path), 4)
+    assert api.append(["a"], np.ones((1, 4))) == [0]
+    assert worker.append(["b", "a"], np.full((2, 4), 2.0)) == [1, 0]
+    assert api.lookup(["b"]) == [1]
+    assert api.matrix()[[0, 1], 0].tolist() == [1.0, 2.0]
+    assert worker.matrix()[[0, 1], 0].tolist() == [1.0, 2.0]
+
+
+def test_recruiting_agent_reranks_by_resume(tmp_path, candidates) -> None:
+    agent = RecruitingAgent()
+    agent._screener = ResumeScreener(cache_dir=str(tmp_path), dim=64)
+    result = asyncio.run(agent.execute({
+        "job_title": "Data Engineer",
+        "budget": 200000,
+        "requirements": ["python"],
+        "candidates": [
+            {"candidate_id": "x", "skills": ["python"], "salary": 100000, "resume": "ios swift"},
+            {"candidate_id": "y", "skills": ["python"], "salary": 150000,
+             "resume": "data engineer building python pipelines"},
+        ],
+    }))
+    assert result["candidates_screened"] == 2
+    assert [c["candidate_id"] for c in result["candidates"]] == ["y", "x"]
+
+
+def test_schedule_interviews_without_conflicts() -> None:
+    hour = 3600
+    schedule = schedule_interviews(
+        interviewers={"i1": [(9 * hour, 11 * hour)], "i2": [(10 * hour, 12 * hour)]},
+        candidates={
+            "a": [(9 * hour, 10 * hour)],
+            "b": [(9.5 * hour, 12 * hour)],
+            "c": [(10 * hour, 11 * hour)],
+            "d": [(9 * hour, 9.5 * hour)],  # shorter than the interview
+        },
+        duration=hour,
+    )
+    booked = {(i.candidate_id, i.interviewer_id, i.start) for i in schedule.interviews}
+    assert booked == {("a", "i1", 9 * hour), ("b", "i2", 10 * hour), ("c", "i1", 10 * hour)}
+    assert schedule.unscheduled == ["d"]
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from src.agents import AgentRegistry, PayrollAgent, UnknownTaskType
+
+
+def test_registry_reuses_agent_instances() -> None:
+    registry = AgentRegistry()
+    assert registry.get("payroll") is registry.get("payroll")
+    assert isinstance(registry.get("payroll"), PayrollAgent)
+
+
+def test_registry_unknown_task_type() -> None:
+    registry = AgentRegistry()
+    with pytest.raises(UnknownTaskType):
+        registry.get("offboarding")
+
+
+def test_registry_caps_concurrency_per_agent() -> None:
+    registry = AgentRegistry(max_concurrency=2)
+    peak = 0
+
+    class SlowAgent(PayrollAgent):
+        async def execute(self, task):
+            nonlocal peak
+            peak = max(peak, registry.in_flight("slow"))
+            await asyncio.sleep(0.01)
+            return {"status": "success"}
+
+    registry.register("slow", SlowAgent)
+
+    async def run() -> None:
+        await asyncio.gather(*(registry.execute("slow", {}) for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert registry.in_flight("slow") == 0
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src import serialization
+from src.api.main import app
+from src.onboarding import HireResult, OnboardingRecord
+from src.payroll import PayrollEngine, PayrollInputs, PayStub
+from src.recruiting import Candidate, CandidateMatch, RankedCandidate
+
+
+def _stubs() -> list:
+    inputs = PayrollInputs(
+        employee_ids=np.array(["e1", "e2"]),
+        annual_salary=np.array([60000.0, 0.0]),
+        hourly_rate=np.array([0.0, 25.0]),
+        hours=np.array([0.0, 160.0]),
+        pretax_deductions=np.zeros(2),
+        posttax_deductions=np.zeros(2),
+    )
+    return list(PayrollEngine().run(inputs, "monthly").pay_stubs())
+
+
+def test_pay_stubs_read_and_encode_like_dicts() -> None:
+    stub = _stubs()[0]
+    assert isinstance(stub, PayStub)
+    assert stub["record"] == "pay_stub" and stub["gross"] == 5000.0
+    assert {**stub} == stub.to_dict() and stub == stub.to_dict()
+    with pytest.raises(KeyError):
+        stub["salary"]
+
+    value = {
+        "stub": stub,
+        "amounts": np.array([1.5, 2.0]),
+        "count": np.int64(3),
+        "at": datetime(2024, 6, 14),
+    }
+    expected = {
+        "stub": stub.to_dict(),
+        "amounts": [1.5, 2.0],
+        "count": 3,
+        "at": "2024-06-14T00:00:00",
+    }
+    assert json.loads(serialization.dumps(value)) == expected
+    assert json.loads(serialization.dumps_pretty(value)) == expected
+
+
+def _records() -> list:
+    match = CandidateMatch(Candidate("c1", "Ada", salary=120000.0), 0.87654, ["python"], 0.5)
+    hire = OnboardingRecord(0, {"employee_id": "e1", "employee_name": "Bo"}, {"paperwork": {}})
+    return [_stubs()[0], match.summary(), hire.result()]
+
+
+def test_agent_result_records_read_like_dicts() -> None:
+    stub, ranked, hire = _records()
+    assert isinstance(ranked, RankedCandidate) and isinstance(hire, HireResult)
+    assert ranked["score"] == 0.8765 and ranked["matched_skills"] == ["python"]
+    assert hire["record"] == "hire" and hire["status"] == "success"
+    assert json.loads(serialization.dumps(_records())) == [r.to_dict() for r in _records()]
+
+
+def test_records_encode_as_msgpack() -> None:
+    msgpack = pytest.importorskip("msgpack")
+    records = _records()
+    value = {"records": records, "amounts": np.array([1.5, 2.0]), "at": datetime(2024, 6, 14)}
+    decoded = msgpack.unpackb(serialization.encode(value, serialization.MSGPACK_MEDIA_TYPE))
+    assert decoded == {
+        "records": [r.to_dict() for r in records],
+        "amounts": [1.5, 2.0],
+        "at": "2024-06-14T00:00:00",
+    }
+
+
+def test_negotiate_prefers_explicit_msgpack(monkeypatch) -> None:
+    monkeypatch.setattr(serialization, "msgpack", object())
+    assert serialization.negotiate(None) == "application/json"
+    assert serialization.negotiate("*/*") == "application/json"
+    assert serialization.negotiate("application/x-msgpack, */*") == "application/msgpack"
+    accept = "application/msgpack;q=0.5, application/json"
+    assert serialization.negotiate(accept) == "application/json"
+
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert serialization.negotiate("application/msgpack") == "application/json"
+
+
+def test_api_encodes_msgpack_on_request() -> None:
+    msgpack = pytest.importorskip("msgpack")
+    client = TestClient(app)
+    request = {
+        "task_type": "payroll",
+        "parameters": {"employees": {"employee_id": ["e1"], "annual_salary": [60000]}},
+    }
+    headers = {"Accept": "application/msgpack"}
+    response = client.post("/api/v1/tasks/execute", json=request, headers=headers)
+    assert response.headers["content-type"] == "application/msgpack"
+    body = msgpack.unpackb(response.content)
+    assert body["status"] == "success" and body["result"]["total_amount"] == 5000.0
@@ -0,0 +1,202 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from src.agents import (
+    AgentRegistry,
+    BenefitsAgent,
+    benefits_agent,
+    onboarding_agent,
+    recruiting_agent,
+)
+from src.agents.base_agent import BaseAgent
+from src.api import main
+from src.config import settings
+from src.employees import EmployeeRepository
+from src.recruiting import CandidateRepository
+from src.workflows import (
+    CheckpointStore,
+    RunInProgressError,
+    Workflow,
+    WorkflowEngine,
+    hire_workflow,
+)
+
+
+class SlowAgent(BaseAgent):
+    task_type = "slow"
+    fail = False
+
+    def __init__(self, config=None):
+        super().__init__("slow_agent", config)
+
+    async def execute(self, task):
+        await asyncio.sleep(0.1)
+        if SlowAgent.fail and task.get("flaky"):
+            raise RuntimeError("provisioning down")
+        return {
+            "status": "success",
+            "value": task.get("value", 0) + 1,
+            "tenant_id": task.get("tenant_id"),
+            "pricing": 0.0,
+        }
+
+    def get_pricing(self):
+        return 0.0
+
+
+def _engine(tmp_path):
+    registry = AgentRegistry({"slow": SlowAgent, "benefits": BenefitsAgent})
+    return WorkflowEngine(registry, CheckpointStore(str(tmp_path)))
+
+
+def test_branches_run_concurrently_and_pass_outputs(tmp_path) -> None:
+    workflow = Workflow.from_dict({"steps": [
+        {"id": "a", "task_type": "slow", "parameters": {"value": 1}},
+        {"id": "b", "task_type": "slow", "inputs": {"value": "a.value"}},
+        {"id": "c", "task_type": "slow", "inputs": {"value": "a.value"}},
+        {"id": "d", "task_type": "benefits", "parameters": {"action": "query"},
+         "inputs": {"employee_id": "b.value"}, "depends_on": ["c"]},
+    ]})
+    started = time.perf_counter()
+    run = asyncio.run(_engine(tmp_path).start(workflow, "run1"))
+    elapsed = time.perf_counter() - started
+    assert run.status == "succeeded"
+    assert run.steps["b"].result["value"] == run.steps["c"].result["value"] == 3
+    assert run.steps["d"].result["employee_id"] == 3
+    # a, then b and c together, then d: two slow steps on the critical path
+    assert elapsed < 0.27
+
+
+def test_resume_skips_completed_steps(tmp_path) -> None:
+    workflow = Workflow.from_dict({"steps": [
+        {"id": "first", "task_type": "slow"},
+        {"id": "second", "task_type": "slow", "parameters": {"flaky": True},
+         "depends_on": ["first"]},
+        {"id": "third", "task_type": "slow", "depends_on": ["second"]},
+    ]})
+    engine = _engine(tmp_path)
+    SlowAgent.fail = True
+    try:
+        run = asyncio.run(engine.start(workflow, "run2"))
+    finally:
+        SlowAgent.fail = False
+    assert run.status == "failed"
+    statuses = [run.steps[s].status for s in ("first", "second", "third")]
+    assert statuses == ["succeeded", "failed", "skipped"]
+
+    first_finished = run.steps["first"].finished_at
+    resumed = asyncio.run(engine.resume("run2"))
+    assert resumed.status == "succeeded"
+    assert resumed.steps["first"].finished_at == first_finished
+
+
+def test_steps_run_for_the_given_tenant(tmp_path) -> None:
+    workflow = Workflow.from_dict({"steps": [
+        {"id": "a", "task_type": "slow", "parameters": {"tenant_id": "globex"}},
+        {"id": "b", "task_type": "slow", "inputs": {"tenant_id": "a.tenant_id"}},
+    ]})
+    run = asyncio.run(_engine(tmp_path).start(workflow, "run3", tenant_id="acme"))
+    assert run.steps["a"].result["tenant_id"] == run.steps["b"].result["tenant_id"] == "acme"
+
+
+def test_runs_are_only_visible_to_their_tenant(tmp_path, monkeypatch) -> None:
+    engine = WorkflowEngine(checkpoints=CheckpointStore(str(tmp_path)))
+    monkeypatch.setattr(main, "workflow_engine", engine)
+    client = TestClient(main.app)
+    request = {"run_id": "hire-1", "steps": [
+        {"id": "enroll", "task_type": "benefits",
+         "parameters": {"employee_id": "e1", "action": "query"}},
+    ]}
+    response = client.post("/api/v1/workflows", json=request, headers={"X-Tenant-ID": "acme"})
+    assert response.status_code == 200 and response.json()["tenant_id"] == "acme"
+
+    other = {"X-Tenant-ID": "globex"}
+    assert client.get("/api/v1/workflows/hire-1", headers=other).status_code == 404
+    assert client.post("/api/v1/workflows/hire-1/resume", headers=other).status_code == 404
+    acme = {"X-Tenant-ID": "acme"}
+    assert client.get("/api/v1/workflows/hire-1", headers=acme).status_code == 200
+
+
+def test_checkpoints_are_stored_per_tenant(tmp_path) -> None:
+    workflow = Workflow.from_dict({"steps": [{"id": "a", "task_type": "slow"}]})
+    engine = _engine(tmp_path)
+    asyncio.run(engine.start(workflow, "run4", tenant_id="acme"))
+    asyncio.run(engine.start(workflow, "run4", tenant_id="globex"))
+    assert (tmp_path / "acme" / "run4.json").exists()
+    assert (tmp_path / "globex" / "run4.json").exists()
+    assert asyncio.run(engine.get("run4", "acme"))["tenant_id"] == "acme"
+
+
+def test_concurrent_resumes_run_each_step_once(tmp_path) -> None:
+    workflow = Workflow.from_dict({"steps": [
+        {"id": "first", "task_type": "slow", "parameters": {"flaky": True}},
+    ]})
+    engine = _engine(tmp_path)
+    SlowAgent.fail = True
+    try:
+        asyncio.run(engine.start(workflow, "run5", tenant_id="acme"))
+    finally:
+        SlowAgent.fail = False
+    billed = []
+
+    async def resume_twice():
+        return await asyncio.gather(
+            engine.resume("run5", lambda *args: billed.append(args), "acme"),
+            engine.resume("run5", lambda *args: billed.append(args), "acme"),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(resume_twice())
+    assert first.status == "succeeded"
+    assert isinstance(second, RunInProgressError)
+    assert len(billed) == 1
+
+    # Once the run is released, resuming again reruns nothing
+    again = asyncio.run(engine.resume("run5", lambda *args: billed.append(args), "acme"))
+    assert again.status == "succeeded" and len(billed) == 1
+
+
+def test_workflow_rejects_cycles() -> None:
+    try:
+        Workflow.from_dict({"steps": [
+            {"id": "a", "task_type": "slow", "depends_on": ["b"]},
+            {"id": "b", "task_type": "slow", "depends_on": ["a"]},
+        ]})
+    except ValueError as e:
+        assert "cycle" in str(e)
+    else:
+        raise AssertionError("cycle not detected")
+
+
+def test_hire_template_enrolls_after_onboarding() -> None:
+    workflow = hire_workflow({"job_title": "Engineer", "start_date": "2025-01-06", "plan": "ppo"})
+    assert workflow.steps["onboard"].dependencies == ["recruit"]
+    assert workflow.steps["enroll_benefits"].dependencies == ["onboard", "recruit"]
+
+
+def test_hire_template_runs_end_to_end(tmp_path, monkeypatch) -> None:
+    employees = EmployeeRepository(database_url=f"sqlite:///{tmp_path}/employees.db")
+    candidates = CandidateRepository(database_url=f"sqlite:///{tmp_path}/candidates.db")
+    monkeypatch.setattr(onboarding_agent, "employee_repository", employees)
+    monkeypatch.setattr(benefits_agent, "employee_repository", employees)
+    monkeypatch.setattr(recruiting_agent, "candidate_repository", candidates)
+    engine = WorkflowEngine(checkpoints=CheckpointStore(str(tmp_path)))
+    monkeypatch.setattr(main, "workflow_engine", engine)
+    request = {"template": "hire", "parameters": {
+        "job_title": "Engineer", "budget": 150000, "requirements": ["python"],
+        "candidates": [{"candidate_id": "c1", "name": "Ada", "skills": ["python"],
+                        "salary": 120000}],
+        "start_date": "2025-01-06", "department": "Eng", "plan": "dental",
+    }}
+    response = TestClient(main.app).post("/api/v1/workflows", json=request)
+    run = response.json()
+    assert run["status"] == "succeeded", run
+    assert run["steps"]["enroll_benefits"]["result"]["plan"] == "dental"
+    record = asyncio.run(employees.get(settings.default_tenant, "c1"))
+    assert (record.name, record.annual_salary) == ("Ada", 120000.0)
+    assert record.employment_type == "full_time"
+    employees.close()
+    candidates.close()
+